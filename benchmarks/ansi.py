@@ -0,0 +1,82 @@
+"""
+Benchmarks the ANSI scanner (termx.ext.ansi) against the previous
+implementations of `escape_ansi_string` and `measure_ansi_string`, on long
+lines where every word is colored.
+
+    $ python benchmarks/ansi.py
+"""
+import re
+import timeit
+
+from termx.ext.ansi import ANSI_ESCAPE, AnsiScanner, measure_ansi, strip_ansi, tokenize
+from termx.fmt import Format
+
+
+def legacy_escape_ansi_string(value):
+    ansi_escape = re.compile(r'\x1B\[[0-?]*[ -/]*[@-~]')
+    return ansi_escape.sub('', value)
+
+
+def legacy_measure_ansi_string(value):
+    bare = legacy_escape_ansi_string(value)
+    return len(bare)
+
+
+def measure_ansi_runs(value):
+    return sum([len(run) for escape, run in tokenize(value) if not escape])
+
+
+def measure_ansi_escapes(value):
+    return len(value) - sum([len(escape) for escape in ANSI_ESCAPE.findall(value)])
+
+
+def colored_line(words):
+    formats = [Format(color='red'), Format(color='blue', styles=['bold']), None]
+    return " ".join(
+        formats[i % 3]("word%s" % i) if formats[i % 3] else "word%s" % i
+        for i in range(words)
+    )
+
+
+def scan_chunks(chunks):
+    scanner = AnsiScanner()
+    for chunk in chunks:
+        for _ in scanner.feed(chunk):
+            pass
+    for _ in scanner.flush():
+        pass
+
+
+def bench(func, number):
+    return min(timeit.repeat(func, number=number, repeat=5)) / number * 1e6
+
+
+def main():
+    for words in (10, 100, 1000):
+        line = colored_line(words)
+        plain = strip_ansi(line)
+        chunks = [line[i:i + 64] for i in range(0, len(line), 64)]
+        number = max(10, 20000 // words)
+
+        assert strip_ansi(line) == legacy_escape_ansi_string(line)
+        assert measure_ansi(line) == legacy_measure_ansi_string(line)
+        assert measure_ansi_runs(line) == measure_ansi_escapes(line) == measure_ansi(line)
+
+        print("%s words (%s characters, %s displayed):" % (words, len(line), len(plain)))
+        rows = [
+            ("escape_ansi_string (legacy)", lambda: legacy_escape_ansi_string(line)),
+            ("strip_ansi", lambda: strip_ansi(line)),
+            ("measure_ansi_string (legacy)", lambda: legacy_measure_ansi_string(line)),
+            ("measure_ansi", lambda: measure_ansi(line)),
+            ("measure_ansi (no escapes)", lambda: measure_ansi(plain)),
+            ("measure from tokenize runs", lambda: measure_ansi_runs(line)),
+            ("measure by escape lengths", lambda: measure_ansi_escapes(line)),
+            ("tokenize", lambda: list(tokenize(line))),
+            ("AnsiScanner (64 char chunks)", lambda: scan_chunks(chunks)),
+        ]
+        for name, func in rows:
+            print("    %-30s %10.2f us" % (name, bench(func, number)))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,2 +1,3 @@
 from .config import settings  # noqa
 from .cursor import Cursor  # noqa
+from .terminal import Terminal  # noqa
@@ -0,0 +1,86 @@
+import collections
+
+
+__all__ = ('SettingsGraph', )
+
+
+class SettingsGraph(object):
+    """
+    Keeps track of the definition of each entry of the sections of the settings
+    (before any forward references are applied) along with the entries that
+    each definition references, so that the entries that depend on an entry can
+    be recomputed when the entry is configured:
+
+    >>> COLORS = {'RED': '#DC3545', 'FAIL': 'RED'}
+    >>> FORMATS = {'FAIL': {'COLOR': 'RED'}}
+
+    >>> graph.dependents([('COLORS', 'RED')])
+    >>> [('COLORS', 'FAIL'), ('FORMATS', 'FAIL')]
+
+    Entries are identified by (section, key) nodes.
+
+    [x] NOTE:
+    --------
+    The graph is only built the first time that the settings are configured,
+    since it is not needed to resolve the settings.
+    """
+
+    def __init__(self, docs, data):
+        """
+        `docs` maps each section to its ConfigDoc class, and `data` is the raw
+        settings data that the sections are built from.
+        """
+        self.docs = docs
+        self.definitions = {}
+        self.references = {}
+        self.dependents_of = collections.defaultdict(set)
+
+        sections = {section: data.get(section, {}) for section in docs}
+        for section, doc_cls in docs.items():
+            for key, definition in sections[section].items():
+                node = (section, key.upper())
+                self.define(node, definition, doc_cls.references(section, definition, sections))
+
+    def copy(self):
+        graph = self.__class__.__new__(self.__class__)
+        graph.docs = self.docs
+        graph.definitions = dict(self.definitions)
+        graph.references = {node: set(refs) for node, refs in self.references.items()}
+        graph.dependents_of = collections.defaultdict(set, {
+            node: set(dependents) for node, dependents in self.dependents_of.items()
+        })
+        return graph
+
+    def define(self, node, definition, references=()):
+        """
+        Sets the definition of the entry and replaces the references of the
+        previous definition.
+        """
+        for reference in self.references.get(node, ()):
+            self.dependents_of[reference].discard(node)
+
+        self.definitions[node] = definition
+        self.references[node] = set(references)
+        for reference in self.references[node]:
+            self.dependents_of[reference].add(node)
+
+    def dependents(self, nodes):
+        """
+        Returns the entries that depend on any of the nodes, directly or
+        indirectly, ordered so that each entry comes after the entries that it
+        references.
+        """
+        visited = set(nodes)
+        ordered = []
+
+        def visit(node):
+            for dependent in self.dependents_of.get(node, ()):
+                if dependent not in visited:
+                    visited.add(dependent)
+                    visit(dependent)
+                    ordered.append(dependent)
+
+        for node in nodes:
+            visit(node)
+        ordered.reverse()
+        return ordered
@@ -1,25 +1,38 @@
+import contextlib
+import contextvars
+import itertools
 import os
 from pathlib import Path
+import threading
+import types
 
 from simple_settings import LazySettings
 from termx.ext import get_root
 
-from .exceptions import ConfigError
+from .exceptions import ConfigError, MissingConfigurationError
 from .doc import ConfigDoc
 from .sections import ColorsDoc, IconsDoc, FormatsDoc, TextDoc
+from .graph import SettingsGraph
+from .snapshot import SettingsSnapshot
 
 """
 [!] IMPORTANT
 -------------
-This all starts to fall apart if we override a value that was self referenced.
-If we have 'PRIMARY' = 'GRAY' and we set 'GRAY' to a different value, it will
-not reflect in 'PRIMARY', because 'PRIMARY' was already changed.
+Values that reference other values (i.e. 'PRIMARY' = 'GRAY') are resolved when
+the sections are built.  In order for overriding 'GRAY' to also be reflected in
+'PRIMARY', the settings keep a SettingsGraph of the references, and `configure()`
+recomputes the values that depend on the configured values.
 
-Fixing this would require a lot of complexity though, so maybe instead we should
-limit self-referencing values like 'PRIMARY'.
+Values set with `configure()` are taken literally, they do not reference other
+values.
 """
 
 
+# Generations are unique across all of the settings (and their overlays), so
+# that a generation identifies the values of the settings it was taken from.
+_generations = itertools.count(1)
+
+
 class LazierSettings(LazySettings):
     """
     We override the simple_settings `LazySettings` module to introduce some
@@ -37,6 +50,16 @@ class LazierSettings(LazySettings):
     SETTINGS_DIR = ('termx', 'config', '_settings', )
     STRICT_CONFIG = True
     CUSTOM_DOCS = ['ICONS', 'COLORS', 'TEXT', 'FORMATS']
+    SECTIONS = {
+        'COLORS': ColorsDoc,
+        'ICONS': IconsDoc,
+        'TEXT': TextDoc,
+        'FORMATS': FormatsDoc,
+    }
+
+    # Number of `override()` blocks that are active in any context, which is
+    # only non-zero while there are overlays to look up (see `override()`).
+    _overrides = 0
 
     def __init__(self):
         """
@@ -44,6 +67,13 @@ class LazierSettings(LazySettings):
         sections will all be plain old dict(s).  We want to convert them to
         ConfigDoc instances so we can leverage the overridden dict behavior.
 
+        [x] NOTE:
+        --------
+        Nothing is loaded here, since `termx` is imported by short lived CLI
+        commands that might never access the settings.  The settings are loaded
+        on first access, and each of the ConfigDoc sections is only built the
+        first time that it is accessed (see `section()`).
+
         [x] TODO:
         --------
         This will be reserved for loading the default system settings (defined
@@ -51,20 +81,104 @@ class LazierSettings(LazySettings):
         that we don't **have** to validate the settings, but we probably should
         use Cerberus anyways.
         """
-
         # Let easy_settings Handle Loading of Setting Values
         settings_path = self.get_settings_path()
         super(LazierSettings, self).__init__(settings_path)
 
-        # Configure Settings with Config Doc Instances
-        data = self.as_dict()
+        # The raw settings data that the sections are built from, and the names
+        # of the sections that have not been built yet.
+        self._base_data = None
+        self._unbuilt = set()
+        self._snapshot = None
+        self._graph = None
+
+        # Values looked up by `get_path()`, keyed by the path as it was given,
+        # and the flattened view of the settings, which are both discarded when
+        # the settings are changed.
+        self._paths = {}
+        self._flat = None
+        self._generation = next(_generations)
+
+        # The sections that are shared with the settings that an overlay was
+        # cloned from, and have to be copied before they are changed.
+        self._shared = set()
+        self._overlay = contextvars.ContextVar('termx_settings_overlay_%s' % id(self))
+        self._overrides_lock = threading.Lock()
+
+    def setup(self):
+        if self._initialized:
+            return
+        super(LazierSettings, self).setup()
+
+        self._base_data = dict(self._dict)
+        self._unbuilt = set(self.SECTIONS)
+
+    def section(self, key):
+        """
+        Returns the ConfigDoc instance for the section, building it from the
+        raw settings data if it has not been accessed yet.
+        """
+        if self._overrides:
+            overlay = self._overlay.get(None)
+            if overlay is not None:
+                return overlay.section(key)
 
-        self.initialize(
-            COLORS=ColorsDoc(data),
-            ICONS=IconsDoc(data),
-            TEXT=TextDoc(data),
-            FORMATS=FormatsDoc(data)
-        )
+        self.setup()
+        key = self.__keytransform__(key)
+        if key in self._unbuilt:
+            doc_cls = self.SECTIONS[key]
+            values = self.snapshot_values(key)
+            if values is not None:
+                self._dict[key] = doc_cls.from_snapshot(self._base_data, values)
+            else:
+                self._dict[key] = doc_cls(self._base_data)
+            self._unbuilt.discard(key)
+        return self._dict[key]
+
+    def snapshot_values(self, key):
+        """
+        Returns the resolved values of the section from the SettingsSnapshot,
+        which is loaded (or created, if it is missing or stale) the first time
+        that a section is built.
+        """
+        if self._snapshot is None:
+            self._snapshot = self._load_snapshot() or {}
+        return self._snapshot.get(key)
+
+    def _load_snapshot(self):
+        if not SettingsSnapshot.enabled():
+            return None
+
+        snapshot = SettingsSnapshot(self._settings_list[0], self._base_data)
+        sections = snapshot.load()
+        if sections is None:
+            # Resolve every section from the settings modules, so that the next
+            # process can skip resolving them.  If any of the values is invalid,
+            # or the snapshot cannot be written, the sections are resolved lazily
+            # instead - so that the error is raised when the value is accessed,
+            # and every process does not resolve the sections for nothing.
+            if not snapshot.writable():
+                return None
+            try:
+                sections = {
+                    key: dict(doc_cls(self._base_data).items())
+                    for key, doc_cls in self.SECTIONS.items()
+                }
+            except ConfigError:
+                return None
+            snapshot.save(sections)
+        return sections
+
+    def as_dict(self):
+        if self._overrides:
+            overlay = self._overlay.get(None)
+            if overlay is not None:
+                return overlay.as_dict()
+
+        self.setup()
+        for key in list(self._unbuilt):
+            self.section(key)
+        return super(LazierSettings, self).as_dict()
 
     @classmethod
     def __SETTINGS_FILE__(cls, default='dev'):
@@ -108,7 +222,6 @@ class LazierSettings(LazySettings):
             '.'.join(cls.SETTINGS_DIR),
             settings_path.name.replace(settings_path.suffix, '')
         ))
-        print("Using Settings %s" % simple_settings_path)
         return simple_settings_path
 
     def __getattr__(self, attr):
@@ -118,9 +231,17 @@ class LazierSettings(LazySettings):
         We do not have to worry about the dynamic_reader property, since we are
         not using that.
         """
+        if self._overrides:
+            overlay = self._overlay.get(None)
+            if overlay is not None:
+                return getattr(overlay, attr)
+
         self.setup()
+        key = self.__keytransform__(attr)
+        if key in self._unbuilt:
+            return self.section(key)
         try:
-            result = self._dict[self.__keytransform__(attr)]
+            result = self._dict[key]
         except KeyError:
             raise AttributeError('You did not set {} setting'.format(attr))
 
@@ -171,28 +292,275 @@ class LazierSettings(LazySettings):
         on ConfigDoc instances, converting them to plain old dicts.
         """
 
+        if self._overrides:
+            overlay = self._overlay.get(None)
+            if overlay is not None:
+                return overlay.configure(*args, **kwargs)
+
         # Setup if Not Initialized (Should be by now)
         self.setup()
 
+        changed = []
+        modified = False
+        depth = None
         override = dict(*args, **kwargs)
         for key, val in override.items():
             key = self.__keytransform__(key)
 
             if key in self.CUSTOM_DOCS:
                 try:
-                    getattr(self.settings, key)
-                except AttributeError:
+                    doc = self._writable_section(key)
+                except KeyError:
                     raise ConfigError(f"{key} was never configured!")
 
-                doc = getattr(self.settings, key)
                 if not isinstance(doc, ConfigDoc):
                     raise ConfigError(f"{key} should have been configured as ConfigDoc!")
 
                 # Non-destructive update
                 doc.update(**val)
                 self._dict.update(**{key: doc})
+                changed.extend([((key, k.upper()), v) for k, v in dict(val).items()])
             else:
+                if key not in self._dict or self._dict[key] != val:
+                    modified = True
                 self._dict.update(**{key: val})
+                if key == 'COLOR_DEPTH' and val != self._base_data['COLOR_DEPTH']:
+                    depth = val
+
+        # All of the configured definitions have to be in the graph before any
+        # section is recomputed, since recomputing the sections for a new
+        # COLOR_DEPTH would otherwise revert the values configured after it.
+        for node, definition in changed:
+            self.graph.define(node, definition)
+        if depth is not None:
+            self._configure_depth(depth)
+        elif changed:
+            self._propagate([node for node, _ in changed])
+        if changed or modified:
+            self._paths = {}
+            self._flat = None
+            self._generation = next(_generations)
+
+    @property
+    def generation(self):
+        """
+        Number that changes whenever `configure()` changes the settings, so that
+        anything computed from the settings (i.e. the RenderPlan of a LogFormat)
+        can tell when it has to be computed again:
+
+        >>> if self._generation != settings.generation:
+        >>>     self.recompute()
+        """
+        return self._active()._generation
+
+    def get_path(self, path):
+        """
+        Returns the value at a dotted path of the settings, case insensitive:
+
+        >>> settings.get_path('TEXT.FADED')
+        >>> settings.get_path('colors.shades')
+
+        Paths are only resolved the first time they are looked up, after which
+        looking up the path only costs a single dict lookup - as opposed to
+        `settings.TEXT.FADED`, which goes through `__getattr__` of the settings
+        and the section.  The looked up values are discarded when `configure()`
+        changes the settings.
+        """
+        if self._overrides:
+            overlay = self._overlay.get(None)
+            if overlay is not None:
+                return overlay.get_path(path)
+        try:
+            return self._paths[path]
+        except KeyError:
+            pass
+
+        # The paths might be discarded while the path is being resolved, in
+        # which case the value is stored in the discarded paths.
+        paths = self._paths
+        value = paths[path] = self._resolve_path(path)
+        return value
+
+    def _resolve_path(self, path):
+        key, *parts = self.__keytransform__(path).split('.')
+        value = getattr(self, key)
+        for i, part in enumerate(parts):
+            if not isinstance(value, ConfigDoc):
+                raise AttributeError('You did not set {} setting'.format(path))
+            try:
+                value = value[part]
+            except KeyError:
+                raise MissingConfigurationError(part, '.'.join([key] + parts[:i]))
+        return value
+
+    def flattened(self):
+        """
+        Returns a frozen view of all of the settings, flattened by their dotted
+        paths (with upper case keys):
+
+        >>> settings.flattened()['TEXT.FADED']
+
+        Unlike `get_path()`, creating the view resolves every value of the
+        settings.  The view is only created again after `configure()` changes
+        the settings.
+        """
+        if self._overrides:
+            overlay = self._overlay.get(None)
+            if overlay is not None:
+                return overlay.flattened()
+
+        flat = self._flat
+        if flat is None:
+            self.setup()
+            values = {}
+
+            def flatten(prefix, value):
+                values[prefix] = value
+                if isinstance(value, ConfigDoc):
+                    for k, v in value.items():
+                        flatten('%s.%s' % (prefix, k), v)
+
+            for key in list(self._dict):
+                flatten(key, getattr(self, key))
+            flat = self._flat = types.MappingProxyType(values)
+        return flat
+
+    @property
+    def graph(self):
+        if self._graph is None:
+            self.setup()
+            self._graph = SettingsGraph(self.SECTIONS, self._base_data)
+        return self._graph
+
+    def _lookup_section(self, key):
+        if key in self.SECTIONS:
+            return self.section(key)
+        return None
+
+    def _propagate(self, nodes):
+        """
+        Recomputes the values that depend on the configured values, directly or
+        indirectly, leaving all of the other values of the sections untouched.
+
+        [x] NOTE:
+        --------
+        Recomputed values are set as new color and Format instances, so any
+        formatting that was compiled for the previous instances (see Format) is
+        not reused.
+        """
+        graph = self.graph
+        for section, key in graph.dependents(nodes):
+            doc_cls = self.SECTIONS[section]
+            definition = graph.definitions[(section, key)]
+            self._writable_section(section)[key] = doc_cls.dereference(
+                section, definition, self._lookup_section)
+
+    def _writable_section(self, key):
+        """
+        Returns the section for it to be changed, copying it first if it is
+        still shared with the settings that the overlay was cloned from, or
+        with an overlay that was cloned from the settings.
+        """
+        doc = self.section(key)
+        if key in self._shared:
+            doc = self._dict[key] = doc.copy_doc(self._base_data)
+            self._shared.discard(key)
+        return doc
+
+    @contextlib.contextmanager
+    def override(self, *args, **kwargs):
+        """
+        Overrides the settings within the current context (thread or asyncio
+        task), without changing them for any other context:
+
+        >>> with settings.override(COLOR_DEPTH=8, COLORS={'RED': '#FF0000'}):
+        >>>     settings.COLORS.FAIL('Failed')
+
+        The overrides are applied like `configure()` would apply them, to an
+        overlay of the settings that only copies the sections that are changed.
+        Overrides can be nested, and `configure()` within an override block only
+        changes the overlay.
+
+        [x] NOTE:
+        --------
+        The overlays are stored in a ContextVar, which is only looked up while
+        an override is active in some context, so that lookups are not slowed
+        down when the settings are not overridden.
+        """
+        overlay = self._active()._clone()
+        overlay.configure(*args, **kwargs)
+
+        with self._overrides_lock:
+            self._overrides += 1
+        token = self._overlay.set(overlay)
+        try:
+            yield self
+        finally:
+            self._overlay.reset(token)
+            with self._overrides_lock:
+                self._overrides -= 1
+
+    def _active(self):
+        if self._overrides:
+            overlay = self._overlay.get(None)
+            if overlay is not None:
+                return overlay
+        return self
+
+    def _clone(self):
+        """
+        Returns an overlay of the settings, which shares the sections that are
+        already built until they are changed - by either the overlay or the
+        settings, so that configuring the settings (i.e. from another thread)
+        never changes the sections of an active overlay.
+        """
+        self.setup()
+
+        shared = set(self.SECTIONS) - self._unbuilt
+        self._shared |= shared
+
+        clone = self.__class__.__new__(self.__class__)
+        clone.__dict__.update(self.__dict__)
+        clone._dict = dict(self._dict)
+        clone._base_data = dict(self._base_data)
+        clone._unbuilt = set(self._unbuilt)
+        clone._shared = set(shared)
+        clone._graph = self._graph.copy() if self._graph is not None else None
+        clone._overlay = contextvars.ContextVar('termx_settings_overlay_%s' % id(clone))
+        clone._overrides_lock = threading.Lock()
+        clone._overrides = 0
+        clone._paths = {}
+        clone._flat = None
+        return clone
+
+    def _configure_depth(self, depth):
+        """
+        Every color depends on the COLOR_DEPTH, so the sections that were already
+        built are recomputed from their definitions, and the sections that were
+        not built yet will be built with the new depth.
+        """
+        # The sections that were already built might be shared with an overlay
+        # (or the settings the overlay was cloned from), and resolve their
+        # values with the data they were built with, so they are copied with
+        # new data.
+        self._base_data = dict(self._base_data, COLOR_DEPTH=depth)
+        self._snapshot = {}
+
+        graph = self.graph
+        built = [key for key in self.SECTIONS if key not in self._unbuilt]
+        for key in built:
+            self._dict[key] = self.section(key).copy_doc(self._base_data)
+            self._shared.discard(key)
+        roots = [
+            node for node, references in graph.references.items()
+            if node[0] in built and not references
+        ]
+        for section, key in roots:
+            self._writable_section(section)[key] = graph.definitions[(section, key)]
+        for section, key in graph.dependents(roots):
+            if section in built:
+                self._writable_section(section)[key] = self.SECTIONS[section].dereference(
+                    section, graph.definitions[(section, key)], self._lookup_section)
 
     def __keytransform__(self, key):
         return key.upper()
@@ -3,9 +3,29 @@ import copy
 from .exceptions import (ConfigError, MissingConfigurationError,
     MissingSectionError, ConfigValueError, DisallowedFieldError)
 from .doc import ConfigDoc
+from .snapshot import AnsiCodes
+
+
+class Unresolved(object):
+    """
+    Placeholder for a value of a SectionDoc that has not been transformed yet.
+    """
+    __slots__ = ('value', )
+
+    def __init__(self, value):
+        self.value = value
 
 
 class SectionDoc(ConfigDoc):
+    """
+    [x] NOTE:
+    --------
+    When `lazy` is set, values are only transformed (i.e. parsed into color or
+    Format objects) the first time they are accessed, since most programs only
+    ever use a few of them.  This means that an invalid value is only raised
+    when it is accessed.
+    """
+    lazy = False
 
     def __init__(self, data):
         self.base_data = data
@@ -16,10 +36,76 @@ class SectionDoc(ConfigDoc):
         forward_referenced_data = self.forward_reference_data(section_data)
         super(SectionDoc, self).__init__(forward_referenced_data)
 
+    @classmethod
+    def from_snapshot(cls, data, values):
+        """
+        Creates the section from values that were already resolved (see
+        SettingsSnapshot), without applying the forward references.
+        """
+        doc = cls.__new__(cls)
+        doc.base_data = data
+        ConfigDoc.__init__(doc, values)
+        return doc
+
+    def copy_doc(self, data):
+        """
+        Returns a shallow copy of the section that resolves its values with the
+        settings data `data`, preserving the values that are not resolved yet.
+        """
+        doc = self.__class__.__new__(self.__class__)
+        dict.update(doc, dict.items(self))
+        doc.base_data = data
+        doc.strict = self.strict
+        return doc
+
     @property
     def section_key(self):
         return self._meta('CONFIG_KEY')
 
+    def __setitem__(self, key, value):
+        if not self.lazy or isinstance(value, ConfigDoc):
+            return super(SectionDoc, self).__setitem__(key, value)
+        try:
+            self.__validate__(value)
+        except ConfigError as e:
+            self._handle_config_error(e)
+        else:
+            dict.__setitem__(self, self.__keytransform__(key), Unresolved(value))
+
+    def __getitem__(self, key):
+        value = super(SectionDoc, self).__getitem__(key)
+        if type(value) is Unresolved:
+            return self._resolve(self.__keytransform__(key), value)
+        return value
+
+    def __validate__(self, value):
+        """
+        Validation of a value that is performed when it is set, even when the
+        transformation of the value is deferred.
+        """
+        pass
+
+    def _resolve(self, key, unresolved):
+        try:
+            value = self.__valtransform__(unresolved.value)
+        except ConfigError as e:
+            self._handle_config_error(e)
+        else:
+            dict.__setitem__(self, key, value)
+            return value
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def values(self):
+        return [self[key] for key in self]
+
+    def items(self):
+        return [(key, self[key]) for key in self]
+
     def get_section(self, data):
         if self.section_key not in data:
             raise MissingSectionError(self.section_key)
@@ -38,6 +124,40 @@ class SectionDoc(ConfigDoc):
         else:
             return super(SectionDoc, self).__getattr__(attr)
 
+    @classmethod
+    def references(cls, section, definition, sections):
+        """
+        Returns the (section, key) entries that the definition of an entry in
+        the section references, where `sections` maps each section to its
+        entries.
+        """
+        entries = sections[section]
+        if isinstance(definition, str):
+            if definition in entries:
+                return {(section, definition)}
+        elif isinstance(definition, list):
+            return {(section, v) for v in definition if isinstance(v, str) and v in entries}
+        return set()
+
+    @classmethod
+    def dereference(cls, section, definition, lookup):
+        """
+        Returns the value of an entry in the section with the references of its
+        definition replaced by the current values of the referenced entries,
+        where `lookup` returns the ConfigDoc for a section (or None if there is
+        no such section).
+        """
+        doc = lookup(section)
+        if isinstance(definition, str):
+            if definition in doc:
+                return doc[definition]
+        elif isinstance(definition, list):
+            return [
+                doc[v] if isinstance(v, str) and v in doc else v
+                for v in definition
+            ]
+        return definition
+
     @classmethod
     def forward_reference_value(cls, data, value):
         if isinstance(value, str):
@@ -89,6 +209,8 @@ class SectionDoc(ConfigDoc):
 
 class FormatSectionDoc(SectionDoc):
 
+    lazy = True
+
     # Currently Do Not Have Styles Built In
     REF_MAP = {
         'COLOR': 'COLORS',
@@ -112,6 +234,42 @@ class FormatSectionDoc(SectionDoc):
         # but it's parent.
         super(SectionDoc, self).__init__(forward_referenced_data)
 
+    @classmethod
+    def references(cls, section, definition, sections):
+        """
+        Formats can reference another Format in the same section, or the entries
+        of other sections for each of the fields in REF_MAP.
+        """
+        if isinstance(definition, str):
+            return super(FormatSectionDoc, cls).references(section, definition, sections)
+
+        references = set()
+        if isinstance(definition, dict):
+            for k, v in definition.items():
+                ref_section = cls.REF_MAP.get(k.upper())
+                if (ref_section in sections and isinstance(v, str)
+                        and v in sections[ref_section]):
+                    references.add((ref_section, v))
+        return references
+
+    @classmethod
+    def dereference(cls, section, definition, lookup):
+        if isinstance(definition, str):
+            doc = lookup(section)
+            if definition in doc:
+                return doc[definition].copy()
+            return definition
+
+        elif isinstance(definition, dict):
+            dereferenced = {}
+            for k, v in definition.items():
+                ref_doc = lookup(cls.REF_MAP.get(k.upper()))
+                if ref_doc is not None and isinstance(v, str) and v in ref_doc:
+                    v = ref_doc[v]
+                dereferenced[k] = v
+            return dereferenced
+        return definition
+
     @property
     def allowable_fields(self):
         fields = self._meta('ALLOWED')
@@ -133,6 +291,10 @@ class FormatSectionDoc(SectionDoc):
                 if key not in [fld.upper() for fld in allowable_fields]:
                     raise DisallowedFieldError(key)
 
+    def __validate__(self, value):
+        if isinstance(value, dict):
+            self._raise_if_has_disallowed_field(value)
+
     def __deepcopy__(self, memo):
         """
         Required for simple_settings module.
@@ -237,6 +399,8 @@ class ColorsDoc(SectionDoc):
     Rebuild in not allowing the NOT_CONFIGURABLE fields to be overridden
     by the user.  We will have to do this when the configuration is overridden.
     """
+    lazy = True
+
     class Meta:
         CONFIG_KEY = 'COLORS'
         NOT_CONFIGURABLE = ('SHADES', )
@@ -292,6 +456,9 @@ class ColorsDoc(SectionDoc):
             # Have to use a special method to avoid circular imports.
             depth = self.base_data['COLOR_DEPTH']
             return color(value, depth=depth)
+        elif isinstance(value, AnsiCodes):
+            # ANSI codes that were already resolved (see SettingsSnapshot).
+            return color(tuple(value))
         elif isinstance(value, list):
             return [self.__valtransform__(v) for v in value]
         elif isinstance(value, color):
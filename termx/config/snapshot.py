@@ -0,0 +1,240 @@
+import json
+import os
+import sys
+import tempfile
+
+
+"""
+[x] NOTE:
+--------
+Resolving the sections of the settings requires applying the forward references
+of each section and parsing every color into ANSI codes, which every short lived
+CLI command would otherwise repeat.  Instead, the resolved values are stored in a
+snapshot file under the user cache directory, which is used as long as none of
+the inputs to the resolution have changed.
+
+The snapshot only stores the values that the settings modules define, values
+changed with `settings.configure()` are applied on top of the snapshot and are
+never written to it.
+"""
+
+__all__ = ('SettingsSnapshot', 'AnsiCodes', 'cache_dir', )
+
+
+# Incremented whenever the format of the snapshot file changes.
+SNAPSHOT_VERSION = 1
+
+# Set to "0" to disable the snapshot cache entirely.
+SNAPSHOT_ENV_VAR = 'TERMX_SETTINGS_CACHE'
+CACHE_DIR_ENV_VAR = 'TERMX_CACHE_DIR'
+
+# Modules (relative to the termx package) whose code determines how the
+# settings are resolved, in addition to the settings modules themselves.
+RESOLUTION_MODULES = (
+    ('config', 'sections.py'),
+    ('fmt', 'colorlib', 'palette.py'),
+)
+
+
+def cache_dir():
+    """
+    Returns the directory that termx caches files in for the current user,
+    following the conventions of the platform.
+    """
+    if os.environ.get(CACHE_DIR_ENV_VAR):
+        return os.environ[CACHE_DIR_ENV_VAR]
+    elif sys.platform == 'win32':
+        base = os.environ.get('LOCALAPPDATA') or os.path.expanduser('~')
+        return os.path.join(base, 'termx', 'Cache')
+    elif sys.platform == 'darwin':
+        return os.path.join(os.path.expanduser('~'), 'Library', 'Caches', 'termx')
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'termx')
+
+
+def _mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def encode_value(value):
+    """
+    Encodes a resolved value of a section (color, Format, str or list) as JSON
+    serializable data.
+    """
+    from termx.fmt import Format, color
+
+    if isinstance(value, color):
+        return {'codes': list(value.ansi_codes)}
+    elif isinstance(value, Format):
+        if value.highlight:
+            raise TypeError(value)
+        return {'format': {
+            'COLOR': list(value.color.ansi_codes) if value.color else None,
+            'STYLES': list(value.styles.styles),
+            'ICON': value.icon,
+            'WRAPPER': value.wrapper,
+        }}
+    elif isinstance(value, list):
+        return [encode_value(v) for v in value]
+    elif isinstance(value, (str, int)) or value is None:
+        return value
+    # The value cannot be restored from the snapshot.
+    raise TypeError(value)
+
+
+class AnsiCodes(tuple):
+    """
+    The ANSI codes of a color that was resolved in a snapshot, which are only
+    transformed into colors without parsing when they come from a snapshot.
+    """
+    __slots__ = ()
+
+
+def decode_value(value):
+    """
+    Decodes a value encoded by `encode_value()` into the form that the sections
+    transform into color and Format objects without parsing - the ANSI codes of
+    colors are decoded as AnsiCodes, and the ANSI codes of the color of a Format
+    as a tuple.
+    """
+    if isinstance(value, dict):
+        if 'codes' in value:
+            return AnsiCodes(value['codes'])
+        return {
+            k: tuple(v) if isinstance(v, list) else v
+            for k, v in value['format'].items()
+        }
+    elif isinstance(value, list):
+        return [decode_value(v) for v in value]
+    return value
+
+
+class SettingsSnapshot(object):
+    """
+    Snapshot of the resolved sections of the settings that are loaded from the
+    settings module at `settings_path`, stored in a versioned file:
+
+    >>> snapshot = SettingsSnapshot('termx.config._settings.dev', data)
+    >>> sections = snapshot.load()
+    >>> if sections is None:
+    >>>     snapshot.save(resolved_sections)
+
+    The snapshot is keyed by the settings module path, the modification times
+    of the settings modules and the modules that resolve them, the COLOR_DEPTH
+    and the version of termx.  A snapshot with a different key is ignored and
+    replaced the next time the snapshot is saved.
+
+    [x] NOTE:
+    --------
+    Failing to read or write the snapshot is never an error, the settings are
+    just resolved from the settings modules instead.
+
+    When the resolved values cannot be stored (i.e. a value that JSON cannot
+    represent), a snapshot without any sections is saved instead, so that
+    later processes know not to resolve the sections just to store them.
+    """
+
+    def __init__(self, settings_path, data):
+        self.settings_path = settings_path
+        self.key = {
+            'snapshot': SNAPSHOT_VERSION,
+            'settings': settings_path,
+            'mtimes': self.mtimes(settings_path),
+            'color_depth': data.get('COLOR_DEPTH'),
+            'version': list(data.get('VERSION') or ()),
+        }
+
+    @staticmethod
+    def enabled():
+        return os.environ.get(SNAPSHOT_ENV_VAR, '1') != '0'
+
+    @property
+    def path(self):
+        return os.path.join(cache_dir(), 'settings-%s.json' % self.settings_path)
+
+    @staticmethod
+    def mtimes(settings_path):
+        """
+        Returns the modification times of the files of the settings modules that
+        were imported from the settings package, along with the files of the
+        modules that resolve the settings.
+        """
+        package = settings_path.rsplit('.', 1)[0]
+        files = sorted(
+            module.__file__ for name, module in list(sys.modules.items())
+            if name.startswith(package) and getattr(module, '__file__', None)
+        )
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        files.extend([os.path.join(root, *parts) for parts in RESOLUTION_MODULES])
+        return [[path, _mtime(path)] for path in files]
+
+    def writable(self):
+        """
+        Returns whether or not the snapshot file can be written, creating the
+        cache directory if it does not exist.
+        """
+        directory = os.path.dirname(self.path)
+        try:
+            os.makedirs(directory, exist_ok=True)
+        except OSError:
+            return False
+        return os.access(directory, os.W_OK)
+
+    def load(self):
+        """
+        Returns the decoded values of each section in the snapshot, or None if
+        there is no valid snapshot for the key.  If the sections could not be
+        stored in the snapshot, no values are returned for any section.
+        """
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                content = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(content, dict) or content.get('key') != self.key:
+            return None
+        elif content.get('sections') is None:
+            return {}
+
+        return {
+            section: {k: decode_value(v) for k, v in values.items()}
+            for section, values in content['sections'].items()
+        }
+
+    def save(self, sections):
+        """
+        Writes the resolved values of each section to the snapshot file, replacing
+        the existing file atomically so that a concurrent process never reads a
+        partially written snapshot.
+        """
+        try:
+            content = json.dumps({
+                'key': self.key,
+                'sections': {
+                    section: {k: encode_value(v) for k, v in values.items()}
+                    for section, values in sections.items()
+                },
+            }, ensure_ascii=False)
+        except TypeError:
+            self._write(json.dumps({'key': self.key, 'sections': None}))
+            return False
+        return self._write(content)
+
+    def _write(self, content):
+        directory = os.path.dirname(self.path)
+        try:
+            os.makedirs(directory, exist_ok=True)
+            fd, temporary = tempfile.mkstemp(dir=directory, prefix='.settings-', suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    f.write(content)
+                os.replace(temporary, self.path)
+            except BaseException:
+                os.unlink(temporary)
+                raise
+        except OSError:
+            return False
+        return True
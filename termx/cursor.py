@@ -1,13 +1,44 @@
 import contextlib
+from dataclasses import dataclass
 import sys
+import threading
 
 import logging
 
+from termx.ext.compat import ENCODING
+
+
+@dataclass
+class FrameStats:
+    """
+    Counts the number of characters and the number of calls made to the
+    underlying stream, which correspond to syscalls on an unbuffered terminal.
+    """
+    frames: int = 0
+    bytes: int = 0
+    writes: int = 0
+    flushes: int = 0
+
+    @property
+    def syscalls(self):
+        return self.writes + self.flushes
+
+    def reset(self):
+        self.frames = self.bytes = self.writes = self.flushes = 0
+
 
 class Cursor:
 
     output = sys.stdout.write
 
+    # Statistics for the last completed frame and totals since the last reset.
+    frame_stats = FrameStats()
+    stats = FrameStats()
+
+    # Frames are buffered per thread, so that writes from a thread that is not
+    # rendering a frame are not swallowed by another thread's buffer.
+    _local = threading.local()
+
     @classmethod
     @contextlib.contextmanager
     def stdout_replacement(cls, func):
@@ -50,8 +81,69 @@ class Cursor:
                     cls.write_line(message)
 
     @classmethod
-    def write(cls, text):
+    @contextlib.contextmanager
+    def frame(cls):
+        """
+        Buffers all of the escape sequences and text written while the context
+        is active in memory, and emits them with a single write and a single
+        flush when the context exits.
+
+        >>> with Cursor.frame():
+        >>>     Cursor.move_up(2)
+        >>>     Cursor.overwrite("Updated Line", newline=False)
+        >>>     Cursor.move_down(2)
+
+        Nested frames are merged into the outermost frame.
+        """
+        if cls._buffer() is not None:
+            yield cls
+            return
+
+        cls._local.buffer = []
+        try:
+            yield cls
+        finally:
+            buffer = cls._local.buffer
+            cls._local.buffer = None
+            cls._flush_frame(buffer)
+
+    @classmethod
+    def _buffer(cls):
+        return getattr(cls._local, 'buffer', None)
+
+    @classmethod
+    def _flush_frame(cls, buffer):
+        if not buffer:
+            return
+
+        text = "".join(buffer)
+        cls._output(text)
+        cls.flush()
+
+        cls.frame_stats.frames = 1
+        cls.frame_stats.bytes = len(text.encode(ENCODING))
+        cls.frame_stats.writes = 1
+        cls.frame_stats.flushes = 1
+        cls.stats.frames += 1
+
+    @classmethod
+    def _output(cls, text):
         cls.output(text)
+        cls.stats.writes += 1
+        cls.stats.bytes += len(text.encode(ENCODING))
+
+    @classmethod
+    def flush(cls):
+        sys.stdout.flush()
+        cls.stats.flushes += 1
+
+    @classmethod
+    def write(cls, text):
+        buffer = cls._buffer()
+        if buffer is not None:
+            buffer.append(text)
+        else:
+            cls._output(text)
 
     @classmethod
     def write_line(cls, text, newline=True):
@@ -79,21 +171,33 @@ class Cursor:
 
     @classmethod
     def move_right(cls, n=1):
+        # A count of 0 is treated as 1 by terminals.
+        if n < 1:
+            return
         chars = "\u001b[%sC" % n
         cls.write(chars)
 
     @classmethod
     def move_left(cls, n=1):
+        # A count of 0 is treated as 1 by terminals.
+        if n < 1:
+            return
         chars = "\u001b[%sD" % n
         cls.write(chars)
 
     @classmethod
     def move_up(cls, n=1):
+        # A count of 0 is treated as 1 by terminals.
+        if n < 1:
+            return
         chars = "\u001b[%sA" % n
         cls.write(chars)
 
     @classmethod
     def move_down(cls, n=1):
+        # A count of 0 is treated as 1 by terminals.
+        if n < 1:
+            return
         chars = "\u001b[%sB" % n
         cls.write(chars)
 
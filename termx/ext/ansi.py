@@ -0,0 +1,189 @@
+"""
+[x] NOTE:
+--------
+Scanner for text that is formatted with ANSI escape sequences, which splits the
+text into runs of escape sequences and text in a single pass.
+
+Measuring text that contains escape sequences still builds a copy of the text
+without them, see `measure_ansi()`.
+
+Like the rest of the ext module, this module should not depend on functionality
+elsewhere in the app.
+"""
+import functools
+import re
+import unicodedata
+
+
+__all__ = (
+    'ANSI_ESCAPE',
+    'SGR_RESETS',
+    'tokenize',
+    'strip_ansi',
+    'measure_ansi',
+    'display_width',
+    'AnsiScanner',
+)
+
+
+# Control Sequence Introducer (CSI) sequences, i.e. "\x1b[38;5;1m".
+ANSI_ESCAPE = re.compile(r'\x1B\[[0-?]*[ -/]*[@-~]')
+ANSI_ESCAPE_RUNS = re.compile(r'(\x1B\[[0-?]*[ -/]*[@-~])')
+
+# The start of a CSI sequence that has not been terminated yet.
+ANSI_ESCAPE_PARTIAL = re.compile(r'\x1B(\[[0-?]*[ -/]*)?')
+
+SGR_RESETS = ('\x1b[0m', '\x1b[m')
+
+
+def tokenize(text):
+    """
+    Yields the runs of the text as tuples `(escape, run)`, where `escape` is
+    whether or not the run is an escape sequence:
+
+    >>> list(tokenize("\x1b[31mError\x1b[0m: Message"))
+    >>> [(True, "\x1b[31m"), (False, "Error"), (True, "\x1b[0m"), (False, ": Message")]
+    """
+    if '\x1b' not in text:
+        if text:
+            yield False, text
+        return
+
+    # Splitting on the captured pattern alternates between the runs of text
+    # and the escape sequences, starting with text.
+    escape = False
+    for run in ANSI_ESCAPE_RUNS.split(text):
+        if run:
+            yield escape, run
+        escape = not escape
+
+
+def strip_ansi(text):
+    """
+    Returns the text without any of the ANSI escape sequences.
+    """
+    if '\x1b' not in text:
+        return text
+    return ANSI_ESCAPE.sub('', text)
+
+
+def measure_ansi(text):
+    """
+    Returns the number of characters of the text that are displayed.
+
+    [x] NOTE:
+    --------
+    Text without any escape sequences is measured without scanning it with the
+    regex.  Otherwise, the text is stripped of the sequences and the stripped
+    copy is measured - measuring the runs of the scanner, or subtracting the
+    length of each sequence found with the regex, avoids the copy but is slower
+    in CPython (see benchmarks/ansi.py).
+    """
+    if '\x1b' not in text:
+        return len(text)
+    return len(ANSI_ESCAPE.sub('', text))
+
+
+@functools.lru_cache(maxsize=4096)
+def _char_width(char):
+    if unicodedata.combining(char) or unicodedata.category(char) in ('Mn', 'Me', 'Cf'):
+        return 0
+    elif unicodedata.east_asian_width(char) in ('W', 'F'):
+        return 2
+    return 1
+
+
+def display_width(text):
+    """
+    Returns the number of columns that the text (without any escape sequences)
+    occupies when displayed in a terminal, where wide characters (i.e. CJK and
+    most emoji) occupy two columns and combining characters occupy none:
+
+    >>> display_width("Error")
+    >>> 5
+    >>> display_width("エラー")
+    >>> 6
+
+    [x] NOTE:
+    --------
+    The widths are determined from the Unicode database, which terminals mostly
+    agree with - but emoji sequences joined with zero width joiners are counted
+    as the sum of the emoji.
+    """
+    if text.isascii():
+        return len(text)
+    return sum(map(_char_width, text))
+
+
+class AnsiScanner(object):
+    """
+    Incremental version of `tokenize`, for text that is received in chunks
+    (i.e. from a stream), that also keeps track of the SGR sequences (colors
+    and styles) that are active at the current position:
+
+    >>> scanner = AnsiScanner()
+    >>> for chunk in chunks:
+    >>>     for escape, run in scanner.feed(chunk):
+    >>>         ...
+    >>> for escape, run in scanner.flush():
+    >>>     ...
+
+    An escape sequence that is split across chunks is held back until the rest
+    of it is fed, so escape sequences are always yielded whole.  Runs of text
+    may be split at the boundaries of the chunks.
+
+    [x] NOTE:
+    --------
+    The active SGR sequences are cleared by a reset sequence ("\x1b[0m"), the
+    sequences that only reset a single attribute (i.e. "\x1b[39m") are kept
+    along with the sequences they reset, which has the same effect when they
+    are applied again.
+    """
+
+    def __init__(self):
+        self.pending = ""
+        self.active = []
+
+    @property
+    def sgr(self):
+        """
+        The SGR sequences that are active at the current position, joined into
+        a single string.
+        """
+        return "".join(self.active)
+
+    def feed(self, chunk):
+        text = self.pending + chunk
+        self.pending = ""
+
+        index = text.rfind('\x1b')
+        if index != -1 and not ANSI_ESCAPE.match(text, index):
+            if ANSI_ESCAPE_PARTIAL.fullmatch(text, index):
+                self.pending = text[index:]
+                text = text[:index]
+        return self._scan(text)
+
+    def flush(self):
+        """
+        Yields any text held back at the end of the input, which was never
+        terminated as an escape sequence.
+        """
+        text, self.pending = self.pending, ""
+        if text:
+            yield False, text
+
+    def scan(self, text):
+        """
+        Yields the runs of a complete text.
+        """
+        yield from self.feed(text)
+        yield from self.flush()
+
+    def _scan(self, text):
+        for escape, run in tokenize(text):
+            if escape and run[-1] == 'm':
+                if run in SGR_RESETS:
+                    self.active = []
+                else:
+                    self.active.append(run)
+            yield escape, run
@@ -18,20 +18,19 @@ Utilities that are private to the package should be placed in framework.py.
 
 import asyncio
 from functools import wraps
-import re
 import sys
 
+from termx.ext.ansi import strip_ansi, measure_ansi
+
 from .formatting import *  # noqa
 
 
 def escape_ansi_string(value):
-    ansi_escape = re.compile(r'\x1B\[[0-?]*[ -/]*[@-~]')
-    return ansi_escape.sub('', value)
+    return strip_ansi(value)
 
 
 def measure_ansi_string(value):
-    bare = escape_ansi_string(value)
-    return len(bare)
+    return measure_ansi(value)
 
 
 def percentage(num1, num2):
@@ -60,13 +60,11 @@ class abstract_formatter(object):
         """
         Returns the ANSI code sequence for a given color string.
 
-        [x] IMPORTANT
-        -------------
-        This is the only purpose of keeping plumbum around: they support flexible
-        color string identification, such as 'red' and HEX colors like '#EFEFEF'.
-
-        For this case, we could just do colors.fg(...).ansi_sequence, but we want to
-        start removing reliance on plumbum's library.
+        [x] NOTE
+        --------
+        Color strings, such as 'red' and HEX colors like '#EFEFEF', are resolved
+        into ANSI codes by the built-in palette (see colorlib.palette), so plumbum
+        is only needed for colors specified as ANSI escape sequences.
         """
         if len(self.ansi_codes) == 0:
             raise ColorLibError('Cannot generate ANSI sequence for empty set of ANSI codes.')
@@ -1,10 +1,11 @@
-import plumbum
-from plumbum import colors
+import functools
+import weakref
 
 from termx.library import ensure_iterable
 from termx.exceptions import InvalidColor, InvalidStyle, ColorLibError
 
 from .base import abstract_formatter
+from .palette import resolve_color
 from .style import style
 
 """
@@ -77,28 +78,132 @@ We cannot just slice the ansi codes:
 """
 
 
+# Maximum number of (class, value, depth) color resolutions that are cached.
+COLOR_CACHE_SIZE = 512
+
+
+@functools.lru_cache(maxsize=COLOR_CACHE_SIZE)
+def resolve_color_string(color_cls, value, depth):
+    """
+    Resolves the ANSI codes for a color string at the provided color depth,
+    caching the result process wide so that the same color string is only
+    parsed once per class and depth.
+
+    Color names and HEX values are resolved by the built-in palette, and only
+    the strings it cannot resolve are parsed by plumbum, if it is installed.
+
+    [x] NOTE:
+    --------
+    The codes are returned as a tuple so that the cached value cannot be mutated
+    by any of the colors sharing it.
+    """
+    codes = resolve_color(value, depth, background=color_cls.background)
+    if codes is not None:
+        return codes
+
+    # Plumbum also supports specifying colors as ANSI escape sequences, but it
+    # is only imported (if installed) when it is actually needed.
+    if '\033' not in value:
+        raise InvalidColor(value)
+    try:
+        from plumbum import colors
+        from plumbum.colorlib.styles import ColorNotFound
+    except ImportError:
+        raise InvalidColor(value)
+
+    try:
+        cl = getattr(colors, color_cls.plumbum_operator)(value)
+    except ColorNotFound:
+        raise InvalidColor(value)
+    codes = color_cls.get_ansi_codes_for_color_depth(cl, depth)
+    return ensure_iterable(codes, coercion=tuple, force_coerce=True)
+
+
 class abstract_color(abstract_formatter):
+    """
+    Colors are immutable, interned flyweights - there is a single instance for
+    each color class and set of ANSI codes, which can be safely shared between
+    any number of Format instances, settings and log records:
+
+    >>> color('red', depth=8) is color([31])
+    >>> True
 
-    def __init__(self, value, depth=None):
+    Copying a color returns the same instance, and assigning any attribute of a
+    color raises a ColorLibError.
+
+    [x] NOTE:
+    --------
+    Resolving a color string is cached by `resolve_color_string`, so creating
+    colors from the same string repeatedly does not re-parse the string.  The
+    hit/miss statistics of the cache are available from `cache_info()`.
+
+    The interned instances are only weakly referenced, so colors that are no
+    longer used (i.e. from 24 bit HEX values) do not accumulate.
+    """
+
+    _instances = weakref.WeakValueDictionary()
+
+    def __new__(cls, value=None, depth=None):
         """
         When initializing a color from settings, we cannot import settings
         to access COLOR_DEPTH, because it causes a circular import.  This
         means that we have to directly pass in the COLOR_DEPTH only in the case
         of initializing colors from the settings module.
         """
-        self._raw = value
-        self._ansi_codes = self.get_ansi_codes(value, depth=depth)
+        if type(value) is cls:
+            return value
+
+        codes = cls.get_ansi_codes(value, depth=depth)
+        key = (cls, codes)
+        instance = cls._instances.get(key)
+        if instance is None:
+            instance = super(abstract_color, cls).__new__(cls)
+            object.__setattr__(instance, '_ansi_codes', codes)
+            instance = cls._instances.setdefault(key, instance)
+        return instance
+
+    def __init__(self, value=None, depth=None):
+        # The instance is initialized by __new__, since it might be shared.
+        pass
+
+    def __setattr__(self, name, value):
+        raise ColorLibError(
+            'Colors are immutable, create a new color with the ANSI codes instead.')
+
+    def __delattr__(self, name):
+        raise ColorLibError('Colors are immutable.')
+
+    def __reduce__(self):
+        return (self.__class__, (self._ansi_codes, ))
 
     def copy(self):
-        return self.__class__(self._raw)
+        return self
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return self._ansi_codes == other._ansi_codes
+
+    def __hash__(self):
+        return hash((self.__class__, self._ansi_codes))
 
     @property
     def ansi_codes(self):
         return self._ansi_codes
 
-    @ansi_codes.setter
-    def ansi_codes(self, value):
-        self._ansi_codes = self.get_ansi_codes(value)
+    @classmethod
+    def cache_info(cls):
+        return resolve_color_string.cache_info()
+
+    @classmethod
+    def cache_clear(cls):
+        resolve_color_string.cache_clear()
 
     @classmethod
     def get_ansi_codes_for_color_depth(cls, color, depth):
@@ -141,19 +246,13 @@ class abstract_color(abstract_formatter):
         --------
         Add support for other forms of specification, like RGBA.
         """
-        try:
-            cl = cls.plumbum_operator(color)
-        except plumbum.colorlib.styles.ColorNotFound:
-            raise InvalidColor(color)
-        else:
-            # This block can hit a circular import when initializing a color from
-            # settings if the color depth is not directly passed in.
-            if not depth:
-                from termx.config import settings
-                depth = settings.COLOR_DEPTH
+        # This block can hit a circular import when initializing a color from
+        # settings if the color depth is not directly passed in.
+        if not depth:
+            from termx.config import settings
+            depth = settings.COLOR_DEPTH
 
-            codes = cls.get_ansi_codes_for_color_depth(cl, depth)
-            return ensure_iterable(codes, coercion=list, force_coerce=True)
+        return resolve_color_string(cls, color, depth)
 
     @classmethod
     def get_ansi_codes(cls, value, depth=None):
@@ -168,10 +267,10 @@ class abstract_color(abstract_formatter):
         elif isinstance(value, (tuple, list)):
             if any([not isinstance(v, int) for v in value]):
                 raise InvalidColor(value)
-            return value
+            return tuple(value)
 
         elif isinstance(value, int):
-            return ensure_iterable(value, coercion=list, force_coerce=True)
+            return ensure_iterable(value, coercion=tuple, force_coerce=True)
 
         else:
             raise InvalidColor(value)
@@ -230,7 +329,9 @@ class abstract_color(abstract_formatter):
 
 class color(abstract_color):
 
-    plumbum_operator = colors.fg
+    background = False
+
+    plumbum_operator = 'fg'
 
     def highlight(self, text):
         color = highlight(self.ansi_codes)
@@ -239,4 +340,6 @@ class color(abstract_color):
 
 class highlight(abstract_color):
 
-    plumbum_operator = colors.bg
+    background = True
+
+    plumbum_operator = 'bg'
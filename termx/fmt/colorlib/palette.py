@@ -0,0 +1,194 @@
+"""
+Built-in resolution of color names and HEX values into ANSI codes, without
+relying on plumbum's color parsing.
+
+Colors can be specified by any of the xterm-256 color names (case insensitive,
+ignoring spaces and underscores) or as a `#RRGGBB` HEX value:
+
+>>> resolve_color('DarkOliveGreen3', depth=256)
+>>> (38, 5, 149)
+
+>>> resolve_color('#28A745', depth=8)
+>>> (32, )
+
+The palette and the nearest color algorithms mirror plumbum's, so that the
+ANSI codes are identical to those previously generated by plumbum for each of
+the supported color depths:
+
+(1) 24 (true color) ==> ANSI Codes [x, x, x, x, x]
+(2) 256 (full) ==> ANSI Codes [x, x, x]
+(3) 16 (simple) ==> ANSI Codes [x]
+(4) 8 (basic) ==> ANSI Codes [x]
+"""
+
+COLOR_NAMES = tuple("""
+black red green yellow blue magenta cyan light_gray dark_gray light_red
+light_green light_yellow light_blue light_magenta light_cyan white grey_0
+navy_blue dark_blue blue_3 blue_3a blue_1 dark_green deep_sky_blue_4
+deep_sky_blue_4a deep_sky_blue_4b dodger_blue_3 dodger_blue_2 green_4
+spring_green_4 turquoise_4 deep_sky_blue_3 deep_sky_blue_3a dodger_blue_1
+green_3 spring_green_3 dark_cyan light_sea_green deep_sky_blue_2
+deep_sky_blue_1 green_3a spring_green_3a spring_green_2 cyan_3
+dark_turquoise turquoise_2 green_1 spring_green_2a spring_green_1
+medium_spring_green cyan_2 cyan_1 dark_red deep_pink_4 purple_4 purple_4a
+purple_3 blue_violet orange_4 grey_37 medium_purple_4 slate_blue_3
+slate_blue_3a royal_blue_1 chartreuse_4 dark_sea_green_4 pale_turquoise_4
+steel_blue steel_blue_3 cornflower_blue chartreuse_3 dark_sea_green_4a
+cadet_blue cadet_blue_a sky_blue_3 steel_blue_1 chartreuse_3a pale_green_3
+sea_green_3 aquamarine_3 medium_turquoise steel_blue_1a chartreuse_2a
+sea_green_2 sea_green_1 sea_green_1a aquamarine_1 dark_slate_gray_2
+dark_red_a deep_pink_4a dark_magenta dark_magenta_a dark_violet purple
+orange_4a light_pink_4 plum_4 medium_purple_3 medium_purple_3a slate_blue_1
+yellow_4 wheat_4 grey_53 light_slate_grey medium_purple light_slate_blue
+yellow_4_a dark_olive_green_3 dark_sea_green light_sky_blue_3
+light_sky_blue_3a sky_blue_2 chartreuse_2 dark_olive_green_3a pale_green_3a
+dark_sea_green_3 dark_slate_gray_3 sky_blue_1 chartreuse_1 light_green_a
+light_green_b pale_green_1 aquamarine_1a dark_slate_gray_1 red_3
+deep_pink_4b medium_violet_red magenta_3 dark_violet_a purple_a
+dark_orange_3 indian_red hot_pink_3 medium_orchid_3 medium_orchid
+medium_purple_2 dark_goldenrod light_salmon_3 rosy_brown grey_63
+medium_purple_2a medium_purple_1 gold_3 dark_khaki navajo_white_3 grey_69
+light_steel_blue_3 light_steel_blue yellow_3 dark_olive_green_3b
+dark_sea_green_3a dark_sea_green_2 light_cyan_3 light_sky_blue_1
+green_yellow dark_olive_green_2 pale_green_1a dark_sea_green_2a
+dark_sea_green_1 pale_turquoise_1 red_3a deep_pink_3 deep_pink_3a magenta_3a
+magenta_3b magenta_2 dark_orange_3a indian_red_a hot_pink_3a hot_pink_2
+orchid medium_orchid_1 orange_3 light_salmon_3a light_pink_3 pink_3 plum_3
+violet gold_3a light_goldenrod_3 tan misty_rose_3 thistle_3 plum_2 yellow_3a
+khaki_3 light_goldenrod_2 light_yellow_3 grey_84 light_steel_blue_1 yellow_2
+dark_olive_green_1 dark_olive_green_1a dark_sea_green_1a honeydew_2
+light_cyan_1 red_1 deep_pink_2 deep_pink_1 deep_pink_1a magenta_2a magenta_1
+orange_red_1 indian_red_1 indian_red_1a hot_pink hot_pink_a medium_orchid_1a
+dark_orange salmon_1 light_coral pale_violet_red_1 orchid_2 orchid_1
+orange_1 sandy_brown light_salmon_1 light_pink_1 pink_1 plum_1 gold_1
+light_goldenrod_2a light_goldenrod_2b navajo_white_1 misty_rose_1 thistle_1
+yellow_1 light_goldenrod_1 khaki_1 wheat_1 cornsilk_1 grey_10_0 grey_3
+grey_7 grey_11 grey_15 grey_19 grey_23 grey_27 grey_30 grey_35 grey_39
+grey_42 grey_46 grey_50 grey_54 grey_58 grey_62 grey_66 grey_70 grey_74
+grey_78 grey_82 grey_85 grey_89 grey_93
+""".split())
+
+# Lookup of the normalized names to their index in the palette.  Some of the
+# names are duplicated, in which case the first occurrence is used.
+_NAME_INDICES = {}
+for _index, _name in enumerate(COLOR_NAMES):
+    _NAME_INDICES.setdefault(_name.replace('_', ''), _index)
+
+# The 16 base colors, where the standard colors are at 0xC0 and the bright
+# colors are at 0xFF (with the exception of dark gray).
+_BASE_PATTERN = [(n % 2, n // 2 % 2, n // 4) for n in range(8)]
+_BASE = (
+    [tuple(x * 192 for x in pattern) for pattern in _BASE_PATTERN]
+    + [(128, 128, 128)]
+    + [tuple(x * 255 for x in pattern) for pattern in _BASE_PATTERN][1:]
+)
+
+# The 6 x 6 x 6 color cube.
+_CUBE_LEVELS = (0x00, 0x5F, 0x87, 0xAF, 0xD7, 0xFF)
+_CUBE = [
+    (_CUBE_LEVELS[n // 36], _CUBE_LEVELS[n // 6 % 6], _CUBE_LEVELS[n % 6])
+    for n in range(216)
+]
+
+# The 24 step grayscale ramp.
+_GREY_PERCENTAGES = (3.4, 7.4, 11, 15, 19, 23, 26.7, 30.49, 34.6, 38.6, 42.4,
+    46.4, 50, 54, 58, 62, 66, 69.8, 73.8, 77.7, 81.6, 85.3, 89.3, 93)
+_GREY_LEVELS = tuple(int(x / 100.0 * 16 * 16) for x in _GREY_PERCENTAGES)
+_GREYS = [(x, x, x) for x in _GREY_LEVELS]
+
+PALETTE = tuple(_BASE + _CUBE + _GREYS)
+
+# The 16 color codes, offset from 30 (foreground) or 40 (background).
+SIMPLE_CODES = tuple(range(8)) + tuple(range(60, 68))
+
+
+def _distance(rgb, index):
+    r, g, b = PALETTE[index]
+    return (rgb[0] - r) ** 2 + (rgb[1] - g) ** 2 + (rgb[2] - b) ** 2
+
+
+def _nearest_index(values, target):
+    return min(range(len(values)), key=lambda i: abs(values[i] - target))
+
+
+def nearest_basic(rgb):
+    """
+    Returns the index of the nearest of the first 8 colors, by splitting the
+    color space into cubes.
+    """
+    midlevel = 0x40
+    r, g, b = rgb
+    return (r >= midlevel) * 1 + (g >= midlevel) * 2 + (b >= midlevel) * 4
+
+
+def nearest_simple(rgb):
+    """
+    Returns the index of the nearest of the first 16 colors.
+    """
+    return min(range(16), key=lambda i: _distance(rgb, i))
+
+
+def nearest_full(rgb):
+    """
+    Returns the index of the nearest of the 256 colors, by comparing the nearest
+    color of the base colors, the color cube and the grayscale ramp.
+    """
+    r, g, b = rgb
+    cube = 16 + (
+        36 * _nearest_index(_CUBE_LEVELS, r)
+        + 6 * _nearest_index(_CUBE_LEVELS, g)
+        + _nearest_index(_CUBE_LEVELS, b)
+    )
+    grey = 232 + _nearest_index(_GREY_LEVELS, (r + b + g) / 3)
+
+    candidates = (nearest_simple(rgb), cube, grey)
+    return min(candidates, key=lambda i: _distance(rgb, i))
+
+
+def parse_hex(value):
+    """
+    Returns the RGB tuple for a `#RRGGBB` HEX value, or None if the value is
+    not a valid HEX value.
+    """
+    if len(value) != 7 or value[0] != '#':
+        return None
+    try:
+        return (int(value[1:3], 16), int(value[3:5], 16), int(value[5:7], 16))
+    except ValueError:
+        return None
+
+
+def parse_name(value):
+    """
+    Returns the RGB tuple for a color name, or None if the name is not one of
+    the supported color names.
+    """
+    index = _NAME_INDICES.get(value.lower().replace(' ', '').replace('_', ''))
+    if index is not None:
+        return PALETTE[index]
+    return None
+
+
+def resolve_color(value, depth, background=False):
+    """
+    Returns the tuple of ANSI codes for a color name or HEX value at the
+    provided color depth, or None if the color cannot be resolved.
+    """
+    offset = 40 if background else 30
+
+    if value == '':
+        return ()
+    elif value.lower().replace(' ', '').replace('_', '') == 'reset':
+        return (offset + 9, )
+
+    rgb = parse_name(value) or parse_hex(value)
+    if rgb is None:
+        return None
+
+    if depth == 256:
+        return (offset + 8, 5, nearest_full(rgb))
+    elif depth == 16:
+        return (offset + SIMPLE_CODES[nearest_simple(rgb)], )
+    elif depth == 8:
+        return (offset + SIMPLE_CODES[nearest_basic(rgb)], )
+    return (offset + 8, 2) + rgb
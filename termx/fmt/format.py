@@ -6,7 +6,7 @@ import typing
 from termx.library import ensure_iterable
 from termx.ext.compat import safe_text
 
-from termx.exceptions import FormatError
+from termx.exceptions import FormatError, ColorLibError
 
 from .colorlib import color as Color, highlight as Highlight, style as Style
 
@@ -59,7 +59,8 @@ class FormatDataClass:
         top of the currenet styles.  We also allow styles to be explicitly
         specified as True or False.
         """
-        data = copy.deepcopy(self.__dict__)
+        # Only copy the dataclass fields, not any cached state on the instance.
+        data = copy.deepcopy({fld.name: getattr(self, fld.name) for fld in fields(self)})
         for key, val in overrides.items():
 
             if Style.supported(key):
@@ -154,7 +155,7 @@ class FormatDataClass:
         For all attributes, this will override them completely, except for
         the styles attribute, which we handle differently.
         """
-        original = self.__dict__.copy()
+        original = {fld.name: getattr(self, fld.name) for fld in fields(self)}
         try:
             self.override(**overrides)
             yield self
@@ -266,6 +267,22 @@ class WrapperFormat:
 
 @dataclass
 class Format(FormatDataClass, IconFormat, WrapperFormat):
+    """
+    [x] NOTE:
+    --------
+    Calling a Format instance without overrides does not mutate or copy the
+    instance.  Instead, the ANSI sequences that prefix and suffix the text, along
+    with the placement of the icon and wrapper, are compiled once and cached on
+    the instance, so that formatting text only requires string concatenation.
+    The compiled plan is discarded whenever an attribute of the instance is
+    changed.
+
+    Calling a Format instance with overrides uses a cached copy of the instance
+    with the overrides applied, instead of temporarily overriding the instance.
+    """
+
+    # Maximum number of derived Format instances cached for overrides.
+    DERIVED_CACHE_SIZE = 32
 
     color: typing.Union[Color, str] = field(default=None)
     styles: typing.List[typing.Union[Style, str, int]] = field(default_factory=list)
@@ -294,12 +311,20 @@ class Format(FormatDataClass, IconFormat, WrapperFormat):
             self.styles = ensure_iterable(self.styles, coercion=tuple, force_coerce=True)
             self.styles = Style(*self.styles)
 
+    def __setattr__(self, name, value):
+        # Any change to the instance invalidates the compiled plan and the cached
+        # Format instances derived from overrides.
+        if name[0] != '_':
+            self.__dict__.pop('_plan', None)
+            self.__dict__.pop('_derived', None)
+        object.__setattr__(self, name, value)
+
     def __call__(self, text, **overrides):
         """
         Performs the formatting on the provided text.
 
-        Overrides can be specified to temporarily set the attributes on the
-        format object just for the call.
+        Overrides can be specified to format the text as if the attributes were
+        set on the format object, without mutating the format object.
 
         [x] TODO:
         --------
@@ -309,6 +334,88 @@ class Format(FormatDataClass, IconFormat, WrapperFormat):
         if text is None:
             raise FormatError('Cannot format null text.')
 
+        if overrides:
+            derived = self.derived(**overrides)
+            if derived is not None:
+                return derived(text)
+            return self._call_overriding(text, **overrides)
+
+        plan = self.__dict__.get('_plan')
+        if plan is None or plan[0] is not self.styles._styles:
+            plan = self.compile()
+
+        (_, prefix, suffix, icon_pre, wrapper_pre,
+            wrapper_post, icon_post) = plan
+
+        text = safe_text(text)
+        if icon_pre:
+            text = "%s%s%s" % (icon_pre[0], text, icon_pre[1])
+        if wrapper_pre:
+            text = wrapper_pre % text
+        text = "%s%s%s" % (prefix, text, suffix)
+        if wrapper_post:
+            text = wrapper_post % text
+        if icon_post:
+            text = "%s%s%s" % (icon_post[0], text, icon_post[1])
+        return text
+
+    def partition(self, text):
+        """
+        Splits the text, as it would be formatted, into the text that is placed
+        before the ANSI sequences, the text inside of them and the text placed
+        after them, without performing any of the ANSI formatting:
+
+        >>> before, inside, after = fmt.partition(text)
+        >>> prefix, suffix = fmt.ansi_bounds
+        >>> before + prefix + inside + suffix + after == fmt(text)
+
+        This allows the formatted text to be rendered without ANSI sequences
+        while still including the icon and wrapper.
+        """
+        plan = self.__dict__.get('_plan')
+        if plan is None or plan[0] is not self.styles._styles:
+            plan = self.compile()
+
+        (_, _, _, icon_pre, wrapper_pre,
+            wrapper_post, icon_post) = plan
+
+        text = safe_text(text)
+        if icon_pre:
+            text = "%s%s%s" % (icon_pre[0], text, icon_pre[1])
+        if wrapper_pre:
+            text = wrapper_pre % text
+
+        before = after = ""
+        if wrapper_post:
+            before, after = (wrapper_post % "\x00").split("\x00", 1)
+        if icon_post:
+            before = "%s%s" % (icon_post[0], before)
+            after = "%s%s" % (after, icon_post[1])
+        return before, text, after
+
+    def plain(self, text):
+        """
+        Formats the text with the icon and wrapper, but without any of the ANSI
+        sequences for the color, highlight and styles.
+        """
+        return "".join(self.partition(text))
+
+    @property
+    def ansi_bounds(self):
+        """
+        The ANSI sequences that are placed before and after the text when it is
+        formatted.
+        """
+        plan = self.__dict__.get('_plan')
+        if plan is None or plan[0] is not self.styles._styles:
+            plan = self.compile()
+        return plan[1], plan[2]
+
+    def _call_overriding(self, text, **overrides):
+        """
+        Formats the text by temporarily overriding the attributes on the format
+        object, for overrides that cannot be used to cache a derived Format.
+        """
         text = safe_text(text)
 
         with self.overriding(**overrides):
@@ -320,6 +427,69 @@ class Format(FormatDataClass, IconFormat, WrapperFormat):
 
         return text
 
+    def derived(self, **overrides):
+        """
+        Returns a cached copy of the Format instance with the overrides applied,
+        or None if the overrides cannot be hashed.
+        """
+        key = tuple(sorted(overrides.items(), key=lambda item: item[0]))
+        try:
+            hash(key)
+        except TypeError:
+            return None
+
+        derived = self.__dict__.setdefault('_derived', {})
+        try:
+            return derived[key]
+        except KeyError:
+            if len(derived) >= self.DERIVED_CACHE_SIZE:
+                derived.clear()
+            fmt = derived[key] = self.copy(**overrides)
+            return fmt
+
+    def compile(self):
+        """
+        Compiles the formatting of the instance into the ANSI sequences that
+        prefix and suffix the text, along with the icon and wrapper applied
+        inside or outside of those sequences, and caches the result.
+
+        The prefix and suffix are equivalent to applying the color, highlight
+        and styles in succession:
+
+        >>> styles(highlight(color(text)))
+        >>> S + H + C + text + RESET + RESET + RESET
+        """
+        prefix = suffix = ""
+        for formatter in (self.color, self.highlight, self.styles):
+            if formatter:
+                try:
+                    seq = formatter.ansi_sequence
+                except ColorLibError:
+                    continue
+                prefix = "%s%s" % (seq, prefix)
+                suffix = "%s%s" % (suffix, formatter.reset_code())
+
+        icon = None
+        if self.icon:
+            if self.icon_location == 'before':
+                icon = ("%s " % self.icon, "")
+            else:
+                icon = ("", " %s" % self.icon)
+
+        wrapper = self.wrapper or None
+
+        plan = (
+            self.styles._styles,
+            prefix,
+            suffix,
+            icon if self.format_with_icon else None,
+            wrapper if self.format_with_wrapper else None,
+            wrapper if not self.format_with_wrapper else None,
+            icon if not self.format_with_icon else None,
+        )
+        self.__dict__['_plan'] = plan
+        return plan
+
     def _format(self, text):
         if self.color:
             text = self.color(text)
@@ -330,7 +500,9 @@ class Format(FormatDataClass, IconFormat, WrapperFormat):
     def add_style(self, style_name):
         if not self.styles.has_style(style_name):
             self.styles.add_style(style_name)
+            self.__dict__.pop('_derived', None)
 
     def remove_style(self, style_name):
         if self.styles.has_style(style_name):
             self.styles.remove_style(style_name)
+            self.__dict__.pop('_derived', None)
@@ -1,5 +1,7 @@
 import importlib
 
-from .handler import TermxHandler  # noqa
+from .handler import TermxHandler, AsyncTermxHandler, BufferedTermxHandler  # noqa
+from .multiprocess import TermxLogSink, TermxLogListener  # noqa
+from .dedup import RecordDeduplicator  # noqa
 
 components = importlib.import_module('.api', package=__name__)
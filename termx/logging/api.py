@@ -1,5 +1,7 @@
+from termx.config import settings
+
 from .library.parts import Header, Label
-from .library.base import SegmentCore, LineCore, LinesCore, LogFormatCore
+from .library.base import SegmentCore, LineCore, LinesCore, LogFormatCore, RenderContext
 
 
 __all__ = (
@@ -172,9 +174,87 @@ class DynamicLines(Lines):
 
 
 class LogFormat(LogFormatCore):
+    """
+    [x] NOTE:
+    --------
+    The LogFormat tree is compiled into a flat RenderPlan the first time a
+    record is formatted, so the decorations of the elements are only resolved
+    once.  If the tree is modified after a record has been formatted, the
+    LogFormat must be recompiled with `compile()`.
+
+    The plan resolves color strings with the COLOR_DEPTH of the settings, so a
+    plan is compiled for each generation of the settings that the LogFormat is
+    used with - i.e. after the settings are configured, or within an override
+    of the settings.  The plans of the last `MAX_PLANS` generations are kept, so
+    that contexts with different overrides do not recompile the plan each time
+    that they format a record.
+    """
+    MAX_PLANS = 8
 
     def __call__(self, record):
+        with RenderContext.rendering(record):
+            return self._current_plan()(record)
+
+    def render(self, record):
+        """
+        Renders the record as lines of styled spans, from which the output can
+        be encoded for the terminal (ANSI), plain text and JSON sinks:
+
+        >>> log_format.render(record).encode('plain')
+
+        The tree is only evaluated once for the last record rendered, so when
+        the LogFormat is shared by several handlers with different sinks, each
+        handler only encodes the rendered record.
+        """
+        plan = self._current_plan()
+        rendered = self._rendered
+        if rendered is not None and rendered.record is record:
+            return rendered
+
+        with RenderContext.rendering(record):
+            rendered = self._rendered = plan.render(record)
+        return rendered
+
+    def _current_plan(self):
+        plan = self._plan
+        generation = settings.generation
+        if plan is None or plan.generation != generation:
+            plan = self._plans.get(generation)
+            if plan is None:
+                return self._compile()
+            self._plan = plan
+            self._rendered = None
+        return plan
+
+    def compile(self):
+        """
+        Compiles the LogFormat tree into a flat list of render steps, where only
+        the parts of the tree that depend on the record are evaluated for each
+        record.  The output is identical to formatting the record without the
+        compiled plan.
+        """
+        self._plans = {}
+        return self._compile()
+
+    def _compile(self):
+        from .plan import RenderPlan
+        plan = RenderPlan(self)
+        if len(self._plans) >= self.MAX_PLANS:
+            self._plans.pop(next(iter(self._plans)), None)
+        self._plans[plan.generation] = plan
+        self._plan = plan
+        self._rendered = None
+        return plan
+
+    def _call_uncompiled(self, record):
+        """
+        Formats the record by evaluating the entire LogFormat tree, without the
+        compiled plan.
+        """
+        with RenderContext.rendering(record):
+            return self._render_uncompiled(record)
 
+    def _render_uncompiled(self, record):
         # Have to decorate after we create dynamic elements.
         for i, child in enumerate(self.children):
             if isinstance(child, DynamicLines):
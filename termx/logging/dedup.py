@@ -0,0 +1,165 @@
+import collections
+import logging
+import threading
+import time
+
+from termx.fmt import Format
+
+from .api import Segment, Line, Lines, LogFormat
+
+
+__all__ = ('RecordDeduplicator', 'RepeatedRecord', )
+
+
+class RepeatedRecord(logging.LogRecord):
+    """
+    Record summarizing the repeats of a record that were suppressed by the
+    RecordDeduplicator.  The record has the attributes of the first record of
+    the window, along with:
+
+    (1) `repeated`: The number of repeats that were suppressed.
+    (2) `repeated_seconds`: The time between the first and last repeat.
+    (3) `repeated_summary`: i.e. "repeated 4,812× in 2.0s"
+    """
+
+    @classmethod
+    def from_record(cls, record, repeated, seconds):
+        summary = cls(None, None, "", 0, "", (), None)
+        summary.__dict__.update(record.__dict__)
+        summary.msg = record.getMessage()
+        summary.args = None
+        summary.repeated = repeated
+        summary.repeated_seconds = seconds
+        summary.repeated_summary = "repeated {:,}× in {:.1f}s".format(repeated, seconds)
+        return summary
+
+
+def default_summary_format():
+    return LogFormat(
+        Lines(
+            Line(
+                Segment(attrs='msg'),
+                Segment(attrs='repeated_summary', fmt=Format(styles=['faint'], wrapper='(%s)')),
+            ),
+        ),
+    )
+
+
+class RecordDeduplicator(object):
+    """
+    Collapses records that are repeated within a window of time into the first
+    record and a single summary record:
+
+    >>> handler = TermxHandler(format_string=LogFormat(...), dedup=RecordDeduplicator(window=2.0))
+
+    >>> Connection refused
+    >>> Connection refused (repeated 4,812× in 2.0s)
+
+    Records are considered repeats when the values of the `key` attributes are
+    the same, where "message" is the message merged with its arguments.  The
+    first record with a key starts a window of `window` seconds, during which
+    its repeats are suppressed.  When a record is handled after the window has
+    ended, the summary of the window is emitted, which is rendered with the
+    `summary_format`.
+
+    [x] NOTE:
+    --------
+    Windows are only tracked for the `max_keys` most recent keys, the summary of
+    the oldest window is emitted early when the limit is reached, so memory
+    stays bounded regardless of how many distinct records are logged.
+
+    [x] NOTE:
+    --------
+    The time of the records (`record.created`) is used for the windows, which
+    are closed when the next record is handled.  Flushing the handler closes the
+    windows that have ended by the current time, so the summary of a burst is
+    not held back until the next record is logged, and closing the handler
+    closes all of the windows.
+    """
+
+    def __init__(self, key=('name', 'levelno', 'message'), window=2.0, max_keys=1024,
+            summary_format=None):
+        self.key = tuple(key)
+        self.window = window
+        self.max_keys = max_keys
+        self.summary_format = summary_format or default_summary_format()
+
+        # Key -> [First Record, Time of Last Repeat, Number of Repeats], ordered
+        # by the start of the window.
+        self._windows = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def record_key(self, record):
+        key = []
+        for attr in self.key:
+            if attr == 'message':
+                value = record.getMessage()
+            else:
+                value = getattr(record, attr, None)
+            try:
+                hash(value)
+            except TypeError:
+                value = repr(value)
+            key.append(value)
+        return tuple(key)
+
+    def __call__(self, record):
+        """
+        Returns the records that should be emitted for the record being handled,
+        in order - the summaries of windows that have ended, followed by the
+        record itself if it is not a repeat.
+        """
+        key = self.record_key(record)
+        now = record.created
+
+        with self._lock:
+            records = self._expire(now)
+
+            window = self._windows.get(key)
+            if window is not None:
+                window[1] = now
+                window[2] += 1
+                return records
+
+            if len(self._windows) >= self.max_keys:
+                records.extend(self._summarize(self._windows.popitem(last=False)[1]))
+            self._windows[key] = [record, now, 0]
+
+        records.append(record)
+        return records
+
+    def flush(self):
+        """
+        Ends all of the windows, returning the summaries of the windows that
+        suppressed repeats.
+        """
+        with self._lock:
+            windows, self._windows = self._windows, collections.OrderedDict()
+        records = []
+        for window in windows.values():
+            records.extend(self._summarize(window))
+        return records
+
+    def expire(self, now=None):
+        """
+        Ends the windows that have ended by `now`, which defaults to the current
+        time, returning the summaries of the windows that suppressed repeats.
+        """
+        with self._lock:
+            return self._expire(time.time() if now is None else now)
+
+    def _expire(self, now):
+        records = []
+        while self._windows:
+            window = next(iter(self._windows.values()))
+            if now - window[0].created < self.window:
+                break
+            self._windows.popitem(last=False)
+            records.extend(self._summarize(window))
+        return records
+
+    def _summarize(self, window):
+        record, last, repeated = window
+        if repeated == 0:
+            return []
+        return [RepeatedRecord.from_record(record, repeated, last - record.created)]
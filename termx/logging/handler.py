@@ -1,25 +1,71 @@
+import atexit
+import collections
+import copy
 import logging
+import threading
+import weakref
 
 from termx.fmt import color
 from termx.exceptions import LoggingError
 
+from .dedup import RepeatedRecord
+from .spans import SINKS
 
-__all__ = ('TermxLogHandlerMixin', 'TermxLogFormatter', )
+
+__all__ = (
+    'TermxLogHandlerMixin',
+    'TermxQueueHandlerMixin',
+    'TermxBufferedHandlerMixin',
+    'TermxLogFormatter',
+    'TermxHandler',
+    'AsyncTermxHandler',
+    'BufferedTermxHandler',
+)
 
 
 class TermxLogFormatter(logging.Formatter):
+    """
+    Formats the records with the `format_string`, which is usually a LogFormat.
+
+    When a `sink` is provided, the record is rendered by the LogFormat and then
+    encoded for the sink, which is one of "ansi", "plain" or "json".  This allows
+    the same LogFormat to be used for a terminal and a file, without the ANSI
+    sequences being computed for the file:
+
+    >>> TermxHandler(format_string=log_format, sink='ansi')
+    >>> TermxHandler(logging.FileHandler, filename='app.log', format_string=log_format, sink='plain')
 
-    def __init__(self, format_string=None, **kwargs):
+    The summaries of repeated records (see RecordDeduplicator) are formatted with
+    the `summary_format` instead.
+    """
+
+    def __init__(self, format_string=None, sink=None, summary_format=None, **kwargs):
         super(TermxLogFormatter, self).__init__(**kwargs)
+        if sink is not None:
+            if sink not in SINKS:
+                raise LoggingError(
+                    "Invalid sink %s, must be one of %s." % (sink, ", ".join(SINKS)))
+            for fmt in (format_string, summary_format):
+                if fmt is not None and not hasattr(fmt, 'render'):
+                    raise LoggingError("A sink can only be used with a LogFormat.")
         self.format_string = format_string
+        self.summary_format = summary_format
+        self.sink = sink
 
     def format(self, record):
-        return self.format_string(record)
+        format_string = self.format_string
+        if self.summary_format is not None and isinstance(record, RepeatedRecord):
+            format_string = self.summary_format
+
+        if self.sink is not None:
+            return format_string.render(record).encode(self.sink)
+        return format_string(record)
 
 
 class TermxLogHandlerMixin(object):
 
     formatter_cls = TermxLogFormatter
+    dedup = None
 
     def default(self, record, attr, default=None):
         setattr(record, attr, getattr(record, attr, default))
@@ -37,21 +83,452 @@ class TermxLogHandlerMixin(object):
             else:
                 setattr(record, 'color', record.color)
 
-    def useTermxFormatter(self, format_string=None):
-        formatter = self.formatter_cls(format_string=format_string)
+    def useTermxFormatter(self, format_string=None, sink=None, dedup=None):
+        self.dedup = dedup
+        formatter = self.formatter_cls(
+            format_string=format_string,
+            sink=sink,
+            summary_format=dedup.summary_format if dedup else None,
+        )
         self.setFormatter(formatter)
 
+    def deduplicate(self, record):
+        """
+        Returns the records that should be emitted for the record, which are the
+        record itself unless the handler collapses repeated records.
+        """
+        if self.dedup is None:
+            return [record]
+        return self.dedup(record)
+
+    def expired_summaries(self):
+        """
+        Returns the summaries of the repeats whose windows have ended by the
+        current time, which are emitted when the handler is flushed.
+        """
+        if self.dedup is None:
+            return []
+        return self.dedup.expire()
+
+    def repeated_summaries(self):
+        """
+        Returns the summaries of the repeats that have not been emitted yet,
+        which are emitted when the handler is closed.
+        """
+        if self.dedup is None:
+            return []
+        return self.dedup.flush()
+
 
 def TermxHandler(handler_cls=logging.StreamHandler, format_string=None, **kwargs):
 
     class _TermxHandler(handler_cls, TermxLogHandlerMixin):
 
-        def __init__(self, filter=None, format_string=None, **kwargs):
+        def __init__(self, filter=None, format_string=None, sink=None, dedup=None, **kwargs):
             super(_TermxHandler, self).__init__(**kwargs)
-            self.useTermxFormatter(format_string=format_string)
+            self.useTermxFormatter(format_string=format_string, sink=sink, dedup=dedup)
+
+        _emitting = False
 
         def emit(self, record):
-            self.prepare_record(record)
-            super(_TermxHandler, self).emit(record)
+            self._emit_records(self.deduplicate(record))
+
+        def _emit_records(self, records):
+            # The StreamHandler flushes after writing each record, which must
+            # not close the windows of the records that are being emitted.
+            self._emitting = True
+            try:
+                for record in records:
+                    self.prepare_record(record)
+                    super(_TermxHandler, self).emit(record)
+            finally:
+                self._emitting = False
+
+        def flush(self):
+            self.acquire()
+            try:
+                if not self._emitting:
+                    self._emit_records(self.expired_summaries())
+            finally:
+                self.release()
+            super(_TermxHandler, self).flush()
+
+        def close(self):
+            self.acquire()
+            try:
+                self._emit_records(self.repeated_summaries())
+            finally:
+                self.release()
+            super(_TermxHandler, self).close()
 
     return _TermxHandler(format_string=format_string, **kwargs)
+
+
+class TermxQueueHandlerMixin(TermxLogHandlerMixin):
+    """
+    Handler mixin that enqueues records on a bounded queue when they are
+    emitted, and formats and writes them on a dedicated thread, so that the
+    threads that log never pay for rendering the records.
+
+    When the queue is full, the `overflow` policy determines what happens:
+
+    (1) "block": The logging thread waits until there is room in the queue.
+    (2) "drop-oldest": The oldest record in the queue is dropped.
+    (3) "drop-newest": The record being emitted is dropped.
+
+    The number of records dropped and the current depth of the queue are
+    available as `dropped` and `queue_depth`.
+
+    [x] NOTE:
+    --------
+    The message of the record is merged with its arguments before it is queued,
+    since the arguments might be mutated by the time the record is formatted.
+    The merge is applied to a copy of the record, since the record is shared
+    with the other handlers of the logger.
+
+    [x] NOTE:
+    --------
+    Flushing (and closing) the handler waits for all of the queued records to be
+    written, and `logging.shutdown()` flushes and closes all handlers at exit,
+    so no records are lost on a clean shutdown.
+
+    The handler thread never acquires the handler lock, since it is held by
+    `logging.shutdown()` while it waits for the queue to be flushed.  Instead,
+    the stream is flushed directly by the handler thread after each batch of
+    records is written.
+    """
+
+    OVERFLOW_POLICIES = ('block', 'drop-oldest', 'drop-newest')
+
+    def __init__(self, maxsize=1000, overflow='block', **kwargs):
+        super(TermxQueueHandlerMixin, self).__init__(**kwargs)
+        if overflow not in self.OVERFLOW_POLICIES:
+            raise LoggingError(
+                "Invalid overflow policy %s, must be one of %s." % (
+                    overflow, ", ".join(self.OVERFLOW_POLICIES))
+            )
+        self.maxsize = maxsize
+        self.overflow = overflow
+
+        self.dropped = 0
+        self.processed = 0
+
+        self._queue = collections.deque()
+        self._condition = threading.Condition()
+        self._pending = 0
+        self._closed = False
+
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    @property
+    def queue_depth(self):
+        return len(self._queue)
+
+    def handle(self, record):
+        """
+        Overridden so that the handler lock is not held while the record is
+        enqueued, since a blocked logging thread would otherwise prevent the
+        handler thread from acquiring it to flush the stream.
+        """
+        rv = self.filter(record)
+        if rv:
+            self.emit(record)
+        return rv
+
+    def emit(self, record):
+        try:
+            msg = record.getMessage()
+            record = copy.copy(record)
+            record.msg = msg
+            record.args = None
+            records = self.deduplicate(record)
+        except Exception:
+            self.handleError(record)
+            return
+
+        for record in records:
+            self._enqueue(record)
+
+    def _enqueue(self, record):
+        with self._condition:
+            # Once closed, there is no thread to write the record.
+            if self._closed:
+                self._write(record)
+                return
+
+            if self.maxsize and len(self._queue) >= self.maxsize:
+                if self.overflow == 'drop-newest':
+                    self.dropped += 1
+                    return
+                elif self.overflow == 'drop-oldest':
+                    self._queue.popleft()
+                    self.dropped += 1
+                else:
+                    while len(self._queue) >= self.maxsize and not self._closed:
+                        self._condition.wait()
+                    # The handler may have been closed while we were waiting,
+                    # in which case the thread may already have exited.
+                    if self._closed:
+                        self._write(record)
+                        return
+
+            self._queue.append(record)
+            self._condition.notify_all()
+
+    def flush(self):
+        # The StreamHandler flushes after writing each record, which is deferred
+        # to the end of the batch when writing on the handler thread.
+        if threading.current_thread() is self._thread:
+            return
+
+        for record in self.expired_summaries():
+            self._enqueue(record)
+        with self._condition:
+            while self._queue or self._pending:
+                self._condition.wait()
+        super(TermxQueueHandlerMixin, self).flush()
+
+    def close(self):
+        for record in self.repeated_summaries():
+            self._enqueue(record)
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        if self._thread is not threading.current_thread():
+            self._thread.join()
+        super(TermxQueueHandlerMixin, self).close()
+
+    def _write(self, record):
+        try:
+            self.prepare_record(record)
+            super(TermxQueueHandlerMixin, self).emit(record)
+        except Exception:
+            self.handleError(record)
+
+    def _flush_stream(self):
+        stream = getattr(self, 'stream', None)
+        if stream and hasattr(stream, 'flush'):
+            try:
+                stream.flush()
+            except Exception:
+                pass
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._queue and not self._closed:
+                    self._condition.wait()
+                if not self._queue:
+                    return
+
+                records = list(self._queue)
+                self._queue.clear()
+                self._pending = len(records)
+
+                # Wake up any threads blocked on a full queue.
+                self._condition.notify_all()
+
+            for record in records:
+                self._write(record)
+            self._flush_stream()
+
+            with self._condition:
+                self._pending = 0
+                self.processed += len(records)
+                self._condition.notify_all()
+
+
+def AsyncTermxHandler(handler_cls=logging.StreamHandler, format_string=None, maxsize=1000,
+        overflow='block', **kwargs):
+    """
+    Version of the TermxHandler that formats and writes the records on a
+    dedicated thread.  See TermxQueueHandlerMixin.
+
+    >>> handler = AsyncTermxHandler(format_string=LogFormat(...), overflow='drop-oldest')
+    """
+
+    class _AsyncTermxHandler(TermxQueueHandlerMixin, handler_cls):
+
+        def __init__(self, filter=None, format_string=None, sink=None, dedup=None, **kwargs):
+            super(_AsyncTermxHandler, self).__init__(**kwargs)
+            self.useTermxFormatter(format_string=format_string, sink=sink, dedup=dedup)
+
+    return _AsyncTermxHandler(format_string=format_string, maxsize=maxsize,
+        overflow=overflow, **kwargs)
+
+
+# Buffered handlers that still have to be flushed at interpreter exit.
+_buffered_handlers = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_buffered_handlers():
+    for handler in list(_buffered_handlers):
+        try:
+            handler.flush()
+        except Exception:
+            pass
+
+
+class TermxBufferedHandlerMixin(TermxLogHandlerMixin):
+    """
+    Handler mixin that collects the formatted records in a buffer and writes
+    them to the stream with a single write (and flush) once the buffer reaches
+    `max_bytes` bytes or `max_records` records, or `max_delay` seconds after
+    the first record was buffered - whichever comes first.
+
+    Records at or above `flush_level` are written immediately, along with any
+    records that are buffered before them, and the buffer is flushed when the
+    handler is flushed or closed and at interpreter exit.
+
+    [x] NOTE:
+    --------
+    The handler must write to a `stream`, i.e. a StreamHandler or FileHandler.
+
+    [x] NOTE:
+    --------
+    The size of the buffer is measured in the encoding of the stream, falling
+    back to the encoding of the handler and then UTF-8 (e.g. for a StringIO).
+
+    [x] NOTE:
+    --------
+    The delay is enforced by a thread that flushes the buffer, which is only
+    woken up when a record is buffered into an empty buffer.
+    """
+
+    def __init__(self, max_bytes=64 * 1024, max_records=1000, max_delay=0.25,
+            flush_level=logging.ERROR, **kwargs):
+        super(TermxBufferedHandlerMixin, self).__init__(**kwargs)
+        self.max_bytes = max_bytes
+        self.max_records = max_records
+        self.max_delay = max_delay
+        self.flush_level = flush_level
+
+        self._buffer = []
+        self._buffer_size = 0
+        self._last_record = None
+
+        self._closed = False
+        self._scheduled = threading.Event()
+        self._stopped = threading.Event()
+        if self.max_delay is not None:
+            thread = threading.Thread(target=self._run, daemon=True)
+            thread.start()
+
+        _buffered_handlers.add(self)
+
+    def emit(self, record):
+        for record in self.deduplicate(record):
+            self._buffer_record(record)
+
+    def _buffer_record(self, record):
+        try:
+            self.prepare_record(record)
+            data = self.format(record) + self.terminator
+        except Exception:
+            self.handleError(record)
+            return
+
+        if self._closed:
+            self._buffer.append(data)
+            self._last_record = record
+            self._write_buffer()
+            return
+
+        self._buffer.append(data)
+        self._buffer_size += len(data.encode(self._encoding(), errors='replace'))
+        self._last_record = record
+
+        if (record.levelno >= self.flush_level
+                or len(self._buffer) >= self.max_records
+                or self._buffer_size >= self.max_bytes):
+            self._write_buffer()
+        elif len(self._buffer) == 1:
+            self._scheduled.set()
+
+    def flush(self):
+        self.acquire()
+        try:
+            for record in self.expired_summaries():
+                self._buffer_record(record)
+            self._write_buffer()
+            super(TermxBufferedHandlerMixin, self).flush()
+        finally:
+            self.release()
+
+    def close(self):
+        self.acquire()
+        try:
+            for record in self.repeated_summaries():
+                self._buffer_record(record)
+            self._write_buffer()
+            self._closed = True
+        finally:
+            self.release()
+
+        # The thread is not joined, since it might be waiting for the handler
+        # lock, which `logging.shutdown()` holds while closing the handler.
+        self._stopped.set()
+        self._scheduled.set()
+        _buffered_handlers.discard(self)
+        super(TermxBufferedHandlerMixin, self).close()
+
+    def _encoding(self):
+        # FileHandler does not open the stream until the first write when it
+        # is delayed, but stores the encoding it will open the stream with.
+        return (getattr(self.stream, 'encoding', None)
+            or getattr(self, 'encoding', None) or 'utf-8')
+
+    def _write_buffer(self):
+        if not self._buffer:
+            return
+
+        data = "".join(self._buffer)
+        record = self._last_record
+        self._buffer = []
+        self._buffer_size = 0
+        self._last_record = None
+
+        try:
+            # FileHandler does not open the stream until the first record when
+            # it is delayed.
+            if self.stream is None and hasattr(self, '_open'):
+                self.stream = self._open()
+            self.stream.write(data)
+            self.stream.flush()
+        except Exception:
+            self.handleError(record)
+
+    def _run(self):
+        while True:
+            self._scheduled.wait()
+            if self._stopped.wait(self.max_delay):
+                return
+            self._scheduled.clear()
+            self.flush()
+
+
+def BufferedTermxHandler(handler_cls=logging.StreamHandler, format_string=None,
+        max_bytes=64 * 1024, max_records=1000, max_delay=0.25, flush_level=logging.ERROR,
+        **kwargs):
+    """
+    Version of the TermxHandler that writes the records to the stream in
+    batches.  See TermxBufferedHandlerMixin.
+
+    >>> handler = BufferedTermxHandler(
+    >>>     handler_cls=logging.FileHandler,
+    >>>     filename='app.log',
+    >>>     format_string=LogFormat(...),
+    >>>     max_records=500,
+    >>> )
+    """
+
+    class _BufferedTermxHandler(TermxBufferedHandlerMixin, handler_cls):
+
+        def __init__(self, filter=None, format_string=None, sink=None, dedup=None, **kwargs):
+            super(_BufferedTermxHandler, self).__init__(**kwargs)
+            self.useTermxFormatter(format_string=format_string, sink=sink, dedup=dedup)
+
+    return _BufferedTermxHandler(format_string=format_string, max_bytes=max_bytes,
+        max_records=max_records, max_delay=max_delay, flush_level=flush_level, **kwargs)
@@ -1,10 +1,11 @@
 # -*- coding: utf-8 -*-
 import contextlib
+import threading
 
 from termx.ext.utils import humanize_list, string_format_tuple
 
 from .decoration import Decoration
-from .utils import get_format, get_value
+from .utils import attribute_accessor, get_format, get_value
 
 
 __all__ = (
@@ -12,47 +13,128 @@ __all__ = (
     'LineCore',
     'LinesCore',
     'LogFormatCore',
+    'RenderContext',
 )
 
 
+class RenderContext(object):
+    """
+    Records the value and format of each element the first time they are
+    resolved while rendering a record, so that they are reused for the rest
+    of the render instead of being resolved again.
+
+    Without the context, the value of an element is resolved every time the
+    validity of the element or its parents is checked, and again when the
+    element is formatted - which means that user callables and attribute lookups
+    would run several times for the same record.
+
+    >>> with RenderContext.rendering(record):
+    >>>     log_format(record)
+
+    [x] NOTE:
+    --------
+    The context is stored per thread, and only applies to the record it was
+    created for, so formatting a different record while the context is active
+    (i.e. from a callable) is unaffected.
+    """
+
+    _local = threading.local()
+
+    def __init__(self, record):
+        self.record = record
+        self.values = {}
+        self.formats = {}
+
+    @classmethod
+    def current(cls, record):
+        context = getattr(cls._local, 'context', None)
+        if context is not None and context.record is record:
+            return context
+        return None
+
+    @classmethod
+    @contextlib.contextmanager
+    def rendering(cls, record):
+        context = cls.current(record)
+        if context is not None:
+            yield context
+            return
+
+        previous = getattr(cls._local, 'context', None)
+        cls._local.context = context = cls(record)
+        try:
+            yield context
+        finally:
+            cls._local.context = previous
+
+
 class Core(object):
 
     def __init__(self, attrs=None, value=None, fmt=None, color=None):
 
         self._attrs = attrs
         self._color = color
+
+        # The attributes are compiled once, instead of being parsed for every
+        # record.
+        self._accessor = attribute_accessor(attrs) if attrs else None
         self._value = value
         self._format = fmt
 
     def formatted(self, record):
         value = self.value(record)
         if value:
-            format = self.format(record)
-            if format:
-                try:
-                    return format("%s" % value)
-                except TypeError:
-                    if isinstance(self._value, tuple):
-                        value = string_format_tuple(value)
-                        return format(value)
-                    else:
-                        raise
-            else:
-                return value
+            return self.format_value(value, self.format(record))
         return ""
 
+    def format_value(self, value, format):
+        """
+        Formats the value of the element, already evaluated for a record, with
+        the format already evaluated for the same record.
+        """
+        if format:
+            try:
+                return format("%s" % value)
+            except TypeError:
+                if isinstance(self._value, tuple):
+                    value = string_format_tuple(value)
+                    return format(value)
+                else:
+                    raise
+        return value
+
     def valid(self, record):
         return self.value(record) is not None
 
     def format(self, record):
+        context = RenderContext.current(record)
+        if context is None:
+            return self._get_format(record)
+        try:
+            return context.formats[self]
+        except KeyError:
+            format = context.formats[self] = self._get_format(record)
+            return format
+
+    def _get_format(self, record):
         if self._format:
             return get_format(record, self._format)
         elif self._color:
             return get_format(record, self._color)
 
     def value(self, record):
+        context = RenderContext.current(record)
+        if context is None:
+            return self._get_value(record)
+        try:
+            return context.values[self]
+        except KeyError:
+            value = context.values[self] = self._get_value(record)
+            return value
+
+    def _get_value(self, record):
         if self._attrs or self._value:
-            return get_value(record, attrs=self._attrs, value=self._value)
+            return get_value(record, attrs=self._accessor, value=self._value)
         return ""
 
 
@@ -227,3 +309,6 @@ class LogFormatCore(LinesCore):
         """
         LinesCore.__init__(self, *children, **kwargs)
         self._width = width
+        self._plan = None
+        self._plans = {}
+        self._rendered = None
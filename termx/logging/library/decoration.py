@@ -2,10 +2,9 @@
 from dataclasses import dataclass
 from dacite import from_dict
 from typing import Optional
-from textwrap import TextWrapper
-import os
 
 from termx.ext.utils import measure_ansi_string
+from termx.terminal import Terminal
 from .utils import get_format
 
 
@@ -113,6 +112,12 @@ class Decoration:
         return wrapper.wrap(text=text)
 
     def wrapper(self, record):
+        """
+        Returns the AnsiWrapper for the decoration, which is shared by all
+        decorations with the same width, indentation and prefix.
+        """
+        from termx.logging.spans import ansi_wrapper
+
         subsequent_indent = initial_indent = self.indentation()
         if self.prefix:
             subsequent_indent = self.indentation(
@@ -121,11 +126,7 @@ class Decoration:
             indentation = self.indentation()
             initial_indent = self.prefix.apply(indentation, record=record)
 
-        return TextWrapper(
-            width=self.wrap_width,
-            initial_indent=initial_indent,
-            subsequent_indent=subsequent_indent,
-        )
+        return ansi_wrapper(self.wrap_width, initial_indent, subsequent_indent)
 
     def indentation(self, count=None, additional=0):
         count = count or self.indent or 0
@@ -136,9 +137,7 @@ class Decoration:
     def wrap_width(self):
         if self.width:
             return self.width
-        _, columns = os.popen('stty size', 'r').read().split()
-        columns = int(columns)
-        return columns - 5
+        return Terminal.columns() - 5
 
     @classmethod
     def from_dict(cls, data):
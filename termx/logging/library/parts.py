@@ -1,5 +1,5 @@
 # -*- coding: utf-8 -*-
-from termx.ext.utils import escape_ansi_string
+from termx.ext.utils import measure_ansi_string
 from termx.exceptions import InvalidElement
 from .base import Core
 
@@ -87,9 +87,7 @@ class Header(PartCore):
 
         # Determine length based on first element of parent.
         string = owner.valid_children(record)[0](record)
-        escaped = escape_ansi_string(string)
-
-        line_length = len(escaped)
+        line_length = measure_ansi_string(string)
         label = self.label(record)
         if label:
             line_length = int(0.5 * (line_length - 2 - len(label)))
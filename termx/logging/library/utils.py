@@ -1,7 +1,9 @@
+from termx.config import settings
 from termx.library import ensure_iterable
 from termx.fmt import color as Color, Format
 from termx.exceptions import InvalidCallable, InvalidColor
 
+import functools
 import warnings
 
 
@@ -69,6 +71,88 @@ def get_obj_attribute(obj, param):
         return None
 
 
+_MISSING = object()
+
+
+def compile_obj_attribute(param):
+    """
+    Compiles the parameter into a getter that is equivalent to calling
+    `get_obj_attribute(obj, param)`, but only splits the parameter once.
+
+    Every level but the last is looked up as a dictionary key, if the object is
+    a dictionary containing the key, and otherwise as an attribute.  The last
+    level is always looked up as an attribute.
+    """
+    parts = param.split(".")
+    path, last = tuple(parts[:-1]), parts[-1]
+
+    if not path:
+        def getter(obj):
+            return getattr(obj, last, None)
+        return getter
+
+    def getter(obj):
+        for part in path:
+            if isinstance(obj, dict) and part in obj:
+                obj = obj[part]
+            else:
+                obj = getattr(obj, part, _MISSING)
+                if obj is _MISSING:
+                    return None
+        return getattr(obj, last, None)
+    return getter
+
+
+class AttributeAccessor(object):
+    """
+    Compiled version of an "attribute" set, which finds the value for each
+    attr in the set, returning the first non-null value on the record, the
+    same way as `get_record_attribute`.
+
+    The set is parsed once, when the accessor is created, so that the lookup
+    for each record only has to walk the compiled chain of getters.
+
+    >>> accessor = AttributeAccessor(['object.exception.message', 'msg'])
+    >>> accessor(record)
+    """
+    __slots__ = ('params', 'getters')
+
+    def __init__(self, params):
+        # TODO: Need to catch more singletons here.
+        params = ensure_iterable(params)
+        self.params = tuple("%s" % param for param in params)
+        self.getters = tuple(compile_obj_attribute(param) for param in self.params)
+
+    def __call__(self, record):
+        # Here, each param can be something like "context.index", or "index"
+        # Higher priority is given to less deeply nested versions.
+        for getter in self.getters:
+            value = getter(record)
+            if value is not None:
+                return value
+        return None
+
+    def __repr__(self):
+        return "<AttributeAccessor %s>" % ", ".join(self.params)
+
+
+def attribute_accessor(params):
+    """
+    Returns the AttributeAccessor for an "attribute" set.
+
+    [x] NOTE:
+    --------
+    Accessors are not cached, since `get_record_attribute` is also called with
+    values that are only known for each record (i.e. the message returned by a
+    callable), which would fill a cache with keys that are never looked up
+    again.  Instead, the elements compile the accessors for the attributes that
+    they declare once, when they are created.
+    """
+    if isinstance(params, AttributeAccessor):
+        return params
+    return AttributeAccessor(params)
+
+
 def get_record_attribute(record, params):
     """
     Given an "attribute" set as `params` and a record, finds the value for
@@ -76,23 +160,15 @@ def get_record_attribute(record, params):
 
     The parameter `params` can be an iterable or a single string, and can
     reference nested or top level dictionary/object attributes separated
-    by '.'.
+    by '.'.  It can also be an already compiled AttributeAccessor.
 
     >>> record = {'child': {'grandchild': {'age': 10}}, 'name': 'Jack'}
     >>> get_record_attribute(record, ['child.grandchild.name', 'child.name'])
     >>> 'Jack'
     """
-    # TODO: Need to catch more singletons here.
-    params = ensure_iterable(params)
-    params = ["%s" % param for param in params]
-
-    # Here, each param can be something like "context.index", or "index"
-    # Higher priority is given to less deeply nested versions.
-    for param in params:
-        value = get_obj_attribute(record, param)
-        if value is not None:
-            return value
-    return None
+    if isinstance(params, str):
+        return compile_obj_attribute(params)(record)
+    return attribute_accessor(params)(record)
 
 
 def get_callable_value(record, callwith):
@@ -164,6 +240,38 @@ def get_value(record, value=None, attrs=None):
         return None
 
 
+# Maximum number of (spec, color depth) string format specifications that are
+# classified and cached.
+FORMAT_SPEC_CACHE_SIZE = 1024
+
+
+@functools.lru_cache(maxsize=FORMAT_SPEC_CACHE_SIZE)
+def _string_format_spec(value, depth):
+    try:
+        color = Color(value, depth=depth)
+    except InvalidColor:
+        return None, attribute_accessor(value)
+    return Format(color=color), None
+
+
+def string_format_spec(value):
+    """
+    Classifies a string format specification as either a color string or
+    attributes on the record, returning a tuple `(format, accessor)` where only
+    one of the two is set.
+
+    The classification does not depend on the record, so it is only done once
+    for each specification (and color depth) instead of parsing the string as a
+    color (and failing) for every record.
+
+    [x] NOTE:
+    --------
+    The Format returned for a color string is shared by every element that
+    uses the same specification, so it must not be mutated.
+    """
+    return _string_format_spec(value, settings.COLOR_DEPTH)
+
+
 def get_format(record, value):
     """
     Given a record object and a value, returns an appropriate Format object.
@@ -212,21 +320,40 @@ def get_format(record, value):
             return get_format(record, value)
 
     elif isinstance(value, str):
-
-        # Test if it is a Plumbum Colors compatible string
-        try:
-            value = Color(value)
-        except InvalidColor:
-            # Must be a string representing attributes on the record, the value
-            # might either be a string color, color or Format object.  Maybe even
-            # a callable, but that is why we recursively call get_format() again.
-            val = get_record_attribute(record, value)
-            if val is not None:
-                return get_format(record, val)
-            return None
-        else:
-            return Format(color=value)
+        fmt, accessor = string_format_spec(value)
+        if fmt is not None:
+            return fmt
+
+        # Must be a string representing attributes on the record, the value
+        # might either be a string color, color or Format object.  Maybe even
+        # a callable, but that is why we recursively call get_format() again.
+        val = accessor(record)
+        if val is not None:
+            return get_format(record, val)
+        return None
 
     else:
         # TODO: Raise More Appropriate Exception Here
         raise InvalidColor(value)
+
+
+def get_static_format(value):
+    """
+    Returns the Format object for a format specification that does not depend
+    on the record, as a tuple `(static, format)`.  If the format depends on the
+    record, `static` will be False and the format has to be determined for each
+    record with `get_format()`.
+
+    The returned format is equivalent to the one that `get_format()` would
+    return for any record.
+    """
+    if not value:
+        return True, None
+    elif isinstance(value, Format):
+        return True, value
+    elif isinstance(value, Color):
+        return True, Format(color=value)
+    elif isinstance(value, str):
+        fmt, _ = string_format_spec(value)
+        return fmt is not None, fmt
+    return False, None
@@ -0,0 +1,236 @@
+import logging
+import multiprocessing.connection
+import os
+import pickle
+import threading
+
+from termx.fmt import Format
+
+
+__all__ = ('TermxLogSink', 'TermxLogListener', 'record_payload', )
+
+
+def record_payload(record):
+    """
+    Returns the attributes of the record that are sent from a worker process to
+    the TermxLogListener, from which an equivalent record is recreated in the
+    parent process.
+
+    The message is merged with its arguments, and the exception information is
+    formatted, since neither the arguments nor the traceback are guaranteed to
+    be picklable.  Format objects are not sent, since the formatting is done by
+    the parent process.
+    """
+    payload = dict(record.__dict__)
+    payload['msg'] = record.getMessage()
+    payload['args'] = None
+    payload.pop('message', None)
+
+    if record.exc_info:
+        if not record.exc_text:
+            payload['exc_text'] = logging.Formatter().formatException(record.exc_info)
+        payload['exc_info'] = None
+
+    for key, value in payload.items():
+        if isinstance(value, Format):
+            payload[key] = None
+    return payload
+
+
+def _picklable(payload):
+    """
+    Replaces the values of the payload that cannot be pickled with their string
+    representation.
+    """
+    for key, value in payload.items():
+        try:
+            pickle.dumps(value)
+        except Exception:
+            payload[key] = repr(value)
+    return payload
+
+
+class TermxLogSink(logging.Handler):
+    """
+    Handler that is installed in the worker processes, which sends the records
+    to the TermxLogListener in the parent process instead of formatting and
+    writing them in the worker:
+
+    >>> listener = TermxLogListener(TermxHandler(format_string=LogFormat(...)))
+    >>> listener.start()
+
+    >>> def initializer(address):
+    >>>     logging.getLogger().addHandler(TermxLogSink(address))
+
+    >>> ProcessPoolExecutor(initializer=initializer, initargs=(listener.address, ))
+
+    Each process opens its own connection to the listener the first time a
+    record is emitted, so records sent by the same process are rendered in the
+    order they were logged.
+    """
+
+    def __init__(self, address, authkey=None, level=logging.NOTSET):
+        super(TermxLogSink, self).__init__(level=level)
+        self.address = address
+        self.authkey = authkey
+
+        self._connection = None
+        self._pid = None
+
+    @property
+    def connection(self):
+        # Connections cannot be shared with forked processes.
+        if self._connection is None or self._pid != os.getpid():
+            self._connection = multiprocessing.connection.Client(
+                self.address, authkey=self.authkey)
+            self._pid = os.getpid()
+        return self._connection
+
+    def emit(self, record):
+        try:
+            payload = record_payload(record)
+            try:
+                data = pickle.dumps(payload)
+            except Exception:
+                data = pickle.dumps(_picklable(payload))
+            self.connection.send_bytes(data)
+        except Exception:
+            self.handleError(record)
+
+    def close(self):
+        self.acquire()
+        try:
+            if self._connection is not None and self._pid == os.getpid():
+                self._connection.close()
+            self._connection = None
+        finally:
+            self.release()
+        super(TermxLogSink, self).close()
+
+
+class TermxLogListener(object):
+    """
+    Receives the records sent by the TermxLogSink handlers of the worker
+    processes, and passes them to the handlers of the parent process, so that
+    a single process renders the LogFormat and writes to the terminal without
+    the output of the workers interleaving.
+
+    The interface mirrors `logging.handlers.QueueListener`:
+
+    >>> listener = TermxLogListener(handler)
+    >>> listener.start()
+    >>> ...
+    >>> listener.stop()
+
+    [x] NOTE:
+    --------
+    The records are unpickled by the listener, so an `authkey` should be used if
+    the address can be reached by untrusted processes.
+    """
+
+    # Seconds to wait for data before checking for new connections.
+    poll_interval = 0.05
+
+    def __init__(self, *handlers, address=None, authkey=None, respect_handler_level=False):
+        self.handlers = handlers
+        self.respect_handler_level = respect_handler_level
+
+        self._authkey = authkey
+        self._listener = multiprocessing.connection.Listener(address, authkey=authkey)
+        self._connections = []
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._threads = []
+
+    @property
+    def address(self):
+        return self._listener.address
+
+    def start(self):
+        self._stopped.clear()
+        self._threads = [
+            threading.Thread(target=self._accept, daemon=True),
+            threading.Thread(target=self._receive, daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self):
+        """
+        Stops the listener after handling all of the records that have already
+        been sent by the workers.
+        """
+        self._stopped.set()
+        if self._threads:
+            # Closing the listener does not interrupt a pending `accept`, so a
+            # connection is made to wake up the thread accepting connections.
+            try:
+                multiprocessing.connection.Client(self.address, authkey=self._authkey).close()
+            except OSError:
+                pass
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+        self._listener.close()
+
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for connection in connections:
+            self._drain(connection)
+            connection.close()
+
+    def handle(self, record):
+        for handler in self.handlers:
+            if not self.respect_handler_level or record.levelno >= handler.level:
+                handler.handle(record)
+
+    def _accept(self):
+        while not self._stopped.is_set():
+            try:
+                connection = self._listener.accept()
+            except (OSError, EOFError, multiprocessing.AuthenticationError):
+                # A client can fail authentication.
+                continue
+            if self._stopped.is_set():
+                connection.close()
+                return
+            with self._lock:
+                self._connections.append(connection)
+
+    def _receive(self):
+        while not self._stopped.is_set():
+            with self._lock:
+                connections = list(self._connections)
+            if not connections:
+                self._stopped.wait(self.poll_interval)
+                continue
+
+            for connection in multiprocessing.connection.wait(
+                    connections, timeout=self.poll_interval):
+                self._receive_from(connection)
+
+    def _receive_from(self, connection):
+        """
+        Handles a single record sent over the connection, returning False if the
+        worker closed the connection.
+        """
+        try:
+            data = connection.recv_bytes()
+        except (EOFError, OSError):
+            with self._lock:
+                if connection in self._connections:
+                    self._connections.remove(connection)
+            connection.close()
+            return False
+
+        record = logging.makeLogRecord(pickle.loads(data))
+        self.handle(record)
+        return True
+
+    def _drain(self, connection):
+        try:
+            while connection.poll():
+                if not self._receive_from(connection):
+                    return
+        except (EOFError, OSError):
+            return
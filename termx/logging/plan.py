@@ -0,0 +1,456 @@
+from termx.config import settings
+
+from .api import Segment, Line, Lines, DynamicLines, LogFormat
+from .library.parts import Label
+from .library.utils import get_static_format
+from .spans import Span, SpanWrapper, RenderedRecord, ansi_wrapper, join_spans, text_of
+
+
+__all__ = ('RenderPlan', )
+
+
+def filter_missing(results):
+    return [result for result in results if result != ""]
+
+
+def filter_missing_spans(results):
+    return [result for result in results if result]
+
+
+def label_spans(label, record):
+    """
+    Returns the text of the label, without the delimiter, along with the spans
+    of the label as it is rendered by `Label.__call__`.
+    """
+    if type(label).__call__ is not Label.__call__:
+        spans = Span.from_ansi(label(record))
+        return text_of(spans), spans
+
+    value = label.value(record)
+    if not value:
+        return "", []
+
+    spans = Span.value(value, label.format(record), isinstance(label._value, tuple))
+    text = text_of(spans)
+    if label._delimiter:
+        spans.append(Span(label._delimiter))
+    return text, spans
+
+
+def json_value(value, spans):
+    if isinstance(value, (str, int, float, bool)):
+        return value
+    return text_of(spans)
+
+
+class CompiledDecorative(object):
+    """
+    A Prefix or Suffix whose formatted character is resolved once, when the
+    format does not depend on the record.
+    """
+
+    def __init__(self, decorative):
+        self.decorative = decorative
+        self.static, fmt = get_static_format(decorative.fmt or decorative.color)
+        self.char = decorative.char
+        self.char_spans = Span.formatted(decorative.char, fmt)
+        if self.static and fmt:
+            self.char = fmt(decorative.char)
+
+    def formatted(self, record):
+        if self.static:
+            return self.char
+
+        char = self.decorative.char
+        fmt = self.decorative.format(record)
+        if fmt:
+            char = fmt(char)
+        return char
+
+    def spans(self, record):
+        if self.static:
+            return self.char_spans
+        return Span.formatted(self.decorative.char, self.decorative.format(record))
+
+
+class CompiledDecoration(object):
+    """
+    Decoration of an element with the prefix, suffix and the AnsiWrapper used to
+    wrap the element resolved once, when they do not depend on the record.
+
+    [x] NOTE:
+    --------
+    When the width is not set on the decoration, the width depends on the size
+    of the terminal, so the AnsiWrapper is cached for each width.
+    """
+
+    def __init__(self, decoration):
+        self.decoration = decoration
+        self.prefix = CompiledDecorative(decoration.prefix) if decoration.prefix else None
+        self.suffix = CompiledDecorative(decoration.suffix) if decoration.suffix else None
+
+        self.static = self.prefix is None or self.prefix.static
+        self._wrappers = {}
+        self._span_wrappers = {}
+
+        delimiter = decoration.delimiter
+        self.delimiter = delimiter.char if delimiter.tight else "%s " % delimiter.char
+
+    def apply_to_parts(self, parts, record):
+        # Elements never apply the prefix to the parts, it is applied when the
+        # text is wrapped.
+        text = self.decoration.delimiter.apply(parts)
+        if self.suffix:
+            text = "%s%s" % (text, self.suffix.formatted(record))
+        return text
+
+    def wrapper(self, record):
+        if not self.static:
+            return self.decoration.wrapper(record)
+
+        width = self.decoration.wrap_width
+        try:
+            return self._wrappers[width]
+        except KeyError:
+            pass
+
+        subsequent_indent = initial_indent = self.decoration.indentation()
+        if self.prefix:
+            subsequent_indent = self.decoration.indentation(
+                additional=self.prefix.decorative.length + 1
+            )
+            spacing = "" if self.prefix.decorative.tight else " "
+            initial_indent = "%s%s%s" % (self.prefix.char, spacing, initial_indent)
+
+        wrapper = self._wrappers[width] = ansi_wrapper(width, initial_indent, subsequent_indent)
+        return wrapper
+
+    def wrap(self, text, record):
+        return self.wrapper(record).wrap(text=text)
+
+    def apply_to_spans(self, parts, record):
+        spans = join_spans(parts, self.delimiter)
+        if self.suffix:
+            spans = spans + self.suffix.spans(record)
+        return spans
+
+    def span_wrapper(self, record):
+        width = self.decoration.wrap_width
+        if self.static:
+            try:
+                return self._span_wrappers[width]
+            except KeyError:
+                pass
+
+        indentation = self.decoration.indentation()
+        subsequent_indent = indentation
+        initial_indent = [Span(indentation)] if indentation else []
+        if self.prefix:
+            subsequent_indent = self.decoration.indentation(
+                additional=self.prefix.decorative.length + 1
+            )
+            spacing = "" if self.prefix.decorative.tight else " "
+            initial_indent = self.prefix.spans(record) + [Span(spacing + indentation)]
+
+        wrapper = SpanWrapper(width, initial_indent, subsequent_indent)
+        if self.static:
+            self._span_wrappers[width] = wrapper
+        return wrapper
+
+    def wrap_spans(self, spans, record):
+        return self.span_wrapper(record).wrap(spans)
+
+
+class SegmentStep(object):
+    """
+    Evaluates the value of a Segment once for the record, and pushes whether
+    or not the Segment is valid along with its wrapped lines.
+
+    Labels with a constant value and a format that does not depend on the record
+    are folded into a constant string.
+    """
+
+    def __init__(self, segment):
+        self.segment = segment
+        self.decoration = CompiledDecoration(segment.decoration)
+        self.static_format, self.format = get_static_format(segment._format or segment._color)
+
+        self.label = None
+        self.label_spans = None
+        label = segment._label
+        if not label:
+            self.label = ""
+            self.label_spans = ("", [])
+        elif (isinstance(label, Label) and not label._attrs
+                and not callable(label._value)
+                and get_static_format(label._format or label._color)[0]):
+            self.label = label(None)
+            self.label_spans = label_spans(label, None)
+
+    def __call__(self, record, stack):
+        value = self.segment.value(record)
+        if value is None:
+            stack.append((False, []))
+            return
+
+        label = self.label
+        if label is None:
+            label = self.segment.label(record)
+
+        formatted = ""
+        if value:
+            format = self.format if self.static_format else self.segment.format(record)
+            formatted = self.segment.format_value(value, format)
+
+        line = self.decoration.apply_to_parts(filter_missing([label, formatted]), record)
+        stack.append((True, self.decoration.wrap(line, record)))
+
+    def render(self, record, stack, segments):
+        value = self.segment.value(record)
+        if value is None:
+            stack.append((False, []))
+            return
+
+        label = self.label_spans
+        if label is None:
+            label = label_spans(self.segment._label, record)
+
+        spans = []
+        if value:
+            format = self.format if self.static_format else self.segment.format(record)
+            spans = Span.value(value, format, isinstance(self.segment._value, tuple))
+
+        segments.append({'label': label[0] or None, 'value': json_value(value, spans)})
+        line = self.decoration.apply_to_spans(filter_missing_spans([label[1], spans]), record)
+        stack.append((True, self.decoration.wrap_spans(line, record)))
+
+
+class ParentStep(object):
+    """
+    Pops the results of the `count` children of the element off of the stack,
+    pushing whether or not the element is valid along with the lines of its
+    valid children.
+    """
+
+    def __init__(self, element, count):
+        self.element = element
+        self.count = count
+        self.decoration = CompiledDecoration(element.decoration)
+
+    def pop_children(self, stack):
+        if self.count == 0:
+            return False, []
+
+        results = stack[-self.count:]
+        del stack[-self.count:]
+
+        valid, lines = False, []
+        for child_valid, child_lines in results:
+            if child_valid:
+                valid = True
+                lines.extend(child_lines)
+        return valid, lines
+
+
+class LineStep(ParentStep):
+
+    def __call__(self, record, stack):
+        valid, segments = self.pop_children(stack)
+        if not valid:
+            stack.append((False, []))
+            return
+
+        line = self.decoration.apply_to_parts(filter_missing(segments), record)
+        stack.append((True, self.decoration.wrap(line, record)))
+
+    def render(self, record, stack, segments):
+        valid, children = self.pop_children(stack)
+        if not valid:
+            stack.append((False, []))
+            return
+
+        line = self.decoration.apply_to_spans(filter_missing_spans(children), record)
+        stack.append((True, self.decoration.wrap_spans(line, record)))
+
+
+class LinesStep(ParentStep):
+
+    def __call__(self, record, stack):
+        valid, children = self.pop_children(stack)
+        if not valid:
+            stack.append((False, []))
+            return
+
+        lines = [' ' for i in range(self.element._lines_above)]
+        lines += [self.element.header(record)]
+        lines += children
+        lines += [' ' for i in range(self.element._lines_below)]
+
+        newlines = []
+        for item in filter_missing(lines):
+            newlines.extend(self.decoration.wrap(item, record))
+        stack.append((True, newlines))
+
+    def render(self, record, stack, segments):
+        valid, children = self.pop_children(stack)
+        if not valid:
+            stack.append((False, []))
+            return
+
+        lines = [[Span(' ')] for i in range(self.element._lines_above)]
+        lines += [Span.from_ansi(self.element.header(record))]
+        lines += children
+        lines += [[Span(' ')] for i in range(self.element._lines_below)]
+
+        newlines = []
+        for item in filter_missing_spans(lines):
+            newlines.extend(self.decoration.wrap_spans(item, record))
+        stack.append((True, newlines))
+
+
+class ElementStep(object):
+    """
+    Evaluates an element that cannot be compiled, because its children are only
+    known once the record is available (i.e. DynamicLines) or because it is not
+    one of the known elements.
+    """
+
+    def __init__(self, element, width):
+        self.element = element
+        self.width = width
+
+    def __call__(self, record, stack):
+        if isinstance(self.element, DynamicLines):
+            self.element._dynamic_children(record)
+            self.element.decorate_children({'width': self.width})
+
+        if self.element.valid(record):
+            stack.append((True, self.element(record)))
+        else:
+            stack.append((False, []))
+
+    def render(self, record, stack, segments):
+        if isinstance(self.element, DynamicLines):
+            # The children are only known once the record is available, so they
+            # are compiled for each record.
+            self.element._dynamic_children(record)
+            self.element.decorate_children({'width': self.width})
+
+            steps = []
+            compile_parent(self.element, LinesStep, steps, self.width)
+            for step in steps:
+                step.render(record, stack, segments)
+
+        elif self.element.valid(record):
+            stack.append((True, [Span.from_ansi(line) for line in self.element(record)]))
+        else:
+            stack.append((False, []))
+
+
+def compile_element(element, steps, width):
+    """
+    Compiles the element into the list of steps.
+
+    [x] NOTE:
+    --------
+    Only the elements that render themselves with the default implementations
+    are compiled, any other element is evaluated as it would be without the
+    plan.
+    """
+    element_cls = type(element)
+    if isinstance(element, DynamicLines):
+        steps.append(ElementStep(element, width))
+    elif element_cls.__call__ is Lines.__call__:
+        compile_parent(element, LinesStep, steps, width)
+    elif element_cls.__call__ is Line.__call__:
+        compile_parent(element, LineStep, steps, width)
+    elif element_cls.__call__ is Segment.__call__:
+        steps.append(SegmentStep(element))
+    else:
+        steps.append(ElementStep(element, width))
+
+
+def compile_parent(element, step_cls, steps, width):
+    for child in element.children:
+        compile_element(child, steps, width)
+    steps.append(step_cls(element, len(element.children)))
+
+
+class RenderPlan(object):
+    """
+    Flat list of render steps compiled from a LogFormat tree.
+
+    The steps are ordered so that the children of each element are evaluated
+    before the element itself (post-order), with each step pushing whether or
+    not the element is valid along with its lines onto a stack, where they are
+    consumed by the step of the parent element:
+
+    >>> LogFormat(
+    >>>     Lines(
+    >>>         Line(Segment(...), Segment(...)),
+    >>>         Line(Segment(...)),
+    >>>     )
+    >>> )
+
+    >>> [Segment, Segment, Line, Segment, Line, Lines]
+
+    The decorations of every element are resolved once, when the plan is
+    compiled, so only the parts of the tree that depend on the record are
+    evaluated for each record.  The value of each Segment is evaluated exactly
+    once per record.
+
+    The `generation` of the settings that the plan was compiled with is kept,
+    since the formats of color strings are resolved with the COLOR_DEPTH.
+    """
+
+    def __init__(self, log_format):
+        self.log_format = log_format
+        self.width = log_format._width
+        self.generation = settings.generation
+
+        # Widths are only passed down to the children once, instead of for
+        # every record.
+        log_format.decorate_children({'width': self.width})
+
+        self.steps = []
+        for child in log_format.children:
+            compile_element(child, self.steps, self.width)
+        self.count = len(log_format.children)
+
+    def __call__(self, record):
+        stack = []
+        for step in self.steps:
+            step(record, stack)
+
+        log_format = self.log_format
+        lines = [' ' for i in range(log_format._lines_above)]
+        lines += [log_format.header(record)]
+        for valid, group in stack:
+            if valid:
+                lines.extend(group)
+        lines += [' ' for i in range(log_format._lines_below)]
+        return "\n" + "\n".join(lines)
+
+    def render(self, record):
+        """
+        Renders the record as lines of styled spans, from which the output for
+        the terminal, plain text and JSON sinks are encoded.  See RenderedRecord.
+
+        [x] NOTE:
+        --------
+        Since the width of spans does not include ANSI sequences, lines are
+        wrapped at the width of the text as displayed.
+        """
+        stack = []
+        segments = []
+        for step in self.steps:
+            step.render(record, stack, segments)
+
+        log_format = self.log_format
+        lines = [[Span(' ')] for i in range(log_format._lines_above)]
+        lines += [Span.from_ansi(log_format.header(record))]
+        for valid, group in stack:
+            if valid:
+                lines.extend(group)
+        lines += [[Span(' ')] for i in range(log_format._lines_below)]
+        return RenderedRecord(record, lines, segments)
@@ -0,0 +1,392 @@
+import functools
+import json
+from textwrap import TextWrapper
+
+from termx.ext.ansi import AnsiScanner, SGR_RESETS, display_width, strip_ansi
+from termx.ext.utils import string_format_tuple
+from termx.fmt import Format
+
+
+__all__ = ('Span', 'SpanWrapper', 'AnsiWrapper', 'ansi_wrapper', 'RenderedRecord', 'SINKS', )
+
+
+SINKS = ('ansi', 'plain', 'json')
+
+
+class Span(object):
+    """
+    A run of plain text along with the ANSI sequences that style it, which
+    are only applied when the span is rendered for a terminal:
+
+    >>> span = Span("Error", prefix="\x1b[31m", suffix="\x1b[39m")
+    >>> span.text
+    >>> "Error"
+    >>> span.styled()
+    >>> "\x1b[31mError\x1b[39m"
+
+    [x] NOTE:
+    --------
+    The text of a span never contains ANSI sequences, so the text can be
+    measured, wrapped and sliced without accounting for them.
+    """
+    __slots__ = ('text', 'prefix', 'suffix')
+
+    def __init__(self, text, prefix="", suffix=""):
+        self.text = text
+        self.prefix = prefix
+        self.suffix = suffix
+
+    def __repr__(self):
+        return "<Span %r>" % self.styled()
+
+    def __eq__(self, other):
+        if not isinstance(other, Span):
+            return NotImplemented
+        return (self.text, self.prefix, self.suffix) == (other.text, other.prefix, other.suffix)
+
+    def styled(self):
+        if self.prefix:
+            return "%s%s%s" % (self.prefix, self.text, self.suffix)
+        return self.text
+
+    def slice(self, start, end):
+        if start == 0 and end >= len(self.text):
+            return self
+        return Span(self.text[start:end], self.prefix, self.suffix)
+
+    @classmethod
+    def formatted(cls, text, format=None):
+        """
+        Returns the spans for the text formatted with a format, as returned
+        by `get_format()`.
+
+        Format objects are split into spans without performing any of the ANSI
+        formatting, other formatting callables can only be applied and their
+        output split back into spans.
+        """
+        if not format:
+            return [cls(text)] if text else []
+        elif isinstance(format, Format):
+            before, inside, after = format.partition(text)
+            prefix, suffix = format.ansi_bounds
+            spans = [cls(before)] if before else []
+            if inside:
+                spans.append(cls(inside, prefix, suffix))
+            if after:
+                spans.append(cls(after))
+            return spans
+        return cls.from_ansi(format(text))
+
+    @classmethod
+    def value(cls, value, format=None, tuple_value=False):
+        """
+        Returns the spans for the value of an element, evaluated for a record,
+        formatted like `Core.format_value()` formats it.
+        """
+        try:
+            text = "%s" % value
+        except TypeError:
+            if not tuple_value:
+                raise
+            text = string_format_tuple(value)
+        return cls.formatted(text, format)
+
+    @classmethod
+    def from_ansi(cls, string):
+        """
+        Splits a string that was already formatted with ANSI sequences into
+        spans, where each span is styled with the SGR sequences that are active
+        at the start of the span.
+
+        [x] NOTE:
+        --------
+        Escape sequences other than SGR sequences (i.e. cursor movements) are
+        not included in the spans.
+        """
+        if not string:
+            return []
+        elif '\x1b' not in string:
+            return [cls(string)]
+
+        spans = []
+        scanner = AnsiScanner()
+        for escape, run in scanner.scan(string):
+            if escape:
+                continue
+            elif scanner.active:
+                spans.append(cls(run, scanner.sgr, SGR_RESETS[0]))
+            else:
+                spans.append(cls(run))
+        return spans
+
+
+def text_of(spans):
+    return "".join([span.text for span in spans])
+
+
+def styled_of(spans):
+    return "".join([span.styled() for span in spans])
+
+
+def join_spans(lines, delimiter):
+    """
+    Joins lines of spans together with the delimiter, like `str.join`.
+    """
+    joined = []
+    for i, line in enumerate(lines):
+        if i != 0 and delimiter:
+            joined.append(Span(delimiter))
+        joined.extend(line)
+    return joined
+
+
+def slice_spans(spans, start, end):
+    sliced = []
+    offset = 0
+    for span in spans:
+        length = len(span.text)
+        if offset + length > start and offset < end:
+            sliced.append(span.slice(max(start - offset, 0), end - offset))
+        offset += length
+        if offset >= end:
+            break
+    return sliced
+
+
+class DisplayTextWrapper(TextWrapper):
+    """
+    TextWrapper that measures the text by the number of columns it occupies in
+    the terminal (see `display_width()`), rather than the number of characters,
+    so that text with wide characters (i.e. CJK and emoji) is not wrapped past
+    the width.
+
+    [x] NOTE:
+    --------
+    Lines are never truncated, the `max_lines` option is not supported.
+    """
+
+    def _handle_long_word(self, reversed_chunks, cur_line, cur_len, width):
+        chunk = reversed_chunks[-1]
+        space_left = 1 if width < 1 else width - cur_len
+        if self.break_long_words:
+            end = used = 0
+            while end < len(chunk):
+                used += display_width(chunk[end])
+                if used > space_left:
+                    break
+                end += 1
+            # A character that is wider than the line is put on a line alone.
+            if end == 0 and not cur_line:
+                end = 1
+            cur_line.append(chunk[:end])
+            reversed_chunks[-1] = chunk[end:]
+        elif not cur_line:
+            cur_line.append(reversed_chunks.pop())
+
+    def _wrap_chunks(self, chunks):
+        if self.width <= 0:
+            raise ValueError("invalid width %r (must be > 0)" % self.width)
+
+        lines = []
+        chunks.reverse()
+        while chunks:
+            cur_line = []
+            cur_len = 0
+
+            indent = self.subsequent_indent if lines else self.initial_indent
+            width = self.width - display_width(indent)
+
+            if self.drop_whitespace and chunks[-1].strip() == '' and lines:
+                del chunks[-1]
+
+            while chunks:
+                length = display_width(chunks[-1])
+                if cur_len + length > width:
+                    break
+                cur_line.append(chunks.pop())
+                cur_len += length
+
+            if chunks and display_width(chunks[-1]) > width:
+                self._handle_long_word(chunks, cur_line, cur_len, width)
+
+            if self.drop_whitespace and cur_line and cur_line[-1].strip() == '':
+                del cur_line[-1]
+
+            if cur_line:
+                lines.append(indent + ''.join(cur_line))
+        return lines
+
+
+class SpanWrapper(object):
+    """
+    Wraps a line of spans the way that a TextWrapper wraps text, keeping the
+    styling of each span on the lines that it is broken across.
+
+    The text is wrapped with a TextWrapper, and the wrapped lines are mapped
+    back onto the spans - which works because the TextWrapper only drops
+    whitespace between the wrapped lines, and replaces each whitespace character
+    with a single space (tabs are not expanded).
+
+    The indents can either be strings or spans.
+
+    [x] NOTE:
+    --------
+    The text of spans does not include any ANSI sequences, so the width of the
+    lines is the width of the text as displayed - which is measured in columns,
+    see DisplayTextWrapper.
+    """
+
+    def __init__(self, width, initial_indent=None, subsequent_indent=None):
+        self.initial_indent = self._indent_spans(initial_indent)
+        self.subsequent_indent = self._indent_spans(subsequent_indent)
+        self.wrapper = DisplayTextWrapper(
+            width=width,
+            initial_indent=text_of(self.initial_indent),
+            subsequent_indent=text_of(self.subsequent_indent),
+            expand_tabs=False,
+        )
+
+    @staticmethod
+    def _indent_spans(indent):
+        if not indent:
+            return []
+        elif isinstance(indent, str):
+            return [Span(indent)]
+        return list(indent)
+
+    def fits(self, text):
+        """
+        Returns whether or not the text fits on the first line.
+        """
+        indent = self.wrapper.initial_indent
+        return display_width(text) + display_width(indent) <= self.wrapper.width
+
+    def wrap(self, spans):
+        text = text_of(spans)
+        if not text:
+            return []
+        elif (text[-1] != ' ' and text.isprintable() and self.fits(text)):
+            return [self.initial_indent + spans]
+
+        # The TextWrapper replaces each whitespace character with a space.
+        normalized = text.translate(self.wrapper.unicode_whitespace_trans)
+        if normalized != text:
+            spans = [
+                Span(span.text.translate(self.wrapper.unicode_whitespace_trans),
+                    span.prefix, span.suffix)
+                for span in spans
+            ]
+
+        lines = []
+        position = 0
+        for i, line in enumerate(self.wrapper.wrap(text)):
+            if i == 0:
+                indent = self.initial_indent
+                content = line[len(self.wrapper.initial_indent):]
+            else:
+                indent = self.subsequent_indent
+                content = line[len(self.wrapper.subsequent_indent):]
+
+            start = normalized.find(content, position)
+            position = start + len(content)
+            lines.append(indent + slice_spans(spans, start, position))
+        return lines
+
+
+class AnsiWrapper(object):
+    """
+    Wraps text that is formatted with ANSI sequences, the way that a TextWrapper
+    wraps the text as it is displayed:
+
+    >>> wrapper = AnsiWrapper(width=20, initial_indent="> ")
+    >>> wrapper.wrap(Format(color='red')("The text wraps at 20 columns"))
+
+    Unlike a TextWrapper, the ANSI sequences do not count towards the width of
+    the lines, and the styles that are active where a line is broken are
+    applied again on the next line (and reset at the end of each line).  The
+    indents can also be formatted with ANSI sequences.
+
+    [x] NOTE:
+    --------
+    Wrappers do not hold any state, so the same wrapper can be reused for each
+    (width, indents) - see `ansi_wrapper()`.
+    """
+
+    def __init__(self, width, initial_indent="", subsequent_indent=""):
+        self.width = width
+        self.initial_indent = initial_indent
+        self.subsequent_indent = subsequent_indent
+        self.span_wrapper = SpanWrapper(
+            width,
+            initial_indent=Span.from_ansi(initial_indent),
+            subsequent_indent=Span.from_ansi(subsequent_indent),
+        )
+
+    def wrap(self, text):
+        plain = strip_ansi(text)
+
+        # Most text fits on a single line, in which case the TextWrapper would
+        # only add the indent - as long as there is no whitespace for it to drop
+        # or replace.
+        if (plain and plain[-1] != ' ' and plain.isprintable()
+                and self.span_wrapper.fits(plain)):
+            return ["%s%s" % (self.initial_indent, text)]
+
+        return [styled_of(line) for line in self.span_wrapper.wrap(Span.from_ansi(text))]
+
+
+@functools.lru_cache(maxsize=256)
+def ansi_wrapper(width, initial_indent="", subsequent_indent=""):
+    """
+    Returns the AnsiWrapper for the width and indents, which is only created
+    once for each configuration.
+    """
+    return AnsiWrapper(width, initial_indent, subsequent_indent)
+
+
+class RenderedRecord(object):
+    """
+    The output of a LogFormat for a record, as lines of spans along with the
+    labels and values of the Segments that were rendered, from which the
+    output for each sink is encoded:
+
+    (1) "ansi": The text styled with ANSI sequences, for terminals.
+    (2) "plain": The text without any styling, for files.
+    (3) "json": A JSON document with the labels and values of the Segments.
+
+    >>> rendered = log_format.render(record)
+    >>> rendered.encode('plain')
+
+    Each encoding is only computed once, so several sinks can share the same
+    rendered record.
+    """
+
+    def __init__(self, record, lines, segments):
+        self.record = record
+        self.lines = lines
+        self.segments = segments
+        self._encoded = {}
+
+    def encode(self, sink):
+        try:
+            return self._encoded[sink]
+        except KeyError:
+            pass
+        encoded = self._encoded[sink] = getattr(self, sink)()
+        return encoded
+
+    def ansi(self):
+        return "\n" + "\n".join([styled_of(line) for line in self.lines])
+
+    def plain(self):
+        return "\n" + "\n".join([text_of(line) for line in self.lines])
+
+    def json(self):
+        record = self.record
+        return json.dumps({
+            'name': getattr(record, 'name', None),
+            'levelname': getattr(record, 'levelname', None),
+            'created': getattr(record, 'created', None),
+            'segments': self.segments,
+            'lines': [text_of(line) for line in self.lines],
+        }, default=str)
@@ -1 +1,2 @@
 from .api import Spinner  # noqa
+from .aio import AsyncSpinner  # noqa
@@ -0,0 +1,275 @@
+import asyncio
+import contextlib
+import sys
+
+from termx import Cursor
+from termx.fmt import color as Color
+
+from .api import default_spinner
+from .models import TerminalOptions
+from .base import AbstractSpinner, AbstractGroup
+from .screen import Screen
+
+
+class AsyncScheduler(object):
+    """
+    Event loop counterpart to the SpinnerScheduler, which drives the animation
+    of every active AsyncSpinnerGroup under a single AsyncSpinner root from one
+    task instead of a thread.
+
+    Groups never write to the terminal themselves - they only update the root's
+    screen model and request a render, which the task performs on its next
+    iteration.  This means that any number of writes made between iterations are
+    rendered as a single frame.
+
+    The task is started when the first group registers and finishes once there
+    are no registered groups left, after rendering the final state of the tree.
+    """
+
+    def __init__(self, interval, screen):
+        self.interval = interval
+        self.screen = screen
+
+        self._groups = []
+        self._task = None
+        self._wakeup = None
+
+    @property
+    def groups(self):
+        return list(self._groups)
+
+    def is_registered(self, group):
+        return group in self._groups
+
+    def register(self, group):
+        if group in self._groups:
+            return
+
+        self._groups.append(group)
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.ensure_future(self._run())
+
+    def unregister(self, group):
+        if group in self._groups:
+            self._groups.remove(group)
+            self.request_render()
+
+    def request_render(self):
+        if self._wakeup:
+            self._wakeup.set()
+        else:
+            self.screen.render()
+
+    async def flush(self):
+        """
+        Renders any outstanding damage immediately, and then yields control to
+        the event loop.
+        """
+        self.screen.render()
+        await asyncio.sleep(0)
+
+    async def close(self):
+        self._groups = []
+        if self._task:
+            self._wakeup.set()
+            await self._task
+        self._task = None
+
+    async def _run(self):
+        loop = asyncio.get_event_loop()
+        next_tick = loop.time() + self.interval
+
+        while self._groups:
+            try:
+                await asyncio.wait_for(
+                    self._wakeup.wait(),
+                    timeout=max(next_tick - loop.time(), 0),
+                )
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+            if loop.time() >= next_tick:
+                self.tick()
+                next_tick = loop.time() + self.interval
+            else:
+                self.screen.render()
+
+        self.screen.render()
+        self._wakeup = None
+
+    def tick(self):
+        with self.screen.deferred():
+            for group in self._groups:
+                group._tick()
+
+
+class AsyncSpinner(AbstractSpinner):
+    """
+    asyncio native version of the Spinner, where all of the groups in the tree
+    are animated by a single task on the running event loop:
+
+    >>> spinner = AsyncSpinner()
+    >>> async with spinner.child('First Group') as gp:
+    >>>     await gp.write('Message 1')
+    >>>     async with gp.child('Second Group') as child:
+    >>>         await child.write('Message 2')
+
+    The header and line items are formatted the same way as the threaded
+    Spinner.
+    """
+
+    def __init__(self, color='black', options=None):
+        options = TerminalOptions(**(options or {}))
+        color = Color(color)
+
+        screen = Screen()
+        AbstractSpinner.__init__(
+            self,
+            color=color,
+            options=options,
+            spinner=default_spinner,
+            screen=screen,
+            scheduler=AsyncScheduler(options.spin_interval, screen=screen),
+        )
+
+    def _group_cls(self):
+        return AsyncSpinnerGroup
+
+    def _separate(self):
+        self._screen.add_row()
+        self._scheduler.request_render()
+
+    @contextlib.asynccontextmanager
+    async def reenter(self, text, separate=False):
+        """
+        Async version of `Spinner.reenter`.
+        """
+        if separate:
+            self._separate()
+
+        youngest = self._find_youngest_descendant()
+        async with youngest._parent.child(text) as desc:
+            yield desc
+
+    @contextlib.asynccontextmanager
+    async def child(self, text, separate=True):
+        if separate:
+            self._separate()
+
+        child = self._child(text)
+        self._children.append(child)
+        try:
+            await child.start()
+            yield child
+        finally:
+            await child.done()
+
+    def __repr__(self):
+        return u"<AsyncSpinner frames={0!s}>".format(self._frames)
+
+
+class AsyncSpinnerGroup(AbstractGroup):
+    """
+    Group of the AsyncSpinner, where each of the methods that write to the
+    group are awaitable and only update the screen model of the root, never
+    blocking the event loop.
+    """
+
+    async def __aenter__(self):
+        if self._parent and self._parent._quit:
+            return None
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, traceback):
+        if exc_type:
+            await self.stop()
+            self._quit = True
+            await self.error(exc_val)
+            await self._move_to_newline()
+            return 0
+
+        if self._spinning:
+            await self.stop()
+        return False  # Nothing is Handled
+
+    def _group_cls(self):
+        return AsyncSpinnerGroup
+
+    def _print_head(self, text):
+        self._screen.update_row(self._reserve_row(), text)
+        self._scheduler.request_render()
+
+    def _print(self, text):
+        self._reserve_row()
+        self._screen.add_row(text)
+        self._scheduler.request_render()
+
+    def _line_out(self, line):
+        self._print(line.format())
+
+    def _head_out(self, item):
+        self._print_head(item.format())
+
+    async def _move_to_newline(self):
+        await self._scheduler.flush()
+        if self._depth == 0:
+            self._screen.release()
+        else:
+            self._screen.move_to_end()
+
+    async def start(self):
+        if sys.stdout.isatty():
+            Cursor.hide()
+
+        self._reserve_row()
+        self._scheduler.register(self)
+        await asyncio.sleep(0)
+
+    async def stop(self):
+        self._scheduler.unregister(self)
+        await asyncio.sleep(0)
+
+    @contextlib.asynccontextmanager
+    async def child(self, text):
+        await self.done()
+
+        child = self._child(text)
+        self._children.append(child)
+
+        try:
+            await child.start()
+            yield child
+        finally:
+            await child.done()
+
+    async def hold(self):
+        await self._move_to_newline()
+
+    async def done(self, text=None):
+        if self._finish(text=text):
+            await self._move_to_newline()
+
+    async def write(self, text, state=None, options=None, fatal=True):
+        self._write(text, state=state, options=options, fatal=fatal)
+        await asyncio.sleep(0)
+
+    async def error(self, text=None, fatal=True):
+        await self.fail(text=text, fatal=fatal)
+
+    async def ok(self, text, options=None):
+        await self.okay(text, options=options)
+
+    async def okay(self, text, options=None):
+        self._okay(text, options=options)
+        await asyncio.sleep(0)
+
+    async def fail(self, text=None, options=None, fatal=True):
+        self._fail(text=text, options=options, fatal=fatal)
+        await asyncio.sleep(0)
+
+    async def warning(self, text=None, options=None, fatal=True):
+        self._warning(text=text, options=options, fatal=fatal)
+        await asyncio.sleep(0)
@@ -1,14 +1,13 @@
 import collections
 import contextlib
 import sys
-import threading
 
 from termx.ext.compat import ENCODING, PY2
 
 from termx import Cursor
 from termx.fmt import color as Color
 
-from .models import TerminalOptions, SpinnerStates, LineItem
+from .models import TerminalOptions
 from .base import AbstractSpinner, AbstractGroup
 
 
@@ -44,23 +43,6 @@ class Spinner(AbstractSpinner):
             spinner=default_spinner,
         )
 
-    def _yield_descendants(self):
-
-        def descend(child):
-            if child._children:
-                for child in child._children:
-                    yield from descend(child)
-            else:
-                yield child
-
-        yield from descend(self)
-
-    def _find_youngest_descendant(self):
-        descendants = list(self._yield_descendants())
-        youngest = sorted(descendants,
-            key=lambda child: (child._depth, child._index), reverse=True)
-        return youngest[0]
-
     @contextlib.contextmanager
     def reenter(self, text, separate=False):
         """
@@ -92,7 +74,7 @@ class Spinner(AbstractSpinner):
             > Message 5
         """
         if separate:
-            Cursor.newline()
+            self._separate()
 
         youngest = self._find_youngest_descendant()
         with youngest._parent.child(text) as desc:
@@ -113,7 +95,7 @@ class Spinner(AbstractSpinner):
         Not sure why, but it does mess with things a tiny bit.
         """
         if separate:
-            Cursor.newline()
+            self._separate()
 
         child = self._child(text)
         self._children.append(child)
@@ -131,6 +113,12 @@ class Spinner(AbstractSpinner):
         finally:
             child.done()
 
+    def _separate(self):
+        with self._scheduler.lock:
+            self._scheduler.flush()
+            self._screen.add_row()
+            self._screen.render()
+
     def __repr__(self):
         repr_ = u"<Spinner frames={0!s}>".format(self._frames)
         if PY2:
@@ -149,23 +137,28 @@ class SpinnerGroup(AbstractGroup):
     def __exit__(self, exc_type, exc_val, traceback):
         # Avoid stop() execution for the 2nd time
         if exc_type:
-            self._stop_spin.set()
-            self._spin_thread.join()
+            self.stop()
             self._quit = True
             self.error(exc_val)
             self._move_to_newline()
             return 0
 
-        if self._spin_thread.is_alive():
+        if self._spinning:
             self.stop()
         return False  # Nothing is Handled
 
     def start(self):
+        """
+        Registers the group with the root's scheduler, which animates all of
+        the active groups in the tree from a single thread.
+        """
         if sys.stdout.isatty():
             Cursor.hide()
 
-        self._spin_thread = threading.Thread(target=self._spin)
-        self._spin_thread.start()
+        with self._write_lock:
+            self._scheduler.flush()
+            self._reserve_row()
+        self._scheduler.register(self)
 
     @contextlib.contextmanager
     def child(self, text):
@@ -217,24 +210,17 @@ class SpinnerGroup(AbstractGroup):
 
         If provided, changes the header text.
         """
-        if not self._done:
-            self._done = True
-            self.stop()
-            self._change(state=SpinnerStates.OK, text=text)
+        if self._finish(text=text):
             self._move_to_newline()
 
     def stop(self):
         """
-        [x] TODO:
-        --------
-        Have to incorporate nested blocks as well
-        Allow control from main spinner container..
+        Unregisters the group from the scheduler.  Once this returns, the group's
+        header will not be redrawn by the scheduler again.
 
-        Spin thread can be null if an error occurs before it is initialized fully.
+        The group may not be registered if an error occurs before it is started.
         """
-        self._stop_spin.set()
-        if self._spin_thread:
-            self._spin_thread.join()
+        self._scheduler.unregister(self)
 
     def write(self, text, state=None, options=None, fatal=True):
         """
@@ -243,15 +229,7 @@ class SpinnerGroup(AbstractGroup):
 
         Only Updates Header on State Change Associated w/ Line
         """
-        state = state or SpinnerStates.NOTSET
-        line = LineItem(
-            text=text,
-            state=state,
-            depth=self._depth,
-            options=options,
-            fatal=fatal,
-        )
-        self._line_out(line)
+        self._write(text, state=state, options=options, fatal=fatal)
 
     """
     [x] TODO:
@@ -278,23 +256,12 @@ class SpinnerGroup(AbstractGroup):
 
         This effectively just puts a checkmark next to the item.
         """
-        options = options or {}
-        options.update(color_icon=False)
-        # Not Really Fatal - But just means don't color icon and use bullet too.
-        self.write(text, state=SpinnerStates.OK, options=options, fatal=False)
+        self._okay(text, options=options)
 
     def fail(self, text=None, options=None, fatal=True):
-        options = options or {}
-        if text:
-            self.write(text, state=SpinnerStates.FAIL, options=options, fatal=fatal)
-        if fatal:
-            self._change_state(state=SpinnerStates.FAIL)
+        self._fail(text=text, options=options, fatal=fatal)
 
     def warning(self, text=None, options=None, fatal=True):
         # if not self._parenting:
         #     raise SpinnerError('Cannot write with a spinner descendant that is not active.')
-        options = options or {}
-        if text:
-            self.write(text, state=SpinnerStates.WARNING, options=options, fatal=fatal)
-        if fatal:
-            self._change_state(state=SpinnerStates.WARNING)
+        self._warning(text=text, options=options, fatal=fatal)
@@ -1,21 +1,27 @@
-import contextlib
 import itertools
-import time
-import threading
 
-from termx import Cursor
-
-from .models import SpinnerStates, HeaderItem
+from .models import SpinnerStates, HeaderItem, LineItem
+from .scheduler import SpinnerScheduler
+from .screen import Screen
 from ._utils import get_frames
 
 
 class AbstractSpinner(object):
 
-    def __init__(self, color, spinner, options):
+    def __init__(self, color, spinner, options, scheduler=None, screen=None):
 
         self.options = options
         self._quit = False
 
+        # The root Spinner owns the screen model and the scheduler that animates
+        # every group in the tree, children are handed the root's instances.
+        self._screen = screen if screen is not None else Screen()
+        self._scheduler = scheduler if scheduler is not None else SpinnerScheduler(
+            options.spin_interval,
+            screen=self._screen,
+            flush_interval=options.write_interval if options.batch else None,
+        )
+
         self._color = color
         self._spinner = spinner
         self._children = []
@@ -30,13 +36,13 @@ class AbstractSpinner(object):
         self._state = SpinnerStates.NOTSET
         self._parenting = False
 
-    def _add_line(self):
-        pass
-
-    def _group(self, text, index, depth, older_siblings, parent, lock=None):
+    def _group_cls(self):
         from .api import SpinnerGroup
+        return SpinnerGroup
 
-        return SpinnerGroup(
+    def _group(self, text, index, depth, older_siblings, parent):
+        group_cls = self._group_cls()
+        return group_cls(
             text=text,
             color=self._color,
             spinner=self._spinner,
@@ -45,7 +51,8 @@ class AbstractSpinner(object):
             depth=depth,
             older_siblings=older_siblings,
             parent=parent,
-            # lock=lock,
+            scheduler=self._scheduler,
+            screen=self._screen,
         )
 
     def _child(self, text):
@@ -61,11 +68,28 @@ class AbstractSpinner(object):
             parent=self,
         )
 
+    def _yield_descendants(self):
+
+        def descend(child):
+            if child._children:
+                for child in child._children:
+                    yield from descend(child)
+            else:
+                yield child
+
+        yield from descend(self)
+
+    def _find_youngest_descendant(self):
+        descendants = list(self._yield_descendants())
+        youngest = sorted(descendants,
+            key=lambda child: (child._depth, child._index), reverse=True)
+        return youngest[0]
+
 
 class AbstractGroup(AbstractSpinner):
 
     def __init__(self, text, color, spinner, options, index, depth, parent, older_siblings,
-            lock=None):
+            scheduler, screen):
         """
         [x] TODO:
         --------
@@ -78,6 +102,8 @@ class AbstractGroup(AbstractSpinner):
             color=color,
             spinner=spinner,
             options=options,
+            scheduler=scheduler,
+            screen=screen,
         )
 
         self._index = index
@@ -90,28 +116,17 @@ class AbstractGroup(AbstractSpinner):
         self._text = text
         self._frame = None
 
-        self._stop_spin = threading.Event()
-        self._write_lock = lock or threading.Lock()
-
-        self._done = False
         self._done = False
         self._stopped = False
 
-        self._spin_thread = None
-
-        self.lines = 0
+        # Index of the header line in the root's screen, reserved when the
+        # group starts.
+        self._row = None
 
     def _child(self, text):
         """
-        [x] TODO:
-        --------
-        Children of the top level groups, and subsequent children, need to be
-        equipped with the lock so that they can also update their animated
-        spinners.
-
-        This is only if we want the animated spinning to be nested, otherewise
-        we don't need this method in the AbstractGroup class, just the
-        AbstractSpinner class.
+        Children of the top level groups, and subsequent children, are animated
+        by the same scheduler as the root, which `_group` hands down to them.
         """
         return self._group(
             text=text,
@@ -119,7 +134,6 @@ class AbstractGroup(AbstractSpinner):
             depth=self._depth + 1,
             older_siblings=self._children,
             parent=self,
-            # lock=self._write_lock,
         )
 
     def _sibling(self, text):
@@ -136,52 +150,51 @@ class AbstractGroup(AbstractSpinner):
             parent=self._parent,
         )
 
-    @classmethod
-    def _print_head(cls, text):
-        Cursor.overwrite(text, newline=False)
-        Cursor.carriage_return()
+    @property
+    def _write_lock(self):
+        """
+        All groups in the tree share the scheduler lock, so that the ticks of
+        the scheduler and the writes of the groups never interleave.
+        """
+        return self._scheduler.lock
+
+    def _reserve_row(self):
+        if self._row is None:
+            self._row = self._screen.add_row()
+        return self._row
+
+    def _print_head(self, text):
+        self._screen.update_row(self._reserve_row(), text)
+        self._screen.render()
 
     def _print(self, text):
-        with self._temporary_newline():
-            Cursor.overwrite(text, newline=False)
-            Cursor.carriage_return()
+        self._reserve_row()
+        self._screen.add_row(text)
+        self._screen.render()
 
     def _move_to_newline(self):
-        i = 0
-        while i < self.lines:
-            Cursor.move_down()
-            i += 1
-        Cursor.newline()
-
-    def _move_to_head(self):
-        i = 0
-        while i < self.lines:
-            Cursor.move_up()
-            i += 1
-
-    def _add_line(self):
-        self.lines += 1
-        if self._parent:
-            self._parent._add_line()
-
-    @contextlib.contextmanager
-    def _temporary_newline(self):
         """
-        Temporarily moves the cursor to a newline and then immediately back to
-        the header line to keep animation smooth.
+        Moves the cursor to the line below all of the rows written so far.  Once
+        a top level group is finished, none of its rows will change, so the
+        screen is released and the next group starts from a fresh origin.
+        """
+        with self._write_lock:
+            self._scheduler.flush()
+            if self._depth == 0:
+                self._screen.release()
+            else:
+                self._screen.move_to_end()
+
+    @property
+    def _spinning(self):
+        return self._scheduler.is_registered(self)
+
+    def _tick(self):
+        """
+        Called by the scheduler, while holding the write lock, to advance the
+        spinner to its next frame.
         """
-        try:
-            self._move_to_newline()
-            self._add_line()
-            yield self
-        finally:
-            self._move_to_head()
-
-    def _spin(self):
-        while not self._stop_spin.is_set():
-            spin_phase = next(self._cycle)
-            time.sleep(self.options.spin_interval)
-            self._change(frame=spin_phase)
+        self._change(frame=next(self._cycle))
 
     def _change(self, state=None, text=None, frame=None, priority=None):
 
@@ -251,9 +264,62 @@ class AbstractGroup(AbstractSpinner):
             return True
         return False
 
+    def _finish(self, text=None):
+        """
+        Stops animating the group and updates the header line to reflect the
+        final state and the new text, if provided.  Returns False if the group
+        was already finished.
+        """
+        if self._done:
+            return False
+
+        self._done = True
+        self._scheduler.unregister(self)
+        self._change(state=SpinnerStates.OK, text=text)
+        return True
+
+    def _write(self, text, state=None, options=None, fatal=True):
+        state = state or SpinnerStates.NOTSET
+        line = LineItem(
+            text=text,
+            state=state,
+            depth=self._depth,
+            options=options,
+            fatal=fatal,
+        )
+        self._line_out(line)
+
+    def _okay(self, text, options=None):
+        options = options or {}
+        options.update(color_icon=False)
+        # Not Really Fatal - But just means don't color icon and use bullet too.
+        self._write(text, state=SpinnerStates.OK, options=options, fatal=False)
+
+    def _fail(self, text=None, options=None, fatal=True):
+        options = options or {}
+        if text:
+            self._write(text, state=SpinnerStates.FAIL, options=options, fatal=fatal)
+        if fatal:
+            self._change_state(state=SpinnerStates.FAIL)
+
+    def _warning(self, text=None, options=None, fatal=True):
+        options = options or {}
+        if text:
+            self._write(text, state=SpinnerStates.WARNING, options=options, fatal=fatal)
+        if fatal:
+            self._change_state(state=SpinnerStates.WARNING)
+
     def _line_out(self, line):
+        """
+        In batch mode, the line is queued on the scheduler without waiting on
+        the write lock and is rendered along with every other line queued in the
+        same frame.  Otherwise, the line is rendered immediately.
+        """
+        if self.options.batch:
+            self._scheduler.enqueue(self, line)
+            return
+
         message = line.format()
-        time.sleep(self.options.write_interval)
         with self._write_lock:
             self._print(message)
 
@@ -1,10 +1,10 @@
 from dataclasses import dataclass, field, InitVar
 from datetime import datetime
 from enum import Enum
-import shutil
 import typing
 
 from termx import settings
+from termx.terminal import Terminal
 from termx.fmt import color as Color
 
 from termx.ext.compat import safe_text
@@ -15,9 +15,17 @@ from ._utils import shaded_level
 
 @dataclass
 class TerminalOptions:
+    """
+    Intervals are specified in milliseconds.
 
+    When `batch` is True, group writes are queued without blocking the caller
+    and the scheduler flushes everything queued since the last frame in a
+    single render, every `write_interval`.  Otherwise, writes are rendered
+    immediately.
+    """
     spin_interval: float = 100
     write_interval: float = 25
+    batch: bool = False
 
     def __post_init__(self):
         self.spin_interval = self.spin_interval * 0.001
@@ -29,18 +37,34 @@ class SpinnerStates(Enum):
     [x] TODO:
     --------
     We might want to make the default spinner state labels configurable.
+
+    [x] NOTE:
+    --------
+    The states only reference the keys of their colors and icons in settings,
+    which are looked up when they are used, so that defining the states does
+    not load the settings.
     """
-    NOTSET = ("Not Set", settings.COLORS.NOTSET, settings.ICONS.NOTSET, 0)
-    OK = ("Ok", settings.COLORS.SUCCESS, settings.ICONS.SUCCESS, 1)
-    WARNING = ("Warning", settings.COLORS.WARNING, settings.ICONS.WARNING, 2)
-    FAIL = ("Failed", settings.COLORS.FAIL, settings.ICONS.FAIL, 3)
+    NOTSET = ("Not Set", "NOTSET", 0)
+    OK = ("Ok", "SUCCESS", 1)
+    WARNING = ("Warning", "WARNING", 2)
+    FAIL = ("Failed", "FAIL", 3)
 
-    def __init__(self, label, color, icon, level):
+    def __init__(self, label, settings_key, level):
         self.label = label
-        self.color = color
-        self.icon = icon
+        self.settings_key = settings_key
         self.level = level
 
+        self._color_path = 'COLORS.%s' % settings_key
+        self._icon_path = 'ICONS.%s' % settings_key
+
+    @property
+    def color(self):
+        return settings.get_path(self._color_path)
+
+    @property
+    def icon(self):
+        return settings.get_path(self._icon_path)
+
 
 @dataclass
 class LineItemStyle:
@@ -202,7 +226,7 @@ class ItemMixin:
 
     def indentation(self):
         count = self.indentation_count()
-        num_spaces = count * constants.INDENT_COUNT
+        num_spaces = count * settings.get_path('INDENT_COUNT')
 
         # This is Only if We Use Trailing Characer Dots...
         if self.depth == 0:
@@ -271,10 +295,10 @@ class LineItem(ItemMixin):
             return safe_text(message)
 
         # TODO: Make DATE_FORMAT Configurable, Make FADED Format Configurable
-        date_message = config.Formats.TEXT.FADED.with_wrapper("[%s]")(
-            datetime.now().strftime(constants.DATE_FORMAT)
+        date_message = settings.get_path('TEXT.FADED').with_wrapper("[%s]")(
+            datetime.now().strftime(settings.get_path('DATE_FORMAT'))
         )
-        columns, _ = shutil.get_terminal_size(fallback=(80, 24))
+        columns = Terminal.columns()
         separated = (" " * (columns - 5 - measure_ansi_string(date_message) -
             measure_ansi_string(message)))
 
@@ -0,0 +1,161 @@
+import collections
+import threading
+import time
+
+
+class SpinnerScheduler(object):
+    """
+    Drives the animation of every active SpinnerGroup under a single Spinner
+    root from one timer thread.
+
+    Previously, each SpinnerGroup started its own thread that slept on the
+    spin interval and redrew its own header, which meant a new thread for
+    every group in the tree and constant contention on the write lock.  Now,
+    groups register with the scheduler when they start and unregister when
+    they stop, and the scheduler advances the frames of all registered groups
+    and renders their headers in a single pass on each tick.
+
+    The scheduler thread is started lazily, the first time a group registers,
+    and then idles while there are no registered groups, so the thread count
+    stays fixed regardless of how large the tree grows.
+
+    The headers are rendered through the root's screen, which rewrites only
+    the rows that changed during the tick, as a single frame.
+
+    [x] NOTE:
+    --------
+    The scheduler `lock` is shared with all of the groups in the tree as their
+    write lock, so that a tick and a group write can never interleave their
+    output.  It is reentrant because a group that is stopping will render its
+    final header while holding it.
+
+    [x] NOTE:
+    --------
+    When a `flush_interval` is provided (batch mode), group writes are queued
+    on the scheduler instead of being rendered by the writing thread, and the
+    scheduler renders all of the lines queued since the last frame every
+    `flush_interval`.  The pacing of the output is then a rendering policy of
+    the scheduler, instead of a cost on the thread producing the lines.
+    """
+
+    def __init__(self, interval, screen, flush_interval=None):
+        self.interval = interval
+        self.flush_interval = flush_interval
+        self.screen = screen
+        self.lock = threading.RLock()
+
+        self._condition = threading.Condition(self.lock)
+        self._groups = []
+
+        # Appending to a deque is thread safe, so queueing a line does not
+        # require the lock.
+        self._queue = collections.deque()
+        self._closed = False
+        self._thread = None
+
+    @property
+    def groups(self):
+        return list(self._groups)
+
+    def is_registered(self, group):
+        return group in self._groups
+
+    def register(self, group):
+        """
+        Registers the group so that its spinner frame is advanced on each tick,
+        starting the scheduler thread if it has not yet been started.
+        """
+        with self._condition:
+            if group in self._groups:
+                return
+
+            self._groups.append(group)
+            self._ensure_thread()
+
+            # The thread only waits without a timeout when there are no groups
+            # registered, so that is the only time it needs to be woken up.
+            if len(self._groups) == 1:
+                self._condition.notify()
+
+    def unregister(self, group):
+        """
+        Removes the group from the scheduler.  Since ticks are performed while
+        holding the lock, once this method returns the group is guaranteed to
+        not be redrawn by the scheduler again.
+        """
+        with self._condition:
+            if group in self._groups:
+                self._groups.remove(group)
+
+    def enqueue(self, group, line):
+        """
+        Queues a line to be rendered for the group on the next flush, without
+        blocking the caller.
+        """
+        self._queue.append((group, line))
+
+        # Nothing will flush the line if there are no active groups.
+        if not self._groups:
+            self.flush()
+
+    def flush(self):
+        """
+        Renders all of the lines queued since the last frame in a single pass.
+        """
+        with self.lock, self.screen.deferred():
+            while self._queue:
+                group, line = self._queue.popleft()
+                group._print(line.format())
+
+    def close(self):
+        with self._condition:
+            self._closed = True
+            self._groups = []
+            self._condition.notify()
+
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join()
+        self._thread = None
+
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._closed = False
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        next_tick = time.monotonic() + self.interval
+
+        with self._condition:
+            while not self._closed:
+                if not self._groups:
+                    self._condition.wait()
+                    next_tick = time.monotonic() + self.interval
+                    continue
+
+                timeout = next_tick - time.monotonic()
+                if self.flush_interval:
+                    timeout = min(timeout, self.flush_interval)
+
+                # Waiting on the condition releases the lock while we sleep, so
+                # groups can write and register/unregister between ticks.
+                self._condition.wait(max(timeout, 0))
+                if self._closed:
+                    break
+
+                if time.monotonic() >= next_tick:
+                    self.tick()
+                    next_tick = time.monotonic() + self.interval
+                else:
+                    self.flush()
+
+    def tick(self):
+        """
+        Renders the lines queued since the last frame and advances the spinner
+        frame for every registered group, rendering all of the changes in a
+        single pass, while holding the lock.
+        """
+        with self.lock, self.screen.deferred():
+            self.flush()
+            for group in self._groups:
+                group._tick()
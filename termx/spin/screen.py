@@ -0,0 +1,141 @@
+import contextlib
+
+from termx import Cursor
+from termx.terminal import Terminal
+
+
+class Screen(object):
+    """
+    Retained model of the rows rendered by a Spinner tree, owned by the root
+    Spinner and shared with all of its groups.
+
+    Rows are addressed by their index relative to the row the cursor was on
+    when the screen was last reset (the origin).  Groups add rows as they write
+    lines and update the row belonging to their header as it animates, which
+    only marks the row as dirty.  When the screen is rendered, only the dirty
+    rows are rewritten, moving the cursor relative to its tracked position, so
+    the cost of a frame depends on what changed and not on how many rows have
+    been written:
+
+    >>> ⠋ Group 1           ===> Row 0 (Dirty on Every Tick)
+    >>>   > Message 1       ===> Row 1
+    >>>   > Message 2       ===> Row 2
+    >>>   ⠋ Group 2         ===> Row 3 (Dirty on Every Tick)
+    >>>     > Message 3     ===> Row 4 (Dirty Until Next Render)
+
+    [x] NOTE:
+    --------
+    Rows that have scrolled above the top of the terminal cannot be reached
+    with relative cursor movement, so any damage to those rows is discarded.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """
+        Forgets all of the retained rows and treats the current line of the
+        cursor as the new origin.
+        """
+        self._rows = []
+        self._dirty = set()
+
+        self._cursor = 0  # Row the Cursor is Currently On
+        self._height = 1  # Number of Rows Physically Present in the Terminal
+        self._deferred = 0
+
+    @property
+    def rows(self):
+        return list(self._rows)
+
+    @property
+    def dirty(self):
+        return sorted(self._dirty)
+
+    def __len__(self):
+        return len(self._rows)
+
+    def add_row(self, text=""):
+        """
+        Adds a row to the bottom of the screen, returning its index.
+        """
+        self._rows.append(text)
+        index = len(self._rows) - 1
+        self._dirty.add(index)
+        return index
+
+    def update_row(self, index, text):
+        """
+        Updates the text of the row at the provided index, marking it as dirty
+        only if the text actually changed.
+        """
+        if self._rows[index] != text:
+            self._rows[index] = text
+            self._dirty.add(index)
+
+    @contextlib.contextmanager
+    def deferred(self):
+        """
+        Defers rendering while the context is active, so that multiple updates
+        (i.e. the headers of all groups in a scheduler tick) are rendered in a
+        single pass when the context exits.
+        """
+        self._deferred += 1
+        try:
+            yield self
+        finally:
+            self._deferred -= 1
+            self.render()
+
+    def render(self):
+        """
+        Rewrites the dirty rows, in order, as a single frame.
+        """
+        if self._deferred or not self._dirty:
+            return
+
+        top = self._height - Terminal.rows()
+
+        damaged = [index for index in sorted(self._dirty) if index >= top]
+        self._dirty.clear()
+
+        if damaged:
+            with Cursor.frame():
+                for index in damaged:
+                    self._move_to(index)
+                    Cursor.carriage_return()
+                    Cursor.overwrite(self._rows[index], newline=False)
+                Cursor.carriage_return()
+
+    def move_to_end(self):
+        """
+        Moves the cursor to the start of the line directly below the last row,
+        after rendering any outstanding damage.  The line the cursor lands on
+        is where the next row added to the screen will be written.
+        """
+        self.render()
+        with Cursor.frame():
+            self._move_to(len(self._rows))
+
+    def release(self):
+        """
+        Moves the cursor below the last row and resets the screen, so that the
+        current line of the cursor becomes the origin of any subsequent rows.
+        """
+        self.move_to_end()
+        self.reset()
+
+    def _move_to(self, index):
+        if index < self._height:
+            delta = index - self._cursor
+            if delta < 0:
+                Cursor.move_up(-delta)
+            else:
+                Cursor.move_down(delta)
+        else:
+            # Moving the cursor down does not scroll the terminal, so rows that
+            # do not physically exist yet have to be created with newlines.
+            Cursor.move_down(self._height - 1 - self._cursor)
+            Cursor.write("\n" * (index - self._height + 1))
+            self._height = index + 1
+        self._cursor = index
@@ -0,0 +1,123 @@
+import os
+import signal
+import sys
+import threading
+import time
+
+
+class Terminal:
+    """
+    Cached geometry (columns and rows) of the terminal.
+
+    Querying the size of the terminal is a syscall (or worse, a subprocess in
+    the case of `stty size`), which adds up when it is done for every log record
+    or spinner line.  Instead, the size is queried once and cached until the
+    terminal is resized:
+
+    >>> Terminal.columns()
+    >>> 120
+
+    When the size is first queried from the main thread, a SIGWINCH handler is
+    installed that invalidates the cached size whenever the terminal is resized.
+    If signals are not available (i.e. on Windows, or if the size is only ever
+    queried from other threads), the cached size expires after `ttl` seconds
+    instead.
+
+    [x] NOTE:
+    --------
+    The size is read from the first of STDOUT, STDERR and STDIN that is attached
+    to a terminal, so that the size is still available when only some of the
+    streams are redirected.  If none of them are attached to a terminal, the
+    `fallback` size is used.  Like `shutil.get_terminal_size`, the COLUMNS and
+    LINES environment variables take precedence.
+    """
+
+    fallback = os.terminal_size((80, 24))
+    ttl = 1.0
+
+    _size = None
+    _expires = 0.0
+    _handling = False
+    _lock = threading.Lock()
+
+    @classmethod
+    def size(cls):
+        size = cls._size
+        if size is None or (not cls._handling and time.monotonic() >= cls._expires):
+            size = cls.refresh()
+        return size
+
+    @classmethod
+    def columns(cls):
+        return cls.size().columns
+
+    @classmethod
+    def rows(cls):
+        return cls.size().lines
+
+    @classmethod
+    def invalidate(cls):
+        cls._size = None
+
+    @classmethod
+    def refresh(cls):
+        with cls._lock:
+            cls._install_handler()
+            size = cls._query()
+            cls._size = size
+            cls._expires = time.monotonic() + cls.ttl
+        return size
+
+    @classmethod
+    def _query(cls):
+        try:
+            columns = int(os.environ['COLUMNS'])
+        except (KeyError, ValueError):
+            columns = 0
+        try:
+            lines = int(os.environ['LINES'])
+        except (KeyError, ValueError):
+            lines = 0
+
+        if columns <= 0 or lines <= 0:
+            size = cls._query_streams()
+            if columns <= 0:
+                columns = size.columns
+            if lines <= 0:
+                lines = size.lines
+        return os.terminal_size((columns, lines))
+
+    @classmethod
+    def _query_streams(cls):
+        for stream in (sys.__stdout__, sys.__stderr__, sys.__stdin__):
+            try:
+                size = os.get_terminal_size(stream.fileno())
+            except (AttributeError, ValueError, OSError):
+                continue
+            if size.columns > 0 and size.lines > 0:
+                return size
+        return cls.fallback
+
+    @classmethod
+    def _install_handler(cls):
+        """
+        Installs the SIGWINCH handler, chaining to any previously installed
+        handler.  Signal handlers can only be installed from the main thread.
+        """
+        if cls._handling or not hasattr(signal, 'SIGWINCH'):
+            return
+        if threading.current_thread() is not threading.main_thread():
+            return
+
+        previous = signal.getsignal(signal.SIGWINCH)
+
+        def handler(signum, frame):
+            cls.invalidate()
+            if callable(previous):
+                previous(signum, frame)
+
+        try:
+            signal.signal(signal.SIGWINCH, handler)
+        except (ValueError, OSError):
+            return
+        cls._handling = True
@@ -0,0 +1,44 @@
+import copy
+import pickle
+
+import pytest
+
+from termx.exceptions import ColorLibError
+from termx.fmt import color, highlight
+
+
+def test_color_resolution_is_cached():
+    color.cache_clear()
+
+    first = color('#28A745', depth=256)
+    info = color.cache_info()
+    assert (info.hits, info.misses) == (0, 1)
+
+    second = color('#28A745', depth=256)
+    info = color.cache_info()
+    assert (info.hits, info.misses) == (1, 1)
+    assert first.ansi_codes == second.ansi_codes == (38, 5, 35)
+
+    # The cache is keyed by the class and depth, not only the value.
+    assert highlight('#28A745', depth=256).ansi_codes == (48, 5, 35)
+    assert color('#28A745', depth=24).ansi_codes == (38, 2, 40, 167, 69)
+    assert color.cache_info().misses == 3
+
+
+def test_colors_are_immutable_flyweights():
+    c = color('red', depth=8)
+    assert color(c) is c
+    assert c.copy() is c
+    assert copy.deepcopy(c) is c
+    assert pickle.loads(pickle.dumps(c)) is c
+
+    # Colors are interned by their class and ANSI codes.
+    assert color('red', depth=8) is c
+    assert color([31]) is c
+    assert highlight('red', depth=8) is not c
+    assert hash(c) == hash(color([31]))
+
+    for attr in ('ansi_codes', '_ansi_codes', '_raw'):
+        with pytest.raises(ColorLibError):
+            setattr(c, attr, [32])
+    assert c.ansi_codes == (31, )
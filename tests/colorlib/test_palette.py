@@ -0,0 +1,38 @@
+import pytest
+
+from termx.exceptions import InvalidColor
+from termx.fmt import color, highlight
+from termx.fmt.colorlib.palette import resolve_color
+
+
+# Expected codes are those previously generated by plumbum for the colors in
+# the default settings.
+@pytest.mark.parametrize('value,full,true,simple,basic', [
+    ('#28A745', (38, 5, 35), (38, 2, 40, 167, 69), (32, ), (36, )),
+    ('DarkOliveGreen3', (38, 5, 107), (38, 2, 135, 175, 95), (90, ), (37, )),
+    ('Red1', (38, 5, 9), (38, 2, 255, 0, 0), (91, ), (31, )),
+    ('Gold3', (38, 5, 142), (38, 2, 175, 175, 0), (33, ), (33, )),
+    ('RoyalBlue1', (38, 5, 63), (38, 2, 95, 95, 255), (94, ), (37, )),
+    ('#151515', (38, 5, 233), (38, 2, 21, 21, 21), (30, ), (30, )),
+    ('#D7D7D7', (38, 5, 188), (38, 2, 215, 215, 215), (37, ), (37, )),
+])
+def test_resolve_color(value, full, true, simple, basic):
+    assert resolve_color(value, 256) == full
+    assert resolve_color(value, 24) == true
+    assert resolve_color(value, 16) == simple
+    assert resolve_color(value, 8) == basic
+
+
+def test_resolve_color_names_and_background():
+    assert resolve_color('red', 256) == (38, 5, 1)
+    assert resolve_color('Dark Gray', 16) == (90, )
+    assert resolve_color('light_blue', 8, background=True) == (44, )
+    assert resolve_color('levelname', 256) is None
+    assert resolve_color('#12345', 256) is None
+
+
+def test_color_uses_resolver():
+    assert color('CornflowerBlue', depth=256).ansi_codes == (38, 5, 69)
+    assert highlight('#000000', depth=8).ansi_codes == (40, )
+    with pytest.raises(InvalidColor):
+        color('levelname', depth=256)
@@ -1,5 +1,7 @@
+import contextlib
+
 import pytest
-from termx import settings
+from termx import Cursor, settings
 
 
 @pytest.fixture
@@ -7,5 +9,24 @@ def override_settings():
     """
     Use config to update settings instead of settings.configure() because config
     handles the recursion in the nested style fields.
+
+    The settings are overridden until the end of the test.
+    """
+    with contextlib.ExitStack() as stack:
+        def override(*args, **kwargs):
+            stack.enter_context(settings.override(*args, **kwargs))
+        yield override
+
+
+@pytest.fixture
+def cursor_output():
+    """
+    Collects the output written by the Cursor instead of writing it to stdout.
     """
-    return settings.override
+    written = []
+    original = Cursor.output
+    Cursor.output = written.append
+    try:
+        yield written
+    finally:
+        Cursor.output = original
@@ -30,12 +30,12 @@ def test_format_with_style(override_settings):
     def initialize_with_string():
         fmt = Format(color='black', styles=['bold', 'underline'])
         value = fmt('foo')
-        assert value == '\x1b[1;4m\x1b[38;5;15m\x1b[30mfoo\x1b[0m\x1b[0m\x1b[0m'
+        assert value == '\x1b[1;4m\x1b[30mfoo\x1b[0m\x1b[0m'
 
     def initialize_with_code():
         fmt = Format(color='black', styles=[1, 4])
         value = fmt('foo')
-        assert value == '\x1b[1;4m\x1b[38;5;15m\x1b[30mfoo\x1b[0m\x1b[0m\x1b[0m'
+        assert value == '\x1b[1;4m\x1b[30mfoo\x1b[0m\x1b[0m'
 
     initialize_with_string()
     initialize_with_code()
@@ -47,23 +47,23 @@ def test_wraps_text(override_settings):
     # Initializing With Wrapper
     fmt = Format(color='blue', wrapper="[%s]")
     value = fmt('foo')
-    assert value == '[\x1b[38;5;15m\x1b[34mfoo\x1b[0m\x1b[0m]'
+    assert value == '[\x1b[34mfoo\x1b[0m]'
 
     # Initializing With Wrapper & Formatting With Wrapper
     fmt = Format(color='blue', wrapper="[%s]", format_with_wrapper=True)
     value = fmt('foo')
-    assert value == '\x1b[38;5;15m\x1b[34m[foo]\x1b[0m\x1b[0m'
+    assert value == '\x1b[34m[foo]\x1b[0m'
 
     # Calling with Wrapper
     fmt = Format(color='blue')
     value = fmt('bar', wrapper="[%s]")
-    assert value == '[\x1b[38;5;15m\x1b[34mbar\x1b[0m\x1b[0m]'
+    assert value == '[\x1b[34mbar\x1b[0m]'
     assert fmt.wrapper is None
 
     # Calling with Wrapper and Format w Wrapper
     fmt = Format(color='blue')
     value = fmt('bar', wrapper="[%s]", format_with_wrapper=True)
-    assert value == '\x1b[38;5;15m\x1b[34m[bar]\x1b[0m\x1b[0m'
+    assert value == '\x1b[34m[bar]\x1b[0m'
     assert fmt.wrapper is None
     assert fmt.format_with_wrapper is False
 
@@ -90,21 +90,21 @@ def test_decorates(override_settings):
     # Test Decorates
     fmt = Format(color='blue', styles=['bold'])
     value = fmt('foo')
-    assert value == '\x1b[1m\x1b[38;5;15m\x1b[34mfoo\x1b[0m\x1b[0m\x1b[0m'
+    assert value == '\x1b[1m\x1b[34mfoo\x1b[0m\x1b[0m'
 
     # Test Add/Remove Decoration on Call
     value = fmt('foo', styles=['underline', 'bold'])
-    assert value == '\x1b[1;4m\x1b[38;5;15m\x1b[34mfoo\x1b[0m\x1b[0m\x1b[0m'
+    assert value == '\x1b[1;4m\x1b[34mfoo\x1b[0m\x1b[0m'
 
     # Test Singular Kwarg
     fmt = Format(color='blue', style='bold')
     value = fmt('foo')
-    assert value == '\x1b[1m\x1b[38;5;15m\x1b[34mfoo\x1b[0m\x1b[0m\x1b[0m'
+    assert value == '\x1b[1m\x1b[34mfoo\x1b[0m\x1b[0m'
 
     # Test Case Insensitive
     fmt = Format(color='blue', styles=['Bold'])
     value = fmt('foo')
-    assert value == '\x1b[1m\x1b[38;5;15m\x1b[34mfoo\x1b[0m\x1b[0m\x1b[0m'
+    assert value == '\x1b[1m\x1b[34mfoo\x1b[0m\x1b[0m'
 
 
 def test_with_icon(override_settings):
@@ -113,10 +113,32 @@ def test_with_icon(override_settings):
     # Test Decorates
     fmt = Format(color='blue', styles=['bold'], icon="[i]", icon_after=True)
     value = fmt('foo')
-    assert value == '\x1b[1m\x1b[38;5;15m\x1b[34m[i] foo\x1b[0m\x1b[0m\x1b[0m'
+    assert value == '\x1b[1m\x1b[34m[i] foo\x1b[0m\x1b[0m'
 
     # Format With Icon on Call
     fmt = Format(color='blue', styles=['bold'], icon="[i]", icon_before=True)
     value = fmt('foo', format_with_icon=False)
-    assert value == '[i] \x1b[1m\x1b[38;5;15m\x1b[34mfoo\x1b[0m\x1b[0m\x1b[0m'
+    assert value == '[i] \x1b[1m\x1b[34mfoo\x1b[0m\x1b[0m'
     assert fmt.format_with_icon is True
+
+
+def test_compiled_format_matches_overriding():
+    fmt = Format(color='red', highlight='blue', styles=['bold'], icon='✔',
+        wrapper="[%s]")
+    assert fmt('foo') == fmt._call_overriding('foo')
+    assert fmt('foo', underline=True) == fmt._call_overriding('foo', underline=True)
+    assert fmt('foo', format_with_icon=False) == fmt._call_overriding('foo', format_with_icon=False)
+
+    # Mutating the instance invalidates the compiled plan.
+    fmt.add_style('underline')
+    fmt.wrapper = "(%s)"
+    assert fmt('foo') == fmt._call_overriding('foo')
+    assert fmt.wrapper == "(%s)"
+
+
+def test_format_partition():
+    fmt = Format(color='red', icon='X', format_with_icon=False, wrapper='[%s]')
+    before, inside, after = fmt.partition('text')
+    prefix, suffix = fmt.ansi_bounds
+    assert before + prefix + inside + suffix + after == fmt('text')
+    assert fmt.plain('text') == 'X [text]'
@@ -1,8 +1,7 @@
 import logging
 import pytest
 
-from termx import colors
-from termx.core.formatting import Format
+from termx.fmt import Format, color
 
 
 level = 'info'
@@ -64,6 +63,6 @@ def level_callable():
 def record():
     return _make_record(extra={
         'color_string': 'blue',
-        'color': colors.red,
-        'format': Format(colors.blue, colors.bold)
+        'color': color('red'),
+        'format': Format(color='blue', styles=['bold'])
     })
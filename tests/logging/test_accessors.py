@@ -0,0 +1,67 @@
+import pytest
+
+from termx.fmt import color as Color
+from termx.logging.api import Segment
+from termx.logging.library.utils import (
+    AttributeAccessor, compile_obj_attribute, get_format, get_obj_attribute,
+    get_record_attribute, string_format_spec)
+
+
+@pytest.mark.parametrize('param', [
+    'name',
+    'missing',
+    'object.value1.value1',
+    'object.value2',
+    'object.missing.value',
+    'data.key',
+    'data.nested.key',
+    'data.nested.keys',
+    'object..value2',
+    'object.',
+])
+def test_compiled_attribute_matches(make_mock_object, make_record, param):
+    obj = make_mock_object({'value1': {'value1': 'foo', 'value2': 'bar'}, 'value2': 'baz'})
+    record = make_record(extra={
+        'object': obj,
+        'data': {'key': 'value', 'nested': {'key': 'value'}},
+    })
+    assert compile_obj_attribute(param)(record) == get_obj_attribute(record, param)
+
+
+def test_attribute_accessor(make_mock_object, make_record):
+    obj = make_mock_object({'exception': {'message': 'Timeout'}})
+    record = make_record(extra={'object': obj})
+
+    accessor = AttributeAccessor(['object.exception.status', 'object.exception.message'])
+    assert accessor(record) == 'Timeout'
+    assert AttributeAccessor('object.missing')(record) is None
+    assert get_record_attribute(record, accessor) == 'Timeout'
+    assert get_record_attribute(record, 'name') == 'name'
+
+
+def test_segment_compiles_declared_attributes(make_record):
+    segment = Segment(attrs=['missing', 'name'])
+    assert isinstance(segment._accessor, AttributeAccessor)
+    assert segment._accessor.params == ('missing', 'name')
+    assert segment.value(make_record()) == 'name'
+
+    # Values returned by callables are looked up as attributes without being
+    # compiled into a cached accessor.
+    segment = Segment(value=lambda record: 'name')
+    assert segment.value(make_record()) == 'name'
+    segment = Segment(value=lambda record: 'Some message')
+    assert segment.value(make_record()) == 'Some message'
+
+
+def test_string_format_spec_is_classified_once(make_record):
+    record = make_record(extra={'levelcolor': 'cyan'})
+
+    color_format = get_format(record, 'red')
+    assert color_format is get_format(make_record(), 'red')
+    assert color_format.color == Color('red')
+
+    fmt, accessor = string_format_spec('levelcolor')
+    assert fmt is None
+    assert accessor(record) == 'cyan'
+    assert get_format(record, 'levelcolor').color == Color('cyan')
+    assert get_format(make_record(), 'levelcolor') is None
@@ -0,0 +1,98 @@
+import io
+import logging
+import time
+
+from termx.logging import BufferedTermxHandler
+
+
+class CountingStream(io.StringIO):
+
+    def __init__(self):
+        super(CountingStream, self).__init__()
+        self.writes = 0
+
+    def write(self, data):
+        self.writes += 1
+        return super(CountingStream, self).write(data)
+
+
+def make_info_record(make_record, message, level=logging.INFO):
+    record = make_record(message=message)
+    record.levelno = level
+    return record
+
+
+def make_handler(**kwargs):
+    stream = CountingStream()
+    kwargs.setdefault('max_delay', None)
+    handler = BufferedTermxHandler(
+        format_string=lambda record: record.msg,
+        stream=stream,
+        **kwargs
+    )
+    return handler, stream
+
+
+def test_buffered_handler_flushes_at_record_limit(make_record):
+    handler, stream = make_handler(max_records=10)
+    for i in range(25):
+        handler.handle(make_info_record(make_record, "Message %s" % i))
+
+    assert stream.writes == 2
+    assert stream.getvalue().splitlines() == ["Message %s" % i for i in range(20)]
+
+    handler.flush()
+    assert stream.writes == 3
+    assert stream.getvalue().splitlines() == ["Message %s" % i for i in range(25)]
+    handler.close()
+
+
+def test_buffered_handler_flushes_at_byte_limit(make_record):
+    handler, stream = make_handler(max_bytes=20)
+    handler.handle(make_info_record(make_record, "a" * 10))
+    assert stream.writes == 0
+    handler.handle(make_info_record(make_record, "b" * 10))
+    assert stream.getvalue() == "a" * 10 + "\n" + "b" * 10 + "\n"
+    handler.close()
+
+
+def test_buffered_handler_counts_encoded_bytes(make_record):
+    # Each line is 5 characters but 9 bytes in UTF-8.
+    handler, stream = make_handler(max_bytes=20)
+    handler.handle(make_info_record(make_record, "\u00e9\u00e9\u00e9\u00e9"))
+    handler.handle(make_info_record(make_record, "\u00e9\u00e9\u00e9\u00e9"))
+    assert stream.writes == 0
+
+    handler.handle(make_info_record(make_record, "\u00e9\u00e9\u00e9\u00e9"))
+    assert stream.writes == 1
+    handler.close()
+
+
+def test_buffered_handler_flushes_on_error(make_record):
+    handler, stream = make_handler()
+    handler.handle(make_info_record(make_record, "Info"))
+    assert stream.getvalue() == ""
+
+    handler.handle(make_info_record(make_record, "Error", level=logging.ERROR))
+    assert stream.getvalue() == "Info\nError\n"
+    assert stream.writes == 1
+    handler.close()
+
+
+def test_buffered_handler_flushes_after_delay(make_record):
+    handler, stream = make_handler(max_delay=0.05)
+    handler.handle(make_info_record(make_record, "Message"))
+    assert stream.getvalue() == ""
+
+    deadline = time.monotonic() + 2
+    while not stream.getvalue() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert stream.getvalue() == "Message\n"
+    handler.close()
+
+
+def test_buffered_handler_flushes_on_close(make_record):
+    handler, stream = make_handler()
+    handler.handle(make_info_record(make_record, "Message"))
+    handler.close()
+    assert stream.getvalue() == "Message\n"
@@ -0,0 +1,38 @@
+from termx.fmt import Format
+from termx.logging.api import Segment, Line, Lines, LogFormat
+from termx.logging.library.base import RenderContext
+
+
+def test_render_context_resolves_once(make_record):
+    values, formats = [], []
+
+    def value(record):
+        values.append(record)
+        return "Value"
+
+    def fmt(record):
+        formats.append(record)
+        return Format(color='red')
+
+    log_format = LogFormat(Lines(Line(Segment(value=value, fmt=fmt), Segment(attrs='missing'))))
+    record = make_record()
+
+    log_format._call_uncompiled(record)
+    assert (len(values), len(formats)) == (1, 1)
+
+    # Each render resolves the values again.
+    log_format(record)
+    assert (len(values), len(formats)) == (2, 2)
+
+
+def test_render_context_only_applies_to_record(make_record):
+    record, other = make_record(), make_record()
+    segment = Segment(attrs='msg')
+
+    with RenderContext.rendering(record) as context:
+        assert RenderContext.current(other) is None
+        assert segment.value(record) == "Test Message"
+        other.msg = "Other Message"
+        assert segment.value(other) == "Other Message"
+        assert context.values == {segment: "Test Message"}
+    assert RenderContext.current(record) is None
@@ -0,0 +1,124 @@
+import io
+import logging
+import time
+
+import pytest
+
+from termx.ext.utils import escape_ansi_string
+from termx.logging import (
+    TermxHandler, AsyncTermxHandler, BufferedTermxHandler, RecordDeduplicator)
+
+
+def make_record(message, created, level=logging.WARNING, name='test-logger'):
+    record = logging.makeLogRecord({
+        'name': name,
+        'msg': message,
+        'levelno': level,
+        'levelname': logging.getLevelName(level),
+    })
+    record.created = created
+    return record
+
+
+def make_handler(factory=TermxHandler, **kwargs):
+    stream = io.StringIO()
+    handler = factory(
+        format_string=lambda record: record.getMessage(),
+        stream=stream,
+        dedup=RecordDeduplicator(**kwargs),
+    )
+    return handler, stream
+
+
+def lines(stream):
+    return [line for line in escape_ansi_string(stream.getvalue()).splitlines() if line]
+
+
+def test_repeats_are_collapsed():
+    handler, stream = make_handler(window=2.0)
+    for i in range(4812):
+        handler.handle(make_record("Connection refused", created=i * 2.0 / 4812))
+    assert lines(stream) == ["Connection refused"]
+
+    # A record after the window ends emits the summary of the window first.
+    handler.handle(make_record("Connection refused", created=2.5))
+    assert lines(stream) == [
+        "Connection refused",
+        "Connection refused (repeated 4,811× in 2.0s)",
+        "Connection refused",
+    ]
+    handler.close()
+    assert len(lines(stream)) == 3
+
+
+def test_distinct_records_are_not_collapsed():
+    handler, stream = make_handler()
+    handler.handle(make_record("Message %s", created=0.0))
+    handler.handle(make_record("Message", created=0.1, level=logging.ERROR))
+    handler.handle(make_record("Other", created=0.2))
+    assert lines(stream) == ["Message %s", "Message", "Other"]
+
+
+def test_key_attributes():
+    handler, stream = make_handler(key=('levelno', ))
+    handler.handle(make_record("One", created=0.0))
+    handler.handle(make_record("Two", created=0.1))
+    handler.close()
+    assert lines(stream) == ["One", "One (repeated 1× in 0.1s)"]
+
+
+def test_windows_are_bounded():
+    handler, stream = make_handler(max_keys=2)
+    for i in range(10):
+        handler.handle(make_record("Message %s" % i, created=0.0))
+        handler.handle(make_record("Message %s" % i, created=0.5))
+    assert len(handler.dedup._windows) == 2
+    handler.close()
+
+    # The summaries of the oldest windows are emitted early.
+    assert lines(stream)[:4] == [
+        "Message 0",
+        "Message 1",
+        "Message 0 (repeated 1× in 0.5s)",
+        "Message 2",
+    ]
+    assert sorted(lines(stream)) == sorted(
+        line for i in range(10)
+        for line in ("Message %s" % i, "Message %s (repeated 1× in 0.5s)" % i)
+    )
+
+
+def test_buffered_handler_collapses_repeats():
+    # The handler is flushed by its own thread, which closes the windows that
+    # have ended by the current time.
+    start = time.time()
+    handler, stream = make_handler(factory=BufferedTermxHandler, window=60.0)
+    for i in range(100):
+        handler.handle(make_record("Connection refused", created=start + i / 100))
+    handler.close()
+    assert lines(stream) == [
+        "Connection refused",
+        "Connection refused (repeated 99× in 1.0s)",
+    ]
+
+
+@pytest.mark.parametrize('factory', [TermxHandler, AsyncTermxHandler, BufferedTermxHandler])
+def test_flush_emits_ended_windows(factory):
+    handler, stream = make_handler(factory=factory, window=2.0)
+    start = time.time() - 1.5
+    for i in range(100):
+        handler.handle(make_record("Connection refused", created=start + i / 100))
+
+    # The window has not ended yet.
+    handler.flush()
+    assert lines(stream) == ["Connection refused"]
+
+    time.sleep(0.6)
+    handler.flush()
+    assert lines(stream) == [
+        "Connection refused",
+        "Connection refused (repeated 99× in 1.0s)",
+    ]
+    assert not handler.dedup._windows
+    handler.close()
+    assert len(lines(stream)) == 2
@@ -0,0 +1,122 @@
+import io
+import logging
+import threading
+import time
+
+import pytest
+
+from termx.exceptions import LoggingError
+from termx.logging import AsyncTermxHandler
+
+
+def make_handler(format_string=None, **kwargs):
+    stream = io.StringIO()
+    handler = AsyncTermxHandler(
+        format_string=format_string or (lambda record: record.msg),
+        stream=stream,
+        **kwargs
+    )
+    return handler, stream
+
+
+def test_async_handler_writes_in_order(make_record):
+    handler, stream = make_handler()
+    for i in range(100):
+        handler.handle(make_record(message="Message %s" % i))
+    handler.flush()
+
+    assert stream.getvalue().splitlines() == ["Message %s" % i for i in range(100)]
+    assert handler.processed == 100
+    assert handler.queue_depth == 0
+    handler.close()
+
+
+def test_async_handler_merges_arguments(make_record):
+    handler, stream = make_handler()
+    args = {'count': 1}
+    record = logging.makeLogRecord({'msg': "Count %(count)s", 'args': args})
+    handler.handle(record)
+    args['count'] = 2
+    handler.close()
+    assert stream.getvalue() == "Count 1\n"
+
+
+def test_async_handler_does_not_modify_record():
+    handler, stream = make_handler()
+    args = {'count': 1}
+    record = logging.makeLogRecord({'msg': "Count %(count)s", 'args': args})
+    handler.handle(record)
+    handler.close()
+
+    assert record.msg == "Count %(count)s"
+    assert record.args is args
+    assert stream.getvalue() == "Count 1\n"
+
+
+@pytest.mark.parametrize('overflow,expected', [
+    ('drop-newest', ["Message 0", "Message 1", "Message 2"]),
+    ('drop-oldest', ["Message 0", "Message 3", "Message 4"]),
+])
+def test_async_handler_overflow(make_record, overflow, expected):
+    started, release = threading.Event(), threading.Event()
+
+    def format_string(record):
+        # Hold the handler thread on the first record so the queue fills up.
+        if record.msg == "Message 0":
+            started.set()
+            release.wait()
+        return record.msg
+
+    handler, stream = make_handler(format_string, maxsize=2, overflow=overflow)
+    handler.handle(make_record(message="Message 0"))
+    started.wait()
+
+    for i in range(1, 5):
+        handler.handle(make_record(message="Message %s" % i))
+    assert handler.queue_depth == 2
+    assert handler.dropped == 2
+
+    release.set()
+    handler.close()
+    assert stream.getvalue().splitlines() == expected
+
+
+def test_async_handler_invalid_overflow():
+    with pytest.raises(LoggingError):
+        make_handler(overflow='invalid')
+
+
+def test_async_handler_close_wakes_blocked_producer(make_record):
+    started, release = threading.Event(), threading.Event()
+
+    def format_string(record):
+        if record.msg == "Message 0":
+            started.set()
+            release.wait()
+        return record.msg
+
+    handler, stream = make_handler(format_string, maxsize=1, overflow='block')
+    handler.handle(make_record(message="Message 0"))
+    started.wait()
+    handler.handle(make_record(message="Message 1"))
+
+    producer = threading.Thread(target=handler.handle, args=(make_record(message="Message 2"), ))
+    closer = threading.Thread(target=handler.close)
+    try:
+        producer.start()
+        time.sleep(0.1)
+        assert producer.is_alive()
+
+        # The blocked producer writes the record itself once the handler is
+        # closed, since the handler thread may already have exited by then.
+        closer.start()
+        deadline = time.time() + 5
+        while not stream.getvalue() and time.time() < deadline:
+            time.sleep(0.01)
+        assert stream.getvalue() == "Message 2\n"
+    finally:
+        release.set()
+        producer.join()
+        closer.join()
+
+    assert sorted(stream.getvalue().splitlines()) == ["Message 0", "Message 1", "Message 2"]
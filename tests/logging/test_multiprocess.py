@@ -0,0 +1,94 @@
+import logging
+import multiprocessing
+
+from termx.fmt import Format
+from termx.logging import TermxHandler, TermxLogSink, TermxLogListener
+from termx.logging.api import Segment, Line, Lines, LogFormat
+
+
+class Context(object):
+
+    def __init__(self, user):
+        self.user = user
+
+
+class Collector(logging.Handler):
+
+    def __init__(self):
+        super(Collector, self).__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+def worker(address, index, count):
+    logger = logging.getLogger('termx-multiprocess-%s' % index)
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+
+    sink = TermxLogSink(address)
+    logger.addHandler(sink)
+    for i in range(count):
+        logger.info("Worker %s: %s of %s", index, i, count, extra={
+            'context': Context(user='user-%s' % index),
+            'fmt': Format(color='red'),
+        })
+    try:
+        raise ValueError("Failed")
+    except ValueError:
+        logger.exception("Worker %s: Failed", index)
+    sink.close()
+
+
+def run_workers(*handlers, workers=3, count=20):
+    listener = TermxLogListener(*handlers)
+    listener.start()
+
+    context = multiprocessing.get_context('spawn')
+    processes = [
+        context.Process(target=worker, args=(listener.address, i, count))
+        for i in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    listener.stop()
+
+
+def test_listener_preserves_order_and_extras():
+    collector = Collector()
+    run_workers(collector)
+
+    assert len(collector.records) == 63
+    for index in range(3):
+        records = [r for r in collector.records if r.name == 'termx-multiprocess-%s' % index]
+        assert [r.getMessage() for r in records] == (
+            ["Worker %s: %s of 20" % (index, i) for i in range(20)]
+            + ["Worker %s: Failed" % index]
+        )
+        assert all(r.context.user == 'user-%s' % index for r in records[:-1])
+        # Format objects are never sent to the parent process.
+        assert all(r.fmt is None for r in records[:-1])
+        assert "ValueError: Failed" in records[-1].exc_text
+
+
+def test_listener_renders_log_format(tmp_path):
+    path = tmp_path / 'output.log'
+    log_format = LogFormat(Lines(Line(
+        Segment(attrs='context.user'),
+        Segment(attrs='msg'),
+    )))
+    handler = TermxHandler(
+        handler_cls=logging.FileHandler,
+        format_string=log_format,
+        filename=str(path),
+    )
+    run_workers(handler, workers=2, count=5)
+    handler.close()
+
+    output = path.read_text()
+    for index in range(2):
+        for i in range(5):
+            assert "user-%s Worker %s: %s of 5" % (index, index, i) in output
@@ -0,0 +1,94 @@
+from termx import settings
+from termx.fmt import Format
+from termx.logging.api import Segment, Line, Lines, DynamicLines, LogFormat, Label
+
+
+class Items(DynamicLines):
+
+    def dynamic_children(self, record):
+        for item in getattr(record, 'items', []):
+            yield Line(Segment(value=item, color='blue'), decoration={'prefix': '-'})
+
+
+def make_log_format(width=100):
+    return LogFormat(
+        Lines(
+            Line(
+                Segment(attrs='levelname', fmt=Format(color='red', styles=['bold'])),
+                Segment(attrs='name', color='levelcolor'),
+                Segment(attrs='msg', fmt=lambda record: Format(color='green')),
+                decoration={'prefix': {'char': '>', 'color': 'levelcolor'}, 'indent': 1},
+            ),
+            Line(
+                Segment(
+                    label=Label(value='Status', fmt=Format(color='#336699')),
+                    attrs='status',
+                    color='Gold3',
+                ),
+                Segment(label=Label(attrs='name'), attrs='missing'),
+                decoration={'prefix': {'char': '>', 'color': 'Grey58'}, 'suffix': '<'},
+            ),
+            header=lambda record: "Header %s" % record.levelname,
+            lines_above=1,
+            decoration={'indent': 2},
+        ),
+        Lines(Line(Segment(attrs='missing'))),
+        Items(),
+        width=width,
+    )
+
+
+def test_compiled_log_format_matches_uncompiled(make_record):
+    records = [
+        make_record(),
+        make_record(message="Message " * 30, extra={'levelcolor': 'cyan', 'status': 404}),
+        make_record(extra={'levelcolor': Format(color='red'), 'items': ['a', 'b' * 60]}),
+    ]
+    for width in (100, 30):
+        compiled, uncompiled = make_log_format(width), make_log_format(width)
+        for record in records:
+            assert compiled(record) == uncompiled._call_uncompiled(record)
+
+
+def test_compiled_log_format_evaluates_values_once(make_record):
+    calls = []
+
+    def value(record):
+        calls.append(record)
+        return "Value"
+
+    log_format = LogFormat(Lines(Line(Segment(value=value), Segment(attrs='missing'))))
+    log_format(make_record())
+    assert len(calls) == 1
+
+
+def test_compiled_log_format_recompiled_when_configured(make_record):
+    log_format = make_log_format()
+    record = make_record(extra={'status': 200})
+    log_format(record)
+
+    settings.configure(COLOR_DEPTH=8)
+    try:
+        assert '\x1b[37m>' in log_format(record)
+        assert log_format(record) == log_format._call_uncompiled(record)
+        assert log_format.render(record).encode('ansi') == log_format(record)
+    finally:
+        settings.configure(COLOR_DEPTH=256)
+    assert log_format(record) == log_format._call_uncompiled(record)
+
+
+def test_compiled_log_format_in_override(make_record):
+    log_format = make_log_format()
+    record = make_record(extra={'status': 200})
+    expected = log_format._call_uncompiled(record)
+    assert log_format(record) == expected
+    plan = log_format._plan
+
+    with settings.override(COLOR_DEPTH=8):
+        assert '\x1b[37m>' in log_format(record)
+        assert log_format(record) == log_format._call_uncompiled(record)
+        assert log_format.render(record).encode('ansi') == log_format(record)
+
+    # The plan for the settings outside of the override is not recompiled.
+    assert log_format(record) == expected
+    assert log_format._plan is plan
@@ -0,0 +1,116 @@
+import io
+import json
+import logging
+
+import pytest
+
+from termx.exceptions import LoggingError
+from termx.ext.utils import escape_ansi_string
+from termx.fmt import Format
+from termx.logging import TermxHandler
+from termx.logging.api import Segment, Line, Lines, LogFormat, Label
+from termx.logging.spans import Span, SpanWrapper
+
+
+def make_log_format(value=None):
+    return LogFormat(
+        Lines(
+            Line(
+                Segment(attrs='levelname', fmt=Format(color='red', styles=['bold'])),
+                Segment(attrs='name', color='levelcolor'),
+                Segment(attrs='msg', fmt=Format(color='green', wrapper='(%s)')),
+                decoration={'prefix': {'char': '>', 'color': 'levelcolor'}, 'indent': 1},
+            ),
+            Line(
+                Segment(label=Label(value='Status', color='blue'), attrs='status', color='blue'),
+                Segment(label=Label(value='Value'), value=value or 'Constant'),
+                decoration={'suffix': '<'},
+            ),
+            header=lambda record: Format(color='red')("Header"),
+        ),
+        width=200,
+    )
+
+
+def test_render_ansi_matches_log_format(make_record):
+    record = make_record(extra={'levelcolor': 'cyan', 'status': 404})
+    log_format = make_log_format()
+    assert log_format.render(record).encode('ansi') == make_log_format()(record)
+
+
+def test_render_plain(make_record):
+    record = make_record(extra={'levelcolor': 'cyan', 'status': 404})
+    rendered = make_log_format().render(record)
+    plain = rendered.encode('plain')
+    assert '\x1b' not in plain
+    assert plain == escape_ansi_string(rendered.encode('ansi'))
+    assert plain.splitlines() == [
+        "",
+        "",
+        "Header",
+        ">  INFO name (Test Message)",
+        "Status: 404 Value: Constant<",
+    ]
+
+
+def test_render_json(make_record):
+    record = make_record(extra={'levelcolor': 'cyan', 'status': 404})
+    document = json.loads(make_log_format().render(record).encode('json'))
+    assert document['levelname'] == 'INFO'
+    assert document['segments'] == [
+        {'label': None, 'value': 'INFO'},
+        {'label': None, 'value': 'name'},
+        {'label': None, 'value': 'Test Message'},
+        {'label': 'Status', 'value': 404},
+        {'label': 'Value', 'value': 'Constant'},
+    ]
+
+
+def test_render_shared_between_sinks(make_record):
+    calls = []
+
+    def value(record):
+        calls.append(record)
+        return "Value"
+
+    log_format = make_log_format(value=value)
+    terminal, text = io.StringIO(), io.StringIO()
+    logger = logging.getLogger('termx-test-sinks')
+    logger.propagate = False
+    logger.addHandler(TermxHandler(format_string=log_format, sink='ansi', stream=terminal))
+    logger.addHandler(TermxHandler(format_string=log_format, sink='plain', stream=text))
+
+    logger.warning("Message", extra={'levelcolor': 'cyan', 'status': 404})
+    assert len(calls) == 1
+    assert '\x1b' in terminal.getvalue()
+    assert text.getvalue() == escape_ansi_string(terminal.getvalue())
+
+
+def test_invalid_sink():
+    with pytest.raises(LoggingError):
+        TermxHandler(format_string=make_log_format(), sink='html')
+    with pytest.raises(LoggingError):
+        TermxHandler(format_string=lambda record: record.msg, sink='plain')
+
+
+def test_span_wrapper_keeps_styles():
+    fmt = Format(color='red')
+    spans = [Span("Label: ")] + Span.formatted("one two three four", fmt)
+    wrapper = SpanWrapper(12, initial_indent=[Span("> ")], subsequent_indent="  ")
+    lines = wrapper.wrap(spans)
+
+    assert ["".join(span.text for span in line) for line in lines] == [
+        "> Label: one",
+        "  two three",
+        "  four",
+    ]
+    prefix, suffix = fmt.ansi_bounds
+    assert lines[1][-1].styled() == "%stwo three%s" % (prefix, suffix)
+
+
+def test_span_from_ansi():
+    fmt = Format(color='red')
+    spans = Span.from_ansi("a %s b" % fmt("c"))
+    assert [span.text for span in spans] == ["a ", "c", " b"]
+    assert spans[1].prefix == fmt.ansi_bounds[0]
+    assert spans[2].prefix == ""
@@ -0,0 +1,75 @@
+from textwrap import TextWrapper
+
+import pytest
+
+from termx.ext.utils import escape_ansi_string
+from termx.fmt import Format
+from termx.logging.api import Segment, Line
+from termx.logging.spans import AnsiWrapper, ansi_wrapper
+
+
+@pytest.mark.parametrize('text', [
+    "One two three four five six seven eight nine ten",
+    "Word " * 20,
+    "A\tB\nC  D",
+    "Averyveryverylongwordthatdoesnotfitononeline andmore",
+    "",
+])
+@pytest.mark.parametrize('width', [10, 25, 80])
+def test_ansi_wrapper_matches_text_wrapper_for_plain_text(text, width):
+    wrapper = AnsiWrapper(width, initial_indent="> ", subsequent_indent="  ")
+    expected = TextWrapper(
+        width=width, initial_indent="> ", subsequent_indent="  ", expand_tabs=False).wrap(text)
+    assert wrapper.wrap(text) == expected
+
+
+def test_ansi_wrapper_ignores_ansi_width():
+    fmt = Format(color='red', styles=['bold'])
+    text = " ".join(fmt(word) for word in ("one", "two", "three", "four"))
+    lines = AnsiWrapper(9).wrap(text)
+    assert [escape_ansi_string(line) for line in lines] == ["one two", "three", "four"]
+
+
+def test_ansi_wrapper_measures_wide_characters():
+    fmt = Format(color='red')
+    text = fmt("エラー が 発生しました") + " 😀😀😀"
+    lines = AnsiWrapper(10, initial_indent="> ").wrap(text)
+    assert [escape_ansi_string(line) for line in lines] == [
+        "> エラー",
+        "が 発生し",
+        "ました",
+        "😀😀😀",
+    ]
+
+    # Text that fits is not wrapped.
+    assert AnsiWrapper(8).wrap(fmt("エラー")) == [fmt("エラー")]
+    assert len(AnsiWrapper(5).wrap(fmt("エラー"))) == 2
+
+
+def test_ansi_wrapper_carries_styles():
+    fmt = Format(color='red')
+    prefix, _ = fmt.ansi_bounds
+    lines = AnsiWrapper(9, initial_indent=fmt(">") + " ").wrap(fmt("one two three"))
+    assert [escape_ansi_string(line) for line in lines] == ["> one two", "three"]
+    assert lines[0].startswith(fmt(">"))
+    assert lines[1].startswith(prefix) and lines[1].endswith("\x1b[0m")
+
+
+def test_ansi_wrapper_is_cached():
+    assert ansi_wrapper(20, "> ", "  ") is ansi_wrapper(20, "> ", "  ")
+    assert ansi_wrapper(20, "> ", "  ") is not ansi_wrapper(21, "> ", "  ")
+
+
+def test_segment_wraps_at_display_width(make_record):
+    record = make_record(message="one two three four")
+    segment = Segment(attrs='msg', color='red', decoration={'width': 9})
+    assert [escape_ansi_string(line) for line in segment(record)] == [
+        "one two", "three", "four"]
+
+    line = Line(
+        Segment(attrs='msg', color='red'),
+        decoration={'width': 9, 'prefix': {'char': '>', 'color': 'blue'}},
+    )
+    line.decorate_children({'width': 9})
+    assert [escape_ansi_string(text) for text in line(record)] == [
+        "> one two", "  three", "  four"]
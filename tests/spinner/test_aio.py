@@ -0,0 +1,26 @@
+import asyncio
+import threading
+
+from termx.ext.utils import escape_ansi_string
+from termx.spin import AsyncSpinner
+
+
+def test_async_spinner(cursor_output):
+    baseline = threading.active_count()
+    rows = []
+
+    async def run():
+        spinner = AsyncSpinner(options={'spin_interval': 1})
+        async with spinner.child('Group', separate=False) as group:
+            await group.write('Message', options={'show_datetime': False})
+            await asyncio.sleep(0.01)
+            assert threading.active_count() == baseline
+            rows.extend(spinner._screen.rows)
+
+    asyncio.get_event_loop().run_until_complete(run())
+
+    assert len(rows) == 2
+    assert escape_ansi_string(rows[1]).strip() == '> Message'
+
+    output = escape_ansi_string("".join(cursor_output))
+    assert '✔ Group' in output
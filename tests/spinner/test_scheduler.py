@@ -0,0 +1,80 @@
+import threading
+import time
+
+from termx.spin.scheduler import SpinnerScheduler
+from termx.spin.screen import Screen
+
+
+class MockGroup(object):
+
+    def __init__(self):
+        self.ticks = 0
+
+    def _tick(self):
+        self.ticks += 1
+
+
+def test_scheduler_single_thread():
+    scheduler = SpinnerScheduler(interval=0.001, screen=Screen())
+    baseline = threading.active_count()
+
+    groups = [MockGroup() for _ in range(25)]
+    for group in groups:
+        scheduler.register(group)
+
+    time.sleep(0.05)
+    assert threading.active_count() == baseline + 1
+    assert all([group.ticks != 0 for group in groups])
+
+    scheduler.close()
+    assert threading.active_count() == baseline
+
+
+def test_scheduler_unregister():
+    scheduler = SpinnerScheduler(interval=0.001, screen=Screen())
+
+    group = MockGroup()
+    scheduler.register(group)
+    assert scheduler.is_registered(group)
+
+    time.sleep(0.02)
+    scheduler.unregister(group)
+    assert not scheduler.is_registered(group)
+
+    ticks = group.ticks
+    time.sleep(0.02)
+    assert group.ticks == ticks
+
+    scheduler.close()
+
+
+def test_scheduler_batches_lines():
+
+    class MockLine(object):
+        def __init__(self, text):
+            self.text = text
+
+        def format(self):
+            return self.text
+
+    class MockPrintGroup(MockGroup):
+        def __init__(self):
+            super(MockPrintGroup, self).__init__()
+            self.printed = []
+
+        def _print(self, text):
+            self.printed.append(text)
+
+    scheduler = SpinnerScheduler(interval=10, screen=Screen(), flush_interval=10)
+
+    group = MockPrintGroup()
+    scheduler.register(group)
+
+    scheduler.enqueue(group, MockLine('Line 1'))
+    scheduler.enqueue(group, MockLine('Line 2'))
+    assert group.printed == []
+
+    scheduler.flush()
+    assert group.printed == ['Line 1', 'Line 2']
+
+    scheduler.close()
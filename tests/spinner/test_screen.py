@@ -0,0 +1,75 @@
+from termx.spin.screen import Screen
+
+
+def test_screen_renders_new_rows(cursor_output):
+    screen = Screen()
+    screen.add_row("Header")
+    screen.add_row("Line 1")
+    screen.render()
+
+    assert cursor_output == ["\r\033[KHeader\n\r\033[KLine 1\r"]
+    assert screen.dirty == []
+
+
+def test_screen_renders_only_damaged_rows(cursor_output):
+    screen = Screen()
+    header = screen.add_row("Header")
+    for i in range(10):
+        screen.add_row("Line %s" % i)
+    screen.render()
+    cursor_output.clear()
+
+    screen.update_row(header, "Updated Header")
+    screen.render()
+    assert cursor_output == ["\u001b[10A\r\033[KUpdated Header\r"]
+
+    # Unchanged rows are not rewritten.
+    cursor_output.clear()
+    screen.update_row(header, "Updated Header")
+    screen.render()
+    assert cursor_output == []
+
+
+def test_screen_deferred(cursor_output):
+    screen = Screen()
+    with screen.deferred():
+        screen.add_row("Header 1")
+        screen.add_row("Header 2")
+        screen.render()
+        assert cursor_output == []
+    assert cursor_output == ["\r\033[KHeader 1\n\r\033[KHeader 2\r"]
+
+
+def test_screen_release(cursor_output):
+    screen = Screen()
+    screen.add_row("Header")
+    screen.release()
+
+    assert len(screen) == 0
+    assert "".join(cursor_output) == "\r\033[KHeader\r\n"
+
+
+def test_screen_discards_offscreen_damage(cursor_output):
+    screen = Screen()
+    header = screen.add_row("Header")
+    for i in range(100):
+        screen.add_row("Line %s" % i)
+    screen.render()
+    cursor_output.clear()
+
+    screen.update_row(header, "Updated Header")
+    screen.render()
+    assert cursor_output == []
+    assert screen.dirty == []
+
+
+def test_groups_share_root_screen():
+    from termx.spin import Spinner
+
+    spinner = Spinner()
+    group = spinner._child("Group")
+    nested = group._child("Nested")
+
+    # The root's screen is still empty (and falsy) when the groups are created.
+    assert nested._screen is group._screen is spinner._screen
+    assert nested._scheduler is group._scheduler is spinner._scheduler
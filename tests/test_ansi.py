@@ -0,0 +1,75 @@
+import pytest
+
+from termx.ext.ansi import AnsiScanner, display_width, measure_ansi, strip_ansi, tokenize
+from termx.fmt import Format
+
+
+def colored_line():
+    red, bold = Format(color='red'), Format(color='blue', styles=['bold'])
+    return "%s: %s and %s" % (red("Error"), bold("Message"), red(bold("nested")))
+
+
+@pytest.mark.parametrize('text', [
+    "",
+    "Plain text",
+    colored_line(),
+    "\x1b[31mUnterminated",
+    "Dangling \x1b[",
+    "Cursor \x1b[2K\x1b[1A moved",
+])
+def test_tokenize(text):
+    tokens = list(tokenize(text))
+    assert "".join(run for _, run in tokens) == text
+    assert "".join(run for escape, run in tokens if not escape) == strip_ansi(text)
+    assert all(run for _, run in tokens)
+    assert measure_ansi(text) == len(strip_ansi(text))
+
+
+def test_strip_ansi():
+    assert strip_ansi(colored_line()) == "Error: Message and nested"
+    assert measure_ansi(colored_line()) == len("Error: Message and nested")
+
+
+@pytest.mark.parametrize('text,width', [
+    ("Error", 5),
+    ("エラー", 6),
+    ("e\u0301", 1),
+    ("😀 ok", 5),
+    ("", 0),
+])
+def test_display_width(text, width):
+    assert display_width(text) == width
+
+
+def test_scanner_chunks():
+    text = colored_line()
+    expected = list(tokenize(text))
+    for size in range(1, len(text) + 1):
+        scanner = AnsiScanner()
+        tokens = []
+        for i in range(0, len(text), size):
+            tokens.extend(scanner.feed(text[i:i + size]))
+        tokens.extend(scanner.flush())
+
+        # Escapes are never split, but text runs can be split between chunks.
+        assert [run for escape, run in tokens if escape] == [
+            run for escape, run in expected if escape]
+        assert "".join(run for escape, run in tokens if not escape) == strip_ansi(text)
+
+
+def test_scanner_tracks_active_sgr():
+    red = Format(color='red')
+    prefix, _ = red.ansi_bounds
+
+    scanner = AnsiScanner()
+    active = []
+    for escape, run in scanner.scan("a %s b" % red("c")):
+        if not escape:
+            active.append((run, scanner.sgr))
+    assert active == [("a ", ""), ("c", prefix), (" b", "")]
+
+
+def test_scanner_flushes_unterminated_escape():
+    scanner = AnsiScanner()
+    assert list(scanner.feed("text \x1b[3")) == [(False, "text ")]
+    assert list(scanner.flush()) == [(False, "\x1b[3")]
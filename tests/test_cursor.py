@@ -0,0 +1,30 @@
+from termx import Cursor
+
+
+def test_cursor_frame_single_write(cursor_output):
+    with Cursor.frame():
+        Cursor.move_up(3)
+        Cursor.overwrite("Test Line", newline=False)
+        Cursor.carriage_return()
+        Cursor.move_down(3)
+
+    assert cursor_output == ["\u001b[3A\033[KTest Line\r\u001b[3B"]
+    assert Cursor.frame_stats.writes == 1
+    assert Cursor.frame_stats.flushes == 1
+    assert Cursor.frame_stats.bytes == len(cursor_output[0])
+
+
+def test_cursor_nested_frames(cursor_output):
+    with Cursor.frame():
+        Cursor.write("foo")
+        with Cursor.frame():
+            Cursor.write("bar")
+        assert cursor_output == []
+
+    assert cursor_output == ["foobar"]
+
+
+def test_cursor_move_zero(cursor_output):
+    Cursor.move_up(0)
+    Cursor.move_down(0)
+    assert cursor_output == []
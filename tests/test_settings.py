@@ -0,0 +1,388 @@
+import asyncio
+import json
+import pytest
+import threading
+
+from termx.config.doc import ConfigDoc
+from termx.config.exceptions import ConfigValueError, MissingConfigurationError
+from termx.config.lazy import LazierSettings
+from termx.config.sections import Unresolved, SectionDoc, FormatSectionDoc
+from termx.config import snapshot as snapshot_module
+from termx.config.snapshot import encode_value
+from termx.exceptions import ColorLibError
+from termx.fmt import color, Format
+
+
+def test_sections_built_on_first_access():
+    settings = LazierSettings()
+    assert settings._initialized is False
+
+    assert settings.COLOR_DEPTH == 256
+    assert settings._unbuilt == {'COLORS', 'ICONS', 'TEXT', 'FORMATS'}
+
+    colors = settings.COLORS
+    assert isinstance(colors, ConfigDoc)
+    assert settings.COLORS is colors
+    assert settings._unbuilt == {'ICONS', 'TEXT', 'FORMATS'}
+
+
+def test_values_resolved_on_first_access():
+    settings = LazierSettings()
+
+    colors = settings.COLORS
+    assert isinstance(dict.__getitem__(colors, 'RED'), Unresolved)
+    assert isinstance(colors.RED, color)
+    assert dict.__getitem__(colors, 'RED') is colors.RED
+    assert isinstance(dict.__getitem__(colors, 'GREEN'), Unresolved)
+
+    assert isinstance(settings.FORMATS.INFO, Format)
+    assert all(isinstance(v, color) for v in colors.SHADES)
+
+
+def test_as_dict_builds_sections():
+    settings = LazierSettings()
+    data = settings.as_dict()
+    assert isinstance(data['COLORS']['RED'], color)
+    assert isinstance(data['TEXT']['FADED'], Format)
+
+
+def test_configure_unbuilt_section():
+    settings = LazierSettings()
+    settings.configure(COLORS={'GREEN': 'BLUE'})
+    assert settings.COLORS.GREEN('foo') == '\x1b[38;5;4mfoo\x1b[0m'
+    assert settings.COLORS.RED('foo') == '\x1b[38;5;167mfoo\x1b[0m'
+
+
+@pytest.fixture
+def snapshot_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv('TERMX_SETTINGS_CACHE', '1')
+    monkeypatch.setenv('TERMX_CACHE_DIR', str(tmp_path))
+    return tmp_path
+
+
+def resolved(settings):
+    return {
+        key: {k: encode_value(v) for k, v in settings.section(key).items()}
+        for key in LazierSettings.SECTIONS
+    }
+
+
+def test_snapshot_written_and_used(snapshot_dir, monkeypatch):
+    expected = resolved(LazierSettings())
+    snapshots = list(snapshot_dir.iterdir())
+    assert len(snapshots) == 1
+
+    def forward_reference_data(*args):
+        raise AssertionError('Snapshot should not be resolved again.')
+
+    monkeypatch.setattr(SectionDoc, 'forward_reference_data', forward_reference_data)
+    monkeypatch.setattr(FormatSectionDoc, 'forward_reference_data', forward_reference_data)
+
+    settings = LazierSettings()
+    assert resolved(settings) == expected
+    assert settings.COLORS.RED('foo') == '\x1b[38;5;167mfoo\x1b[0m'
+    assert isinstance(settings.TEXT.FADED, Format)
+
+
+def test_snapshot_invalidated(snapshot_dir):
+    settings = LazierSettings()
+    settings.COLORS
+    path = next(snapshot_dir.iterdir())
+
+    content = json.loads(path.read_text())
+    content['key']['color_depth'] = 8
+    content['sections']['COLORS']['RED'] = {'codes': [31]}
+    path.write_text(json.dumps(content))
+
+    settings = LazierSettings()
+    assert settings.COLORS.RED('foo') == '\x1b[38;5;167mfoo\x1b[0m'
+    assert json.loads(path.read_text())['key']['color_depth'] == 256
+
+
+def test_snapshot_corrupted(snapshot_dir):
+    LazierSettings().COLORS
+    path = next(snapshot_dir.iterdir())
+    path.write_text('{"key": ')
+
+    settings = LazierSettings()
+    assert settings.COLORS.RED('foo') == '\x1b[38;5;167mfoo\x1b[0m'
+    assert list(snapshot_dir.iterdir()) == [path]
+
+
+def test_snapshot_not_writable(tmp_path, monkeypatch):
+    # The cache directory cannot be created under a file.
+    (tmp_path / 'file').write_text('')
+    monkeypatch.setenv('TERMX_SETTINGS_CACHE', '1')
+    monkeypatch.setenv('TERMX_CACHE_DIR', str(tmp_path / 'file' / 'termx'))
+
+    def forward_reference_data(*args):
+        raise AssertionError('Formats should not be resolved eagerly.')
+
+    monkeypatch.setattr(FormatSectionDoc, 'forward_reference_data', forward_reference_data)
+
+    settings = LazierSettings()
+    assert settings.COLORS.RED('foo') == '\x1b[38;5;167mfoo\x1b[0m'
+    assert settings._unbuilt == {'ICONS', 'TEXT', 'FORMATS'}
+
+
+def test_snapshot_not_encodable(snapshot_dir, monkeypatch):
+    def encode_value(value):
+        raise TypeError(value)
+
+    monkeypatch.setattr(snapshot_module, 'encode_value', encode_value)
+    LazierSettings().COLORS
+    path = next(snapshot_dir.iterdir())
+    assert json.loads(path.read_text())['sections'] is None
+
+    # Later processes do not resolve the sections to store them again.
+    forward_reference_data = FormatSectionDoc.forward_reference_data
+
+    def fail(*args):
+        raise AssertionError('Formats should not be resolved eagerly.')
+
+    monkeypatch.setattr(FormatSectionDoc, 'forward_reference_data', fail)
+    settings = LazierSettings()
+    assert settings.COLORS.RED('foo') == '\x1b[38;5;167mfoo\x1b[0m'
+
+    monkeypatch.setattr(FormatSectionDoc, 'forward_reference_data', forward_reference_data)
+    assert isinstance(settings.FORMATS.FAIL, Format)
+
+
+def test_configured_tuple_is_not_ansi_codes():
+    settings = LazierSettings()
+    with pytest.raises(ConfigValueError):
+        settings.configure(COLORS={'RED': (31, )})
+
+
+def test_configure_updates_references():
+    settings = LazierSettings()
+    info = settings.FORMATS.INFO
+    settings.configure(COLORS={'RED': '#00FF00'})
+
+    assert settings.COLORS.RED('foo') == '\x1b[38;5;10mfoo\x1b[0m'
+    assert settings.COLORS.FAIL is settings.COLORS.RED
+    assert settings.COLORS.CRITICAL is settings.COLORS.RED
+    assert settings.FORMATS.FAIL.color is settings.COLORS.RED
+    assert settings.FORMATS.FAIL.icon == settings.ICONS.FAIL
+
+    # Values that do not depend on the configured value are not recomputed.
+    assert settings.FORMATS.INFO is info
+
+
+def test_configure_updates_indirect_references():
+    settings = LazierSettings()
+    settings.configure(ICONS={'CROSS': 'X'})
+    assert settings.ICONS.FAIL == 'X'
+    assert settings.FORMATS.FAIL.icon == 'X'
+    assert settings.FORMATS.WARNING.icon == 'X'
+
+
+def test_configured_value_is_literal():
+    settings = LazierSettings()
+    settings.configure(COLORS={'FAIL': '#000000'})
+    settings.configure(COLORS={'RED': '#00FF00'})
+    assert settings.COLORS.FAIL == color('#000000', depth=256)
+    assert settings.COLORS.ERROR('foo') == '\x1b[38;5;10mfoo\x1b[0m'
+
+
+def test_configure_color_depth():
+    settings = LazierSettings()
+    settings.COLORS.FAIL
+    settings.configure(COLOR_DEPTH=8)
+    assert settings.COLORS.FAIL == color('#DC3545', depth=8)
+    assert settings.TEXT.FADED.color == color('LightYellow3', depth=8)
+    assert settings.FORMATS.FAIL.color == color('#DC3545', depth=8)
+
+
+
+@pytest.mark.parametrize('kwargs', [
+    [('COLORS', {'RED': '#00FF00'}), ('COLOR_DEPTH', 8)],
+    [('COLOR_DEPTH', 8), ('COLORS', {'RED': '#00FF00'})],
+])
+def test_configure_color_depth_with_section(kwargs):
+    settings = LazierSettings()
+    settings.COLORS.RED
+    settings.FORMATS.FAIL
+    settings.configure(**dict(kwargs))
+    assert settings.COLORS.RED == color('#00FF00', depth=8)
+    assert settings.COLORS.RED.ansi_codes == (32, )
+    assert settings.FORMATS.FAIL.color == color('#00FF00', depth=8)
+    assert settings.COLORS.BLUE == color('#007bff', depth=8)
+
+
+def test_override():
+    settings = LazierSettings()
+    red = settings.COLORS.RED
+
+    with settings.override(COLORS={'RED': '#00FF00'}, FOO='bar'):
+        assert settings.COLORS.RED('foo') == '\x1b[38;5;10mfoo\x1b[0m'
+        assert settings.FORMATS.FAIL.color is settings.COLORS.RED
+        assert settings.FOO == 'bar'
+
+    assert settings.COLORS.RED is red
+    assert settings.FORMATS.FAIL.color == red
+    assert not hasattr(settings, 'FOO')
+
+
+
+def test_override_section_and_color_depth():
+    settings = LazierSettings()
+    red = settings.COLORS.RED
+    settings.FORMATS.FAIL
+
+    with settings.override(COLORS={'RED': '#00FF00'}, COLOR_DEPTH=8):
+        assert settings.COLORS.RED == color('#00FF00', depth=8)
+        assert settings.FORMATS.FAIL.color == color('#00FF00', depth=8)
+        assert settings.COLORS.BLUE == color('#007bff', depth=8)
+
+    assert settings.COLORS.RED is red
+    assert settings.FORMATS.FAIL.color == red
+
+
+def test_override_nested_and_configure():
+    settings = LazierSettings()
+
+    with settings.override({'COLOR_DEPTH': 8}):
+        with settings.override(ICONS={'CROSS': 'X'}):
+            settings.configure(FOO='bar')
+            assert settings.COLOR_DEPTH == 8
+            assert settings.FORMATS.FAIL.icon == 'X'
+            assert settings.FORMATS.FAIL.color == color('#DC3545', depth=8)
+            assert settings.FOO == 'bar'
+
+        assert settings.FORMATS.FAIL.icon == '✘'
+        assert not hasattr(settings, 'FOO')
+
+    assert settings.COLOR_DEPTH == 256
+    assert settings.FORMATS.FAIL.color == color('#DC3545', depth=256)
+
+
+def test_override_context_local():
+    settings = LazierSettings()
+    settings.COLORS.RED
+    seen = {}
+
+    def render(name):
+        seen[name] = settings.COLORS.FAIL
+
+    async def render_overridden():
+        with settings.override(COLORS={'RED': '#00FF00'}):
+            await asyncio.sleep(0.01)
+            render('task')
+
+    async def main():
+        task = asyncio.ensure_future(render_overridden())
+        await asyncio.sleep(0)
+        render('other')
+        await task
+
+    asyncio.get_event_loop().run_until_complete(main())
+
+    with settings.override(COLORS={'RED': '#0000FF'}):
+        thread = threading.Thread(target=render, args=('thread', ))
+        thread.start()
+        thread.join()
+
+    assert seen['task'] == color('#00FF00', depth=256)
+    assert seen['other'] == color('#DC3545', depth=256)
+    assert seen['thread'] == color('#DC3545', depth=256)
+
+
+def test_override_isolated_from_configure():
+    settings = LazierSettings()
+    red = settings.COLORS.RED
+    fail = settings.FORMATS.FAIL
+    seen = {}
+
+    def configure():
+        settings.configure(COLORS={'RED': '#00FF00'})
+        settings.configure(COLOR_DEPTH=8)
+
+    # None of the built sections are copied by the overlay.
+    with settings.override(FOO='bar'):
+        thread = threading.Thread(target=configure)
+        thread.start()
+        thread.join()
+
+        seen['red'] = settings.COLORS.RED
+        seen['green'] = settings.COLORS.GREEN
+        seen['fail'] = settings.FORMATS.FAIL
+        seen['fail_color'] = settings.get_path('FORMATS.FAIL').color
+
+    assert seen['red'] is red
+    assert seen['green'] == color('#28A745', depth=256)
+    assert seen['fail'] is fail
+    assert seen['fail_color'] == red
+
+    assert settings.COLORS.RED == color('#00FF00', depth=8)
+    assert settings.FORMATS.FAIL.color == color('#00FF00', depth=8)
+
+
+def test_get_path():
+    settings = LazierSettings()
+    assert settings.get_path('TEXT.FADED') is settings.TEXT.FADED
+    assert settings.get_path('colors.shades') == settings.COLORS.SHADES
+    assert settings.get_path('COLOR_DEPTH') == 256
+
+    with pytest.raises(MissingConfigurationError):
+        settings.get_path('TEXT.MISSING')
+    with pytest.raises(AttributeError):
+        settings.get_path('MISSING')
+    with pytest.raises(AttributeError):
+        settings.get_path('COLOR_DEPTH.MISSING')
+
+
+def test_get_path_after_configure():
+    settings = LazierSettings()
+    fail = settings.get_path('COLORS.FAIL')
+
+    settings.configure(COLORS={'RED': '#00FF00'})
+    assert settings.get_path('COLORS.FAIL') is not fail
+    assert settings.get_path('COLORS.FAIL') is settings.COLORS.RED
+
+    with settings.override(COLORS={'RED': '#0000FF'}):
+        assert settings.get_path('COLORS.FAIL') == color('#0000FF', depth=256)
+    assert settings.get_path('COLORS.FAIL') is settings.COLORS.RED
+
+
+def test_flattened():
+    settings = LazierSettings()
+    flat = settings.flattened()
+    assert flat['TEXT.FADED'] is settings.TEXT.FADED
+    assert flat['COLOR_DEPTH'] == 256
+    with pytest.raises(TypeError):
+        flat['COLOR_DEPTH'] = 8
+
+    # Configuring the same value does not change the settings.
+    settings.configure(COLOR_DEPTH=256)
+    assert settings.flattened() is flat
+
+    settings.configure(COLORS={'RED': '#00FF00'})
+    assert settings.flattened() is not flat
+    assert settings.flattened()['FORMATS.FAIL'].color is settings.COLORS.RED
+
+
+def test_generation():
+    settings = LazierSettings()
+    generation = settings.generation
+
+    settings.configure(COLOR_DEPTH=256)
+    assert settings.generation == generation
+
+    settings.configure(COLOR_DEPTH=8)
+    assert settings.generation != generation
+    generation = settings.generation
+
+    settings.configure(COLORS={'RED': '#00FF00'})
+    assert settings.generation != generation
+
+
+def test_configured_format_color_is_immutable():
+    settings = LazierSettings()
+    settings.configure(FORMATS={'INFO': {'COLOR': 'red', 'ICON': '[?]', 'STYLE': 'UNDERLINE'}})
+
+    fmt = settings.FORMATS.INFO
+    assert fmt.color.ansi_codes == (38, 5, 1)
+    assert fmt.color is color('red', depth=256)
+    with pytest.raises(ColorLibError):
+        fmt.color.ansi_codes = [38, 5, 2]
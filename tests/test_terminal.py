@@ -0,0 +1,50 @@
+import os
+import signal
+
+import pytest
+
+from termx import Terminal
+
+
+@pytest.fixture
+def terminal(monkeypatch):
+    queries = []
+
+    def get_terminal_size(fd):
+        queries.append(fd)
+        return os.terminal_size((120, 40))
+
+    monkeypatch.delenv('COLUMNS', raising=False)
+    monkeypatch.delenv('LINES', raising=False)
+    monkeypatch.setattr(os, 'get_terminal_size', get_terminal_size)
+    Terminal.invalidate()
+    try:
+        yield queries
+    finally:
+        Terminal.invalidate()
+
+
+def test_terminal_size_is_cached(terminal):
+    assert Terminal.columns() == 120
+    assert Terminal.rows() == 40
+    assert len(terminal) == 1
+
+
+@pytest.mark.skipif(not hasattr(signal, 'SIGWINCH'), reason="Requires SIGWINCH")
+def test_terminal_size_invalidated_on_resize(terminal):
+    assert Terminal.columns() == 120
+    os.kill(os.getpid(), signal.SIGWINCH)
+    assert Terminal.columns() == 120
+    assert len(terminal) == 2
+
+
+def test_terminal_size_without_tty(terminal, monkeypatch):
+    def get_terminal_size(fd):
+        raise OSError()
+
+    monkeypatch.setattr(os, 'get_terminal_size', get_terminal_size)
+    assert Terminal.size() == Terminal.fallback
+
+    monkeypatch.setenv('COLUMNS', '100')
+    Terminal.invalidate()
+    assert Terminal.size() == (100, Terminal.fallback.lines)